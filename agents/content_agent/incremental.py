@@ -0,0 +1,251 @@
+# agents/content_agent/incremental.py
+"""
+Incremental content builds: only regenerate stages whose inputs changed.
+
+Every stage is fingerprinted from everything that determines its output:
+its input text, its prompt template from prompts.py and the model settings.
+Artifacts and fingerprints live in a manifest next to the outputs
+(out/build/<name>/manifest.json); a stage whose fingerprint matches the
+manifest is skipped and its stored artifact reused. The draft is built
+section by section against the same shared context as --parallel-sections,
+so editing one outline section re-expands only that section; only the
+transitions at its boundaries are rewritten (the others are kept in the
+manifest), after which critique, SEO and social rerun on the new draft.
+"""
+import os
+import re
+import json
+import time
+import hashlib
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from . import prompts
+
+BUILD_DIR = Path(os.getenv("CONTENT_BUILD_DIR", "out/build"))
+MANIFEST_FILE = "manifest.json"
+MANIFEST_VERSION = 2
+
+# Artifact file and sampling temperature of each post-draft stage
+POST_DRAFT_ARTIFACTS = {
+    "critique": ("critique.md", 0.2, "SELF_CRITIQUE_PROMPT"),
+    "seo": ("seo.md", 0.2, "SEO_CHECKLIST_PROMPT"),
+    "social": ("social.json", 0.3, "SOCIAL_MEDIA_PROMPT"),
+}
+
+def fingerprint(*parts: Any) -> str:
+    payload = json.dumps(parts, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:24]
+
+def model_settings(temperature: float) -> Dict[str, Any]:
+    """What the LLM output depends on besides the prompt (dry-run output differs too)"""
+    from ..llm_client import LLM_MODEL
+    return {"model": LLM_MODEL if os.getenv("OPENAI_API_KEY") else "dry-run", "temperature": temperature}
+
+def build_name(source: str) -> str:
+    name = Path(source).stem if os.path.exists(source) else source
+    return re.sub(r"[^a-z0-9]+", "-", name.lower()).strip("-")[:60] or "post"
+
+class Manifest:
+    """Stage name -> {fingerprint, artifact, seconds}; sections keyed by fingerprint;
+    transitions between sections keyed by the fingerprint of both neighbours"""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.data = {"version": MANIFEST_VERSION, "stages": {}, "sections": {}, "transitions": {}}
+        if self.path.exists():
+            try:
+                data = json.loads(self.path.read_text(encoding="utf-8"))
+                if data.get("version") == MANIFEST_VERSION:
+                    self.data = data
+            except (OSError, ValueError) as e:
+                print(f"Manifest unreadable, rebuilding everything: {e}")
+
+    def artifact(self, kind: str, key: str, fp: str) -> Optional[Dict[str, Any]]:
+        """The stored entry if its fingerprint matches and its artifact still exists"""
+        entry = self.data[kind].get(key)
+        if entry and entry["fingerprint"] == fp and (self.path.parent / entry["artifact"]).exists():
+            return entry
+        return None
+
+    def record(self, kind: str, key: str, fp: str, artifact: str, seconds: float):
+        self.data[kind][key] = {"fingerprint": fp, "artifact": artifact, "seconds": round(seconds, 3)}
+
+    def save(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.path.write_text(json.dumps(self.data, ensure_ascii=False, indent=2), encoding="utf-8")
+
+class Build:
+    """One incremental build: tracks what ran, what was reused and the time saved"""
+
+    def __init__(self, directory: Path):
+        self.dir = Path(directory)
+        self.manifest = Manifest(self.dir / MANIFEST_FILE)
+        self.ran: List[str] = []
+        self.skipped: List[str] = []
+        self.failed: List[str] = []
+        self.saved_seconds = 0.0
+
+    def read(self, entry: Dict[str, Any]) -> str:
+        return (self.dir / entry["artifact"]).read_text(encoding="utf-8")
+
+    def write(self, artifact: str, text: str):
+        path = self.dir / artifact
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(text, encoding="utf-8")
+
+    def reuse(self, name: str, entry: Dict[str, Any]) -> str:
+        self.skipped.append(name)
+        self.saved_seconds += entry["seconds"]
+        return self.read(entry)
+
+def build_outline(build: Build, source: str) -> str:
+    """Read an outline file, or generate (or reuse) the outline for a topic"""
+    from .main import create_outline
+
+    if os.path.exists(source):
+        return Path(source).read_text(encoding="utf-8")
+    fp = fingerprint(source, prompts.OUTLINE_GENERATION_PROMPT, model_settings(0.3))
+    entry = build.manifest.artifact("stages", "outline", fp)
+    if entry:
+        return build.reuse("outline", entry)
+    start = time.perf_counter()
+    outline = create_outline(source)
+    build.write("outline.md", outline)
+    build.manifest.record("stages", "outline", fp, "outline.md", time.perf_counter() - start)
+    build.ran.append("outline")
+    return outline
+
+def build_draft(build: Build, outline: str) -> str:
+    """Expand the outline section by section, reusing sections whose fingerprint is
+    unchanged; the changed ones are expanded concurrently, then only the
+    transitions next to them are rewritten"""
+    from .main import split_sections, expand_sections, shared_context, insert_transitions
+
+    title, sections = split_sections(outline)
+    headings = [section.splitlines()[0] for section in sections]
+    context = shared_context(title, sections)
+    settings = model_settings(0.3)
+    # The headings and context are part of the prompt, so renaming or adding a
+    # section, or editing the thesis, re-expands them all
+    fps = [fingerprint(title, headings, context, section, prompts.SECTION_EXPANSION_PROMPT, settings)
+           for section in sections]
+
+    parts = [None] * len(sections)
+    stale = []
+    for i, fp in enumerate(fps):
+        entry = build.manifest.artifact("sections", fp, fp)
+        if entry:
+            parts[i] = build.reuse(f"section {i + 1}", entry)
+        else:
+            stale.append(i)
+
+    if stale:
+        start = time.perf_counter()
+        texts = expand_sections(title, [sections[i] for i in stale], headings, context)
+        seconds = (time.perf_counter() - start) / len(stale)  # the expansions overlapped
+        for i, text in zip(stale, texts):
+            if text is None:
+                # Keep the outline text for this section and retry it on the next build
+                parts[i] = sections[i]
+                continue
+            artifact = f"sections/{fps[i]}.md"
+            build.write(artifact, text)
+            build.manifest.record("sections", fps[i], fps[i], artifact, seconds)
+            build.ran.append(f"section {i + 1}")
+            parts[i] = text
+
+    # Forget (and delete) sections the outline no longer has
+    for fp, entry in list(build.manifest.data["sections"].items()):
+        if fp not in fps:
+            del build.manifest.data["sections"][fp]
+            (build.dir / entry["artifact"]).unlink(missing_ok=True)
+
+    parts = insert_transitions(parts, build_transitions(build, title, parts))
+    draft = f"# {title}\n\n" + "\n\n".join(parts) + "\n"
+    build.write("draft.md", draft)
+    return draft
+
+def build_transitions(build: Build, title: str, parts: List[str]) -> Dict[int, str]:
+    """Transitions between neighbouring sections, rewriting only those whose
+    neighbours changed (all in one stitch call)"""
+    from .main import write_transitions
+
+    stored = build.manifest.data["transitions"]
+    settings = model_settings(0.3)
+    fps = {i: fingerprint(title, parts[i - 1], parts[i], prompts.STITCH_PROMPT, settings)
+           for i in range(1, len(parts))}
+    transitions = {i: stored[fp]["text"] for i, fp in fps.items() if fp in stored}
+    if transitions:
+        build.skipped.append(f"{len(transitions)} transitions")
+        build.saved_seconds += sum(stored[fps[i]]["seconds"] for i in transitions)
+    stale = [i for i in fps if i not in transitions]
+    if stale:
+        start = time.perf_counter()
+        written = write_transitions(title, parts, stale)
+        if written:
+            seconds = (time.perf_counter() - start) / len(written)
+            for i, text in written.items():
+                stored[fps[i]] = {"text": text, "seconds": round(seconds, 3)}
+            build.ran.append(f"{len(written)} transitions")
+            transitions.update(written)
+    # Forget transitions between sections that are no longer neighbours
+    for fp in list(stored):
+        if fp not in fps.values():
+            del stored[fp]
+    return transitions
+
+def build_post_draft(build: Build, draft: str):
+    """Rerun critique / SEO / social (concurrently) only if the draft, prompt or settings changed"""
+    from .main import POST_DRAFT_STAGES, run_post_draft_stages
+
+    draft_hash = fingerprint(draft)
+    stale, fps = {}, {}
+    for name, (artifact, temperature, template) in POST_DRAFT_ARTIFACTS.items():
+        fps[name] = fingerprint(draft_hash, getattr(prompts, template), model_settings(temperature))
+        entry = build.manifest.artifact("stages", name, fps[name])
+        if entry:
+            build.reuse(name, entry)
+        else:
+            stale[name] = POST_DRAFT_STAGES[name]
+    if not stale:
+        return
+
+    # Stages raise on LLM errors, so only real outputs come back with status "ok"
+    results, latency = run_post_draft_stages(draft, stages=stale)
+    for name, result in results.items():
+        artifact = POST_DRAFT_ARTIFACTS[name][0]
+        text = json.dumps(result, ensure_ascii=False, indent=2) if artifact.endswith(".json") else result
+        build.write(artifact, text)
+        stage = latency["stages"][name]
+        if stage["status"] == "ok":
+            build.ran.append(name)
+            build.manifest.record("stages", name, fps[name], artifact, stage["seconds"])
+        else:
+            build.failed.append(name)
+            build.manifest.data["stages"].pop(name, None)  # fallback output: rebuild next time
+
+def run_incremental(source: str, build_dir: Optional[Path] = None) -> Dict[str, Any]:
+    """Build outline -> draft -> critique / SEO / social into build_dir, skipping unchanged stages"""
+    build = Build(build_dir or BUILD_DIR / build_name(source))
+    start = time.perf_counter()
+
+    outline = build_outline(build, source)
+    draft = build_draft(build, outline)
+    build_post_draft(build, draft)
+    build.manifest.save()
+
+    report = {
+        "ran": build.ran,
+        "skipped": build.skipped,
+        "failed": build.failed,
+        "seconds": round(time.perf_counter() - start, 3),
+        "saved_seconds": round(build.saved_seconds, 3),
+        "dir": str(build.dir),
+    }
+    print(f"🔁 Rebuilt: {', '.join(build.ran) or 'nothing'}")
+    if build.failed:
+        print(f"⚠️  Failed, kept fallbacks and will retry next build: {', '.join(build.failed)}")
+    print(f"⏭️  Skipped {len(build.skipped)} unchanged stages: {', '.join(build.skipped) or 'none'} "
+          f"(saved ~{report['saved_seconds']:.1f}s; build took {report['seconds']:.1f}s)")
+    return report
@@ -2,11 +2,26 @@
 """
 Content Agent - Template for post creation/editing
 Run: python -m agents.content_agent.main "outline_file.md"
+     python -m agents.content_agent.main "outline_file.md" --incremental
+     python -m agents.content_agent.main "outline_file.md" --parallel-sections
 """
 import os
-import sys
+import re
 import json
+import time
+import argparse
+import datetime
+import threading
 from pathlib import Path
+from typing import Callable, Dict, Tuple
+from concurrent.futures import Future, ThreadPoolExecutor, FIRST_COMPLETED, wait
+
+# Seconds each post-draft stage (critique, SEO, social) may take
+STAGE_TIMEOUT = float(os.getenv("CONTENT_STAGE_TIMEOUT", "120"))
+# Sections expanded at once by --parallel-sections
+SECTION_CONCURRENCY = int(os.getenv("CONTENT_SECTION_CONCURRENCY", "4"))
+STITCH_CHARS = 400  # chars of each side of a section boundary shown to the stitch pass
+CODE_FENCE = re.compile(r"^\s*```[\w-]*\s*\n(.*?)\n\s*```\s*$", re.DOTALL)
 
 def create_outline(topic):
     """Create an outline from a topic"""
@@ -30,14 +45,11 @@ def create_outline(topic):
 *Generated in dry-run mode*"""
     
     try:
-        from langchain_openai import ChatOpenAI
+        from ..llm_client import llm_client
         from .prompts import OUTLINE_GENERATION_PROMPT
         
-        llm = ChatOpenAI(model="gpt-4o-mini", temperature=0.3)
         prompt = OUTLINE_GENERATION_PROMPT.format(topic=topic)
-        
-        response = llm.invoke([{"role": "user", "content": prompt}])
-        return response.content
+        return llm_client.complete(prompt, temperature=0.3)
     except Exception as e:
         print(f"Error generating outline: {e}")
         return f"# Outline for: {topic}"
@@ -57,11 +69,9 @@ This is a placeholder draft. Set OPENAI_API_KEY to enable full content generatio
 *Generated in dry-run mode*"""
     
     try:
-        from langchain_openai import ChatOpenAI
+        from ..llm_client import llm_client
         from .prompts import DRAFT_EXPANSION_PROMPT
         
-        llm = ChatOpenAI(model="gpt-4o-mini", temperature=0.3)
-        
         additional_context = ""
         if sources:
             additional_context = f"\n## Sources:\n{sources}"
@@ -71,14 +81,149 @@ This is a placeholder draft. Set OPENAI_API_KEY to enable full content generatio
             additional_context=additional_context
         )
         
-        response = llm.invoke([{"role": "user", "content": prompt}])
-        return response.content
+        return llm_client.complete(prompt, temperature=0.3)
     except Exception as e:
         print(f"Error expanding draft: {e}")
         return outline
 
+def split_sections(outline):
+    """Split an outline on its ## headings.
+    
+    Returns (title, sections): the # title (or first line) and the text of
+    each section, heading included. Anything between the title and the
+    first ## heading becomes a section of its own.
+    """
+    lines = outline.strip().splitlines()
+    title = ""
+    if lines and lines[0].startswith("# "):
+        title = lines.pop(0)[2:].strip()
+    sections, current = [], []
+    for line in lines + ["## "]:  # the sentinel flushes the last section
+        if line.startswith("## "):
+            text = "\n".join(current).strip()
+            if text:
+                sections.append(text)
+            current = []
+        current.append(line)
+    return title or (sections[0].splitlines()[0].lstrip("# ") if sections else "Untitled"), sections
+
+def expand_section(title, section, headings, context=None):
+    """Expand one outline section into draft text; LLM errors propagate to the caller"""
+    if not os.getenv("OPENAI_API_KEY"):
+        return f"{section}\n\n*Section draft placeholder (dry-run)*"
+    
+    from ..llm_client import llm_client
+    from .prompts import SECTION_EXPANSION_PROMPT
+    
+    prompt = SECTION_EXPANSION_PROMPT.format(
+        title=title,
+        headings="\n".join(headings),
+        section=section,
+        additional_context=context or ""
+    )
+    return llm_client.complete(prompt, temperature=0.3)
+
+def thesis_section(sections):
+    """The section stating the post's thesis: the text before the first ## heading,
+    else the Introduction section, else the first section"""
+    if not sections:
+        return None
+    if not sections[0].startswith("## "):
+        return sections[0]
+    for section in sections:
+        if "introduction" in section.splitlines()[0].lower():
+            return section
+    return sections[0]
+
+def shared_context(title, sections, sources=None):
+    """What every section is written against: the title, the post's thesis and the sources"""
+    parts = [f"Post title: {title}"]
+    thesis = thesis_section(sections)
+    if thesis:
+        parts.append(f"Thesis and introduction notes:\n{thesis}")
+    if sources:
+        parts.append(f"## Sources:\n{sources}")
+    return "\n\n".join(parts)
+
+def expand_sections(title, sections, headings, context=None, concurrency=SECTION_CONCURRENCY):
+    """Expand sections concurrently, at most concurrency LLM calls at a time.
+    
+    Returns the texts in order; a section whose expansion failed is None.
+    """
+    def expand(section):
+        try:
+            return expand_section(title, section, headings, context)
+        except Exception as e:
+            print(f"Error expanding section {section.splitlines()[0]!r}: {e}")
+            return None
+    
+    with ThreadPoolExecutor(max_workers=max(1, min(concurrency, len(sections) or 1)),
+                            thread_name_prefix="content-section") as pool:
+        return list(pool.map(expand, sections))
+
+def strip_code_fence(text):
+    """The JSON inside a ```json ... ``` fenced reply, else the text as is"""
+    match = CODE_FENCE.match(text)
+    return match.group(1) if match else text
+
+def write_transitions(title, parts, boundaries=None):
+    """One short LLM pass that writes the transitions into the given boundaries
+    (index i joins parts[i - 1] and parts[i]; default: all of them).
+    
+    Only the text on either side of each boundary is sent, not the whole
+    draft, so the pass stays cheap however long the post is. Returns
+    {boundary: transition}, or None on any failure.
+    """
+    boundaries = list(range(1, len(parts))) if boundaries is None else sorted(boundaries)
+    if not boundaries or not os.getenv("OPENAI_API_KEY"):
+        return {}
+    try:
+        from ..llm_client import llm_client
+        from .prompts import STITCH_PROMPT
+        
+        text = "\n\n".join(
+            f"### Boundary {i}\nEnd of previous section:\n...{parts[i - 1][-STITCH_CHARS:]}\n\n"
+            f"Start of next section:\n{parts[i][:STITCH_CHARS]}..."
+            for i in boundaries
+        )
+        prompt = STITCH_PROMPT.format(title=title, boundaries=text, count=len(boundaries))
+        transitions = json.loads(strip_code_fence(llm_client.complete(prompt, temperature=0.3)))
+        if not isinstance(transitions, list) or len(transitions) != len(boundaries):
+            raise ValueError(f"expected {len(boundaries)} transitions")
+    except Exception as e:
+        print(f"Error stitching sections: {e}")
+        return None
+    return {i: str(transition).strip() for i, transition in zip(boundaries, transitions)}
+
+def insert_transitions(parts, transitions):
+    """Put each transition right after the heading of the section it opens"""
+    stitched = list(parts)
+    for i, transition in transitions.items():
+        heading, _, body = parts[i].partition("\n")
+        if heading.startswith("#") and transition:
+            stitched[i] = f"{heading}\n\n{transition}\n\n{body.lstrip()}"
+    return stitched
+
+def stitch_sections(title, parts):
+    """Write the transitions between all sections; on failure the parts are returned unchanged"""
+    return insert_transitions(parts, write_transitions(title, parts) or {})
+
+def expand_draft_sections(outline, sources=None, concurrency=SECTION_CONCURRENCY, stitch=True):
+    """Map-reduce expansion: expand the outline's sections concurrently against a
+    shared context, then stitch the transitions between them.
+    
+    A section that fails to expand keeps its outline text.
+    """
+    title, sections = split_sections(outline)
+    headings = [section.splitlines()[0] for section in sections]
+    texts = expand_sections(title, sections, headings, shared_context(title, sections, sources), concurrency)
+    parts = [text if text is not None else section for text, section in zip(texts, sections)]
+    if stitch:
+        parts = stitch_sections(title, parts)
+    return f"# {title}\n\n" + "\n\n".join(parts) + "\n"
+
 def self_critique(draft):
-    """Self-critique the draft"""
+    """Self-critique the draft; LLM errors propagate to run_post_draft_stages"""
     if not os.getenv("OPENAI_API_KEY"):
         return """## Self-Critique
 
@@ -90,51 +235,38 @@ def self_critique(draft):
 ---
 *Generated in dry-run mode*"""
     
-    try:
-        from langchain_openai import ChatOpenAI
-        from .prompts import SELF_CRITIQUE_PROMPT
-        
-        llm = ChatOpenAI(model="gpt-4o-mini", temperature=0.2)
-        prompt = SELF_CRITIQUE_PROMPT.format(content=draft[:3000])  # Limit content length
-        
-        response = llm.invoke([{"role": "user", "content": prompt}])
-        return response.content
-    except Exception as e:
-        print(f"Error generating critique: {e}")
-        return "Self-critique would be generated here"
+    from ..llm_client import llm_client
+    from .prompts import SELF_CRITIQUE_PROMPT
+    
+    prompt = SELF_CRITIQUE_PROMPT.format(content=draft[:3000])  # Limit content length
+    return llm_client.complete(prompt, temperature=0.2, timeout=STAGE_TIMEOUT)
+
+def local_seo_checklist(draft):
+    """The measured part of the SEO checklist, without LLM suggestions"""
+    from .seo import analyze, render_checklist
+    return render_checklist(analyze(draft))
 
 def seo_checklist(draft):
-    """Generate SEO checklist"""
+    """SEO checklist: measured locally on the full draft, LLM suggestions for the subjective part.
+    LLM errors propagate; the stage then falls back to local_seo_checklist"""
+    checklist = local_seo_checklist(draft)
     if not os.getenv("OPENAI_API_KEY"):
-        return """## SEO Checklist
-
-- [ ] Title is compelling (50-60 chars)
-- [ ] Meta description is descriptive (150-160 chars)
-- [ ] Headings use proper hierarchy (H1, H2, H3)
-- [ ] Keywords are naturally integrated
-- [ ] Internal/external links are present
-- [ ] Images have alt text (if applicable)
-- [ ] Content length is appropriate (1000+ words)
-- [ ] URL structure is clean
-
----
-*Generated in dry-run mode*"""
+        return checklist + "\n\n---\n*Generated in dry-run mode*"
     
-    try:
-        from langchain_openai import ChatOpenAI
-        from .prompts import SEO_CHECKLIST_PROMPT
-        
-        llm = ChatOpenAI(model="gpt-4o-mini", temperature=0.2)
-        prompt = SEO_CHECKLIST_PROMPT.format(content=draft[:3000])  # Limit content length
-        
-        response = llm.invoke([{"role": "user", "content": prompt}])
-        return response.content
-    except Exception as e:
-        print(f"Error generating SEO checklist: {e}")
-        return "SEO checklist would be generated here"
+    from ..llm_client import llm_client
+    from .prompts import SEO_CHECKLIST_PROMPT
+    
+    headings = [line for line in draft.splitlines() if line.startswith("#")]
+    prompt = SEO_CHECKLIST_PROMPT.format(
+        report=checklist,
+        headings="\n".join(headings),
+        content=draft[:3000]  # the measurable checks already covered the full draft
+    )
+    suggestions = llm_client.complete(prompt, temperature=0.2, timeout=STAGE_TIMEOUT)
+    return f"{checklist}\n\n## Suggestions\n\n{suggestions}"
 
 def generate_social_snippets(draft):
-    """Generate social media snippets"""
+    """Generate social media snippets; LLM errors propagate to run_post_draft_stages"""
     if not os.getenv("OPENAI_API_KEY"):
         return {
             "telegram": f"📝 New blog post: {draft.split()[1] if draft.startswith('#') else 'Check out our latest post!'}",
@@ -142,40 +274,114 @@ def generate_social_snippets(draft):
             "twitter": f"New blog post: {draft.split()[1] if draft.startswith('#') else 'Check out our latest post!'} #blog #tech"
         }
     
+    from ..llm_client import llm_client
+    from .prompts import SOCIAL_MEDIA_PROMPT
+    
+    prompt = SOCIAL_MEDIA_PROMPT.format(content=draft[:2000])  # Limit content length
+    content = llm_client.complete(prompt, temperature=0.3, timeout=STAGE_TIMEOUT)
+    
+    # Try to parse JSON response
     try:
-        from langchain_openai import ChatOpenAI
-        from .prompts import SOCIAL_MEDIA_PROMPT
-        import json
-        
-        llm = ChatOpenAI(model="gpt-4o-mini", temperature=0.3)
-        prompt = SOCIAL_MEDIA_PROMPT.format(content=draft[:2000])  # Limit content length
-        
-        response = llm.invoke([{"role": "user", "content": prompt}])
-        
-        # Try to parse JSON response
-        try:
-            return json.loads(response.content)
-        except json.JSONDecodeError:
-            # Fallback if JSON parsing fails
-            return {
-                "telegram": response.content[:300],
-                "facebook": response.content[:280],
-                "twitter": response.content[:280]
-            }
-    except Exception as e:
-        print(f"Error generating social snippets: {e}")
+        return json.loads(content)
+    except json.JSONDecodeError:
+        # Fallback if JSON parsing fails
         return {
-            "telegram": "Social media snippet generation failed",
-            "facebook": "Social media snippet generation failed",
-            "twitter": "Social media snippet generation failed"
+            "telegram": content[:300],
+            "facebook": content[:280],
+            "twitter": content[:280]
         }
 
+POST_DRAFT_STAGES = {
+    "critique": (self_critique, "Self-critique would be generated here"),
+    "seo": (seo_checklist, local_seo_checklist),  # a callable fallback is called with the draft
+    "social": (generate_social_snippets, {
+        "telegram": "Social media snippet generation failed",
+        "facebook": "Social media snippet generation failed",
+        "twitter": "Social media snippet generation failed"
+    }),
+}
+
+def _run_stage(future: Future, started: Dict[str, float], name: str, stage: Callable, draft: str):
+    """Stage thread body: records its start time and resolves future with (result, seconds)"""
+    started[name] = time.perf_counter()
+    try:
+        future.set_result((stage(draft), time.perf_counter() - started[name]))
+    except BaseException as e:
+        future.set_exception(e)
+
+def run_post_draft_stages(draft: str, stages: Dict[str, Tuple[Callable, object]] = None,
+                          timeout: float = STAGE_TIMEOUT) -> Tuple[Dict, Dict]:
+    """Run the stages that only need the finished draft concurrently.
+    
+    stages maps name -> (function, fallback); a callable fallback is
+    called with the draft. Stage functions raise on failure. Each stage gets its own
+    timeout seconds from the moment it starts; one that fails or times out
+    yields its fallback without affecting the others. Stages run on daemon
+    threads: Python cannot stop a thread, so a timed-out stage is abandoned
+    (its LLM call still ends at its own STAGE_TIMEOUT request timeout) and
+    never keeps the process from exiting. Returns (results, latency) where
+    latency has per-stage seconds and status plus the wall time of the
+    whole fan-out.
+    """
+    stages = stages or POST_DRAFT_STAGES
+    start = time.perf_counter()
+    futures, started = {}, {}
+    for name, (stage, _) in stages.items():
+        futures[name] = Future()
+        started[name] = time.perf_counter()  # replaced by the thread's own start time
+        threading.Thread(target=_run_stage, args=(futures[name], started, name, stage, draft),
+                         name=f"content-stage-{name}", daemon=True).start()
+    
+    finished = {}
+    pending = dict(futures)
+    while pending:
+        now = time.perf_counter()
+        for name, future in list(pending.items()):
+            fallback = stages[name][1]
+            if future.done():
+                try:
+                    finished[name] = future.result() + ("ok",)
+                except Exception as e:
+                    finished[name] = (fallback, time.perf_counter() - started[name], "error")
+                    print(f"Error in {name} stage: {e}")
+            elif now >= started[name] + timeout:
+                finished[name] = (fallback, now - started[name], "timeout")
+                print(f"⏱️  {name} timed out after {timeout:g}s - using fallback")
+            else:
+                continue
+            del pending[name]
+        if pending:
+            next_deadline = min(started[name] + timeout for name in pending)
+            wait(list(pending.values()), timeout=max(0.0, next_deadline - time.perf_counter()),
+                 return_when=FIRST_COMPLETED)
+    
+    results, latency = {}, {"stages": {}}
+    for name in stages:
+        results[name], seconds, status = finished[name]
+        if status != "ok" and callable(results[name]):
+            results[name] = results[name](draft)
+        latency["stages"][name] = {"seconds": round(seconds, 3), "status": status}
+    latency["seconds"] = round(time.perf_counter() - start, 3)
+    latency["sequential_seconds"] = round(sum(s["seconds"] for s in latency["stages"].values()), 3)
+    return results, latency
+
 def main():
-    if len(sys.argv) < 2:
-        print("Usage: python -m agents.content_agent.main <outline_file>")
-        sys.exit(1)
+    parser = argparse.ArgumentParser(description="Create or edit a blog post from an outline file or a topic")
+    parser.add_argument("outline_file", help="Outline file, or a topic to outline first")
+    parser.add_argument("--incremental", action="store_true",
+                        help="Only regenerate stages whose inputs changed (outputs in out/build/<name>/)")
+    parser.add_argument("--build-dir", help="Build directory for --incremental")
+    parser.add_argument("--parallel-sections", action="store_true",
+                        help="Expand the outline's sections concurrently, then stitch them")
+    args = parser.parse_args()
+    outline_file = args.outline_file
     
-    outline_file = sys.argv[1]
+    if args.incremental:
+        from .incremental import run_incremental
+        run_incremental(outline_file, Path(args.build_dir) if args.build_dir else None)
+        from ..llm_client import llm_client
+        llm_client.print_stats()
+        return
     
     if not os.path.exists(outline_file):
         # Create outline from topic
@@ -189,12 +395,15 @@ def main():
         print(f"Read outline from: {outline_file}")
     
     # Expand to draft
-    draft = expand_draft(outline)
+    start = time.perf_counter()
+    draft = expand_draft_sections(outline) if args.parallel_sections else expand_draft(outline)
+    draft_seconds = time.perf_counter() - start
     
-    # Generate critique, SEO checklist, and social snippets
-    critique = self_critique(draft)
-    seo = seo_checklist(draft)
-    social = generate_social_snippets(draft)
+    # Generate critique, SEO checklist, and social snippets concurrently
+    results, latency = run_post_draft_stages(draft)
+    critique, seo, social = results["critique"], results["seo"], results["social"]
+    latency = {"expand_draft": round(draft_seconds, 3), "post_draft": latency,
+               "total": round(time.perf_counter() - start, 3)}
     
     # Save outputs
     output_dir = Path("out")
@@ -209,10 +418,19 @@ def main():
         json.dumps(social, ensure_ascii=False, indent=2), 
         encoding="utf-8"
     )
+    (output_dir / f"latency-{timestamp}.json").write_text(
+        json.dumps(latency, ensure_ascii=False, indent=2),
+        encoding="utf-8"
+    )
     
+    print("⏱️  " + ", ".join(
+        [f"draft {latency['expand_draft']:.2f}s"] +
+        [f"{name} {s['seconds']:.2f}s" + ("" if s["status"] == "ok" else f" ({s['status']})")
+         for name, s in latency["post_draft"]["stages"].items()]
+    ) + f" | post-draft wall {latency['post_draft']['seconds']:.2f}s")
+    from ..llm_client import llm_client
+    llm_client.print_stats()
     print(f"✅ Generated draft, critique, SEO checklist, and social snippets in out/")
 
 if __name__ == "__main__":
-    import datetime
-    from pathlib import Path
     main()
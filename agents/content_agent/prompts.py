@@ -77,6 +77,38 @@ DRAFT_EXPANSION_PROMPT = """Expand the following outline into a complete blog po
 
 Create a complete, publishable blog post."""
 
+SECTION_EXPANSION_PROMPT = """Expand one section of the blog post "{title}":
+
+## Post Outline (for context):
+{headings}
+
+## Section to Write:
+{section}
+
+## Requirements:
+- Write only this section, starting with its heading
+- Develop each point with examples and insights
+- Do not repeat what other sections of the outline cover
+
+## Style Guidelines:
+- Professional but accessible tone
+- Clear and concise writing
+- Use proper Markdown formatting
+
+## Additional Context:
+{additional_context}
+
+Write the section."""
+
+STITCH_PROMPT = """The blog post "{title}" was written section by section. Write a transition for each boundary below: one or two sentences that open the next section by connecting it to the previous one.
+
+{boundaries}
+
+## Requirements:
+- Return only a JSON array of exactly {count} strings, in boundary order
+- Do not repeat the section headings
+- Keep each transition under 50 words"""
+
 SELF_CRITIQUE_PROMPT = """Critically review the following blog post for quality and improvement:
 
 ## Post:
@@ -98,28 +130,25 @@ SELF_CRITIQUE_PROMPT = """Critically review the following blog post for quality
 
 Be constructive and specific in your feedback."""
 
-SEO_CHECKLIST_PROMPT = """Analyze the following blog post for SEO optimization:
+SEO_CHECKLIST_PROMPT = """Suggest SEO improvements for the following blog post.
 
-## Post:
+## Measured Checks (computed on the full post):
+{report}
+
+## Headings:
+{headings}
+
+## Post (beginning):
 {content}
 
-## SEO Checklist:
-- [ ] **Title** - Compelling and keyword-rich (50-60 chars)
-- [ ] **Meta Description** - Descriptive and engaging (150-160 chars)
-- [ ] **Headings** - Proper H1, H2, H3 hierarchy
-- [ ] **Keywords** - Naturally integrated throughout
-- [ ] **Content Length** - 1000+ words for comprehensive coverage
-- [ ] **Internal Links** - Links to related content
-- [ ] **External Links** - Authoritative source citations
-- [ ] **Readability** - Clear, accessible writing
-- [ ] **Images** - Alt text and descriptive captions
-- [ ] **URL Structure** - Clean, descriptive URLs
+## Provide only what the checks cannot measure:
+- A more compelling, keyword-rich title (50-60 chars) if the current one is weak
+- A meta description (150-160 chars)
+- Where internal links and authoritative external citations would help readers
+- Readability issues and places where the keyword could fit more naturally
+- How to fix each failed or warned check above
 
-## Provide:
-- Specific recommendations for each item
-- Suggested improvements
-- Missing elements to add
-- Overall SEO score (1-10)"""
+Keep it to a short bulleted list."""
 
 SOCIAL_MEDIA_PROMPT = """Generate social media snippets for the following blog post:
 
@@ -0,0 +1,327 @@
+# agents/content_agent/seo.py
+"""
+Local SEO analyzer for Markdown posts.
+
+Everything measurable is computed here in one pass over the full post, with
+no LLM call: title and meta description length, heading hierarchy, word
+count, internal/external links, image alt text and keyword density. The
+result is a structured report; seo_checklist() only asks the LLM for the
+subjective suggestions on top of it.
+Run: python -m agents.content_agent.seo post.md [post2.md ...]
+     python -m agents.content_agent.seo --dir content/posts --json out/seo-audit.json
+"""
+import os
+import re
+import sys
+import json
+import time
+import argparse
+from pathlib import Path
+from collections import Counter
+from typing import Any, Dict, List, Optional, Tuple
+
+SEO_MIN_WORDS = int(os.getenv("SEO_MIN_WORDS", "1000"))
+# Links to this host count as internal (e.g. "avrtt.blog")
+SEO_SITE_HOST = os.getenv("SEO_SITE_HOST", "")
+TITLE_CHARS = (50, 60)
+META_DESCRIPTION_CHARS = (150, 160)
+KEYWORD_DENSITY = (0.5, 2.5)  # percent of words
+
+HEADING = re.compile(r"^(#{1,6})\s+(.*?)\s*#*\s*$")
+FENCE = re.compile(r"^\s*(```|~~~)")
+LIST_ITEM = re.compile(r"^\s*([-*+]|\d{1,9}[.)])(\s|$)")
+IMAGE = re.compile(r"!\[([^\]]*)\]\(\s*<?([^)\s>]*)[^)]*\)")
+HTML_IMAGE = re.compile(r"<img\b[^>]*>", re.IGNORECASE)
+HTML_ALT = re.compile(r"""\balt\s*=\s*(["'])(.*?)\1""", re.IGNORECASE)
+LINK = re.compile(r"\[([^\]]*)\]\(\s*<?([^)\s>]*)[^)]*\)")
+AUTOLINK = re.compile(r"<(https?://[^>\s]+)>")
+REFERENCE = re.compile(r"^\s{0,3}\[[^\]]+\]:\s*<?(\S+?)>?(\s|$)")
+MARKUP = re.compile(r"[*_`~]|<[^>]+>")
+WORD = re.compile(r"[^\W_][\w'’-]*")
+
+STOPWORDS = frozenset("""
+a about above after again against all also am an and any are as at be because been before being
+below between both but by can could did do does doing down during each few for from further had
+has have having he her here hers him his how i if in into is it its itself just let me more most
+my no nor not now of off on once only or other our ours out over own same she should so some such
+than that the their theirs them then there these they this those through to too under until up
+use used using very was we were what when where which while who whom why will with would you your
+""".split())
+
+def parse_front_matter(lines: List[str]) -> Tuple[Dict[str, str], int]:
+    """Simple `key: value` YAML front matter; returns (fields, index of the first body line)"""
+    if not lines or lines[0].strip() != "---":
+        return {}, 0
+    fields = {}
+    for i, line in enumerate(lines[1:], start=1):
+        if line.strip() in ("---", "..."):
+            return fields, i + 1
+        key, sep, value = line.partition(":")
+        if sep and not line.startswith((" ", "\t", "-")):
+            fields[key.strip().lower()] = value.strip().strip("\"'")
+    return {}, 0  # no closing fence: not front matter
+
+def front_matter_keyword(fields: Dict[str, str]) -> Optional[str]:
+    value = fields.get("keyword") or fields.get("keywords") or fields.get("tags") or ""
+    first = value.strip("[]").split(",")[0].strip().strip("\"'")
+    return first or None
+
+def is_external(url: str) -> bool:
+    if not url.startswith(("http://", "https://", "//")):
+        return False
+    host = url.split("//", 1)[1].split("/", 1)[0].lower()
+    return not (SEO_SITE_HOST and (host == SEO_SITE_HOST or host.endswith("." + SEO_SITE_HOST)))
+
+def plain(text: str) -> str:
+    """Heading or paragraph text without images, link targets and inline markup"""
+    text = IMAGE.sub(lambda m: m.group(1), text)
+    text = LINK.sub(lambda m: m.group(1), text)
+    return MARKUP.sub("", text).strip()
+
+def phrase_count(tokens: List[str], phrase: List[str]) -> int:
+    if not phrase:
+        return 0
+    return f" {' '.join(tokens)} ".count(f" {' '.join(phrase)} ")
+
+def infer_keyword(counts: Counter, title: str) -> Optional[str]:
+    """The most frequent content word of the title, else of the whole post"""
+    title_words = {w for w in WORD.findall(title.lower()) if w not in STOPWORDS and len(w) > 2}
+    for word, _ in counts.most_common():
+        if word in title_words:
+            return word
+    for word, _ in counts.most_common(50):
+        if word not in STOPWORDS and len(word) > 2:
+            return word
+    return None
+
+def check(checks: List[Dict[str, str]], name: str, status: str, detail: str):
+    checks.append({"check": name, "status": status, "detail": detail})
+
+def analyze(markdown: str, keyword: Optional[str] = None) -> Dict[str, Any]:
+    """SEO report for one Markdown post: metrics, per-check pass/warn/fail and a 0-10 score"""
+    lines = markdown.splitlines()
+    fields, start = parse_front_matter(lines)
+
+    headings = []  # (level, text)
+    body: List[str] = []  # text lines, tokenized in one go after the pass
+    internal = external = 0
+    images = missing_alt = 0
+    intro: List[str] = []  # first paragraph
+    intro_done = False
+    in_code = False
+    # An indented line is code only where it cannot continue a paragraph or a
+    # list item: after a blank line or a heading, outside a list
+    indented_code = False
+    code_can_start = True
+    in_list = False
+
+    for line in lines[start:]:
+        if FENCE.match(line):
+            in_code = not in_code
+            code_can_start = True
+            continue
+        if in_code:
+            continue
+        if line.startswith(("    ", "\t")) and line.strip():
+            if indented_code or (code_can_start and not in_list):
+                indented_code = True
+                continue
+        elif line.strip():
+            indented_code = False
+            in_list = bool(LIST_ITEM.match(line)) or (in_list and not code_can_start)
+        code_can_start = not line.strip()
+        heading = HEADING.match(line)
+        if heading:
+            text = plain(heading.group(2))
+            headings.append((len(heading.group(1)), text))
+            body.append(text)
+            code_can_start, in_list = True, False
+            continue
+        if not line.strip():
+            intro_done = intro_done or bool(intro)
+            continue
+
+        reference = REFERENCE.match(line)
+        if reference:
+            if is_external(reference.group(1)):
+                external += 1
+            else:
+                internal += 1
+            continue
+        if "](" in line:
+            for alt, _ in IMAGE.findall(line):
+                images += 1
+                missing_alt += not alt.strip()
+            for _, url in LINK.findall(IMAGE.sub("", line)):
+                if url.startswith("mailto:"):
+                    continue
+                if is_external(url):
+                    external += 1
+                else:
+                    internal += 1
+        if "<" in line:
+            for tag in HTML_IMAGE.findall(line):
+                images += 1
+                alt = HTML_ALT.search(tag)
+                missing_alt += not (alt and alt.group(2).strip())
+            external += len(AUTOLINK.findall(line))
+
+        body.append(line)
+        if not intro_done:
+            intro.append(plain(line))
+
+    h1 = [text for level, text in headings if level == 1]
+    title = fields.get("title") or (h1[0] if h1 else "")
+    description = fields.get("description") or fields.get("excerpt") or ""
+    intro = " ".join(intro)
+    tokens = WORD.findall(plain("\n".join(body)).lower())
+    words = len(tokens)
+    counts = Counter(tokens)
+
+    keyword_source = "argument" if keyword else None
+    if not keyword:
+        keyword = front_matter_keyword(fields)
+        keyword_source = "front matter" if keyword else None
+    if not keyword:
+        keyword = infer_keyword(counts, title)
+        keyword_source = "inferred" if keyword else None
+    phrase = WORD.findall(keyword.lower()) if keyword else []
+    keyword_count = counts[phrase[0]] if len(phrase) == 1 else phrase_count(tokens, phrase)
+    density = round(100 * keyword_count * len(phrase) / words, 2) if words else 0.0
+
+    skips = []
+    previous = 1 if title else 0
+    for level, text in headings:
+        if level > previous + 1 and previous:
+            skips.append(f"H{previous} -> H{level} ({text})")
+        previous = level
+
+    checks: List[Dict[str, str]] = []
+    low, high = TITLE_CHARS
+    if not title:
+        check(checks, "title", "fail", "no title (front matter title or # heading)")
+    else:
+        check(checks, "title", "pass" if low <= len(title) <= high else "warn", f"{len(title)} chars ({low}-{high})")
+
+    low, high = META_DESCRIPTION_CHARS
+    if description:
+        check(checks, "meta_description", "pass" if low <= len(description) <= high else "warn",
+              f"{len(description)} chars ({low}-{high})")
+    else:
+        check(checks, "meta_description", "warn", f"none in front matter; first paragraph is {len(intro)} chars")
+
+    if len(h1) > 1 or (not h1 and not fields.get("title")):
+        check(checks, "headings", "fail", f"{len(h1)} H1 headings (want exactly 1)")
+    elif skips:
+        check(checks, "headings", "warn", "skipped levels: " + "; ".join(skips))
+    elif not any(level == 2 for level, _ in headings):
+        check(checks, "headings", "warn", "no H2 sections")
+    else:
+        check(checks, "headings", "pass", f"{len(headings)} headings, no skipped levels")
+
+    check(checks, "word_count", "pass" if words >= SEO_MIN_WORDS else "warn", f"{words} words ({SEO_MIN_WORDS}+)")
+    check(checks, "internal_links", "pass" if internal else "warn", f"{internal} internal links")
+    check(checks, "external_links", "pass" if external else "warn", f"{external} external links")
+    if missing_alt:
+        check(checks, "image_alt", "fail", f"{missing_alt} of {images} images without alt text")
+    else:
+        check(checks, "image_alt", "pass", f"{images} images, all with alt text")
+
+    low, high = KEYWORD_DENSITY
+    if not keyword:
+        check(checks, "keyword_density", "warn", "no keyword")
+    else:
+        placed = [where for where, text in (("title", title), ("intro", intro)) if keyword.lower() in text.lower()]
+        status = "pass" if low <= density <= high and "title" in placed else "warn"
+        check(checks, "keyword_density", status,
+              f"'{keyword}' {density}% ({low}-{high}%), in {', '.join(placed) or 'neither title nor intro'}")
+
+    weights = {"pass": 1.0, "warn": 0.5, "fail": 0.0}
+    score = round(10 * sum(weights[c["status"]] for c in checks) / len(checks), 1)
+    return {
+        "title": title,
+        "title_chars": len(title),
+        "meta_description_chars": len(description),
+        "words": words,
+        "headings": {f"h{level}": sum(1 for l, _ in headings if l == level) for level in range(1, 7)},
+        "heading_skips": skips,
+        "links": {"internal": internal, "external": external},
+        "images": {"total": images, "missing_alt": missing_alt},
+        "keyword": keyword,
+        "keyword_source": keyword_source,
+        "keyword_count": keyword_count,
+        "keyword_density": density,
+        "checks": checks,
+        "score": score,
+    }
+
+def status(report: Dict[str, Any]) -> str:
+    """Worst check status of a report"""
+    statuses = {c["status"] for c in report["checks"]}
+    return "fail" if "fail" in statuses else "warn" if "warn" in statuses else "pass"
+
+def render_checklist(report: Dict[str, Any]) -> str:
+    """The report as the Markdown checklist seo_checklist() used to ask the LLM for"""
+    marks = {"pass": "[x]", "warn": "[ ]", "fail": "[ ] ❌"}
+    lines = ["## SEO Checklist", "", f"**Score:** {report['score']}/10", ""]
+    for c in report["checks"]:
+        name = c["check"].replace("_", " ").capitalize()
+        lines.append(f"- {marks[c['status']]} **{name}** - {c['detail']}")
+    return "\n".join(lines)
+
+def analyze_file(path: Path, keyword: Optional[str] = None) -> Dict[str, Any]:
+    report = analyze(Path(path).read_text(encoding="utf-8", errors="replace"), keyword)
+    report["path"] = str(path)
+    return report
+
+def analyze_dir(directory: Path, pattern: str = "**/*.md", keyword: Optional[str] = None) -> List[Dict[str, Any]]:
+    """Reports for every post under directory matching pattern, in path order"""
+    return [analyze_file(path, keyword) for path in sorted(Path(directory).glob(pattern)) if path.is_file()]
+
+def main():
+    parser = argparse.ArgumentParser(description="Local SEO analysis of Markdown posts")
+    parser.add_argument("posts", nargs="*", help="Markdown files to analyze")
+    parser.add_argument("--dir", help="Analyze every post under this directory")
+    parser.add_argument("--pattern", default="**/*.md", help="Glob for --dir")
+    parser.add_argument("--keyword", help="Target keyword (default: front matter keywords, else inferred)")
+    parser.add_argument("--json", help="Write all reports to this JSON file")
+    parser.add_argument("--fail-on", choices=["fail", "warn", "never"], default="fail",
+                        help="Exit 1 if any post has a check at this level (for CI)")
+    args = parser.parse_args()
+
+    if not args.posts and not args.dir:
+        parser.error("give post files or --dir")
+    if args.dir and not os.path.isdir(args.dir):
+        print(f"Error: directory not found: {args.dir}")
+        sys.exit(1)
+
+    start = time.perf_counter()
+    reports = [analyze_file(Path(p), args.keyword) for p in args.posts]
+    if args.dir:
+        reports += analyze_dir(Path(args.dir), args.pattern, args.keyword)
+    elapsed = time.perf_counter() - start
+
+    by_status = Counter(status(r) for r in reports)
+    if len(reports) == 1:
+        print(render_checklist(reports[0]))
+    else:
+        for report in reports:
+            if status(report) == "fail":
+                failed = "; ".join(f"{c['check']}: {c['detail']}" for c in report["checks"] if c["status"] == "fail")
+                print(f"❌ {report['path']} ({report['score']}/10) - {failed}")
+    rate = len(reports) / elapsed if elapsed > 0 else 0.0
+    print(f"🔎 Analyzed {len(reports)} posts in {elapsed:.2f}s ({rate:.0f} posts/s): "
+          f"{by_status['pass']} pass, {by_status['warn']} with warnings, {by_status['fail']} failing")
+
+    if args.json:
+        Path(args.json).parent.mkdir(parents=True, exist_ok=True)
+        Path(args.json).write_text(json.dumps(reports, ensure_ascii=False, indent=2), encoding="utf-8")
+        print(f"✅ Reports written to {args.json}")
+
+    if args.fail_on == "fail" and by_status["fail"]:
+        sys.exit(1)
+    if args.fail_on == "warn" and (by_status["fail"] or by_status["warn"]):
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,274 @@
+# agents/http_client.py
+"""
+Shared HTTP client for all agents.
+
+One requests.Session with per-host connection pools, so repeated calls to
+the same host reuse keep-alive connections (and skip TCP/TLS handshakes).
+Every request gets a timeout; 429s are retried for any method and 5xx
+responses only for idempotent ones (a 502 after a POST may hide a request
+the server already handled), with jittered exponential backoff that honors
+Retry-After. Per-host latency, retry and connection counts are kept for
+reporting.
+"""
+import os
+import re
+import time
+import codecs
+import random
+import threading
+from typing import Any, Dict, Iterable, Optional, Tuple
+from urllib.parse import urlsplit
+from email.utils import parsedate_to_datetime
+from datetime import datetime, timezone
+
+CONNECT_TIMEOUT = float(os.getenv("HTTP_CONNECT_TIMEOUT", "5"))
+READ_TIMEOUT = float(os.getenv("HTTP_READ_TIMEOUT", "15"))
+MAX_RETRIES = int(os.getenv("HTTP_MAX_RETRIES", "3"))
+POOL_SIZE = int(os.getenv("HTTP_POOL_SIZE", "10"))  # connections kept per host
+POOL_HOSTS = 32
+BACKOFF_BASE = 0.5
+BACKOFF_CAP = 30.0
+MAX_RETRY_AFTER = 60.0
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+RATE_LIMIT_STATUS = 429  # the request was refused, so retrying is safe for any method
+IDEMPOTENT_METHODS = {"GET", "HEAD", "OPTIONS", "PUT", "DELETE"}
+USER_AGENT = "avrtt-blog-agents/1.0"
+STREAM_CHUNK = 64 * 1024
+HTML_TYPES = ("text/html", "application/xhtml+xml")
+META_CHARSET = re.compile(rb"""<meta[^>]+charset=["']?([\w-]+)""", re.IGNORECASE)
+
+class ResponseRejected(Exception):
+    """A response refused from its headers, before the body was downloaded"""
+
+def retry_after_seconds(value: Optional[str]) -> Optional[float]:
+    """Parse a Retry-After header (delta seconds or HTTP date)"""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
+
+def backoff_delay(attempt: int, retry_after: Optional[float] = None) -> float:
+    """Full-jitter exponential backoff, or the server's Retry-After if given"""
+    if retry_after is not None:
+        return min(retry_after, MAX_RETRY_AFTER)
+    return random.uniform(0, min(BACKOFF_CAP, BACKOFF_BASE * 2 ** attempt))
+
+def cap_timeout(timeout, seconds: float):
+    """A requests timeout (seconds or a (connect, read) pair) cut to at most seconds"""
+    if isinstance(timeout, tuple):
+        return tuple(min(t, seconds) if t is not None else seconds for t in timeout)
+    return min(timeout, seconds) if timeout is not None else seconds
+
+def read_text(response, max_bytes: int, deadline: Optional[float] = None) -> Tuple[str, bool]:
+    """Decode at most max_bytes of a streamed response body.
+
+    The charset comes from Content-Type, else a <meta charset> in the first
+    chunk, else UTF-8. Reading also stops once time.monotonic() passes
+    deadline. Returns (text, truncated).
+    """
+    decoder = None
+    parts = []
+    read = 0
+    truncated = False
+    for chunk in response.iter_content(chunk_size=STREAM_CHUNK):
+        if decoder is None:
+            charset = response.encoding if "charset" in response.headers.get("Content-Type", "").lower() else None
+            match = META_CHARSET.search(chunk[:4096])
+            charset = charset or (match.group(1).decode("ascii") if match else "utf-8")
+            try:
+                decoder = codecs.getincrementaldecoder(charset)(errors="replace")
+            except LookupError:
+                decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+        if read + len(chunk) > max_bytes:
+            chunk = chunk[:max_bytes - read]
+            truncated = True
+        read += len(chunk)
+        parts.append(decoder.decode(chunk))
+        if deadline is not None and time.monotonic() >= deadline:
+            truncated = True
+        if truncated:
+            break
+    if decoder is not None:
+        parts.append(decoder.decode(b"", final=True))
+    return "".join(parts), truncated
+
+class HttpClient:
+    """Pooled, retrying HTTP client shared by the agents"""
+
+    def __init__(self, timeout=(CONNECT_TIMEOUT, READ_TIMEOUT), max_retries: int = MAX_RETRIES,
+                 pool_size: int = POOL_SIZE):
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.pool_size = pool_size
+        self._session = None
+        self._lock = threading.Lock()
+        self._metrics = {}
+
+    @property
+    def session(self):
+        """requests.Session, created on first use"""
+        if self._session is None:
+            with self._lock:
+                if self._session is None:
+                    import requests
+                    from requests.adapters import HTTPAdapter
+                    session = requests.Session()
+                    adapter = HTTPAdapter(pool_connections=POOL_HOSTS, pool_maxsize=self.pool_size,
+                                          max_retries=0)
+                    session.mount("http://", adapter)
+                    session.mount("https://", adapter)
+                    session.headers["User-Agent"] = USER_AGENT
+                    self._session = session
+        return self._session
+
+    def _record(self, host: str, **changes):
+        with self._lock:
+            entry = self._metrics.setdefault(host, {
+                "requests": 0, "retries": 0, "errors": 0, "latencies": []
+            })
+            for name, value in changes.items():
+                if name == "latency":
+                    entry["latencies"].append(value)
+                else:
+                    entry[name] += value
+
+    def request(self, method: str, url: str, timeout=None, max_retries: Optional[int] = None,
+                deadline: Optional[float] = None, **kwargs):
+        """Send a request, retrying 429 (any method), and 5xx and connection
+        errors (idempotent methods only). Returns the last response; raises the
+        last exception if every attempt failed without one.
+
+        With a deadline (a time.monotonic() value) each attempt's timeout is
+        cut to the time left, and no retry is started that could not finish
+        by then.
+        """
+        import requests
+
+        method = method.upper()
+        host = urlsplit(url).netloc.lower()
+        retries = self.max_retries if max_retries is None else max_retries
+        timeout = timeout if timeout is not None else self.timeout
+
+        def time_left() -> float:
+            return deadline - time.monotonic() if deadline is not None else float("inf")
+
+        for attempt in range(retries + 1):
+            if time_left() <= 0:
+                raise requests.Timeout(f"deadline passed before {method} {url}")
+            attempt_timeout = cap_timeout(timeout, time_left()) if deadline is not None else timeout
+            start = time.perf_counter()
+            try:
+                response = self.session.request(method, url, timeout=attempt_timeout, **kwargs)
+            except (requests.ConnectionError, requests.Timeout):
+                self._record(host, requests=1, errors=1, latency=time.perf_counter() - start)
+                delay = backoff_delay(attempt)
+                if attempt == retries or method not in IDEMPOTENT_METHODS or delay >= time_left():
+                    raise
+                self._record(host, retries=1)
+                time.sleep(delay)
+                continue
+
+            self._record(host, requests=1, latency=time.perf_counter() - start)
+            retryable = response.status_code in RETRY_STATUSES and (
+                response.status_code == RATE_LIMIT_STATUS or method in IDEMPOTENT_METHODS
+            )
+            if not retryable or attempt == retries:
+                return response
+            delay = backoff_delay(attempt, retry_after_seconds(response.headers.get("Retry-After")))
+            if delay >= time_left():
+                return response
+
+            self._record(host, retries=1)
+            response.close()
+            time.sleep(delay)
+
+    def get(self, url: str, **kwargs):
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url: str, **kwargs):
+        return self.request("POST", url, **kwargs)
+
+    def stream_text(self, url: str, max_bytes: int, content_types: Iterable[str] = HTML_TYPES,
+                    reject_over: Optional[int] = None, **kwargs) -> Tuple[Any, str, bool]:
+        """GET a text body without ever holding more than max_bytes of it.
+
+        Content-Type is checked before any of the body is read (a missing
+        type is allowed), as is Content-Length against reject_over; failures
+        raise ResponseRejected. The body is then read in chunks and decoded
+        incrementally until max_bytes. Returns (response, text, truncated);
+        304s and error statuses come back with whatever body they had.
+        A deadline (see request) also bounds reading the body, which then
+        comes back truncated.
+        """
+        response = self.request("GET", url, stream=True, **kwargs)
+        try:
+            if response.status_code == 304:
+                return response, "", False
+            content_type = response.headers.get("Content-Type", "")
+            mime = content_type.split(";")[0].strip().lower()
+            if response.ok and mime and mime not in content_types:
+                raise ResponseRejected(f"content type {mime}")
+            length = response.headers.get("Content-Length", "")
+            if reject_over is not None and length.isdigit() and int(length) > reject_over:
+                raise ResponseRejected(f"body of {int(length)} bytes")
+
+            text, truncated = read_text(response, max_bytes, kwargs.get("deadline"))
+            return response, text, truncated
+        finally:
+            response.close()
+
+    def _connections(self, host: str) -> Optional[int]:
+        """Connections opened to a host so far (each one a TCP and maybe TLS handshake)"""
+        if self._session is None:
+            return None
+        pools = self._session.get_adapter("https://").poolmanager.pools
+        total = 0
+        for key in pools.keys():
+            default_port = 443 if key.key_scheme == "https" else 80
+            if host in (key.key_host, f"{key.key_host}:{key.key_port or default_port}"):
+                pool = pools.get(key)
+                total += pool.num_connections if pool is not None else 0
+        return total
+
+    def metrics(self) -> Dict[str, Dict[str, Any]]:
+        """Per-host request, retry, error, connection and latency figures"""
+        report = {}
+        with self._lock:
+            snapshot = {host: dict(entry, latencies=sorted(entry["latencies"]))
+                        for host, entry in self._metrics.items()}
+        for host, entry in snapshot.items():
+            latencies = entry.pop("latencies")
+            if latencies:
+                entry["avg_ms"] = round(1000 * sum(latencies) / len(latencies), 1)
+                entry["p95_ms"] = round(1000 * latencies[min(len(latencies) - 1, int(0.95 * len(latencies)))], 1)
+            entry["connections"] = self._connections(host)
+            report[host] = entry
+        return report
+
+    def print_metrics(self):
+        """Print a per-host summary of this process's HTTP traffic"""
+        report = self.metrics()
+        if not report:
+            return
+        print("🌐 HTTP per host:")
+        for host, entry in sorted(report.items()):
+            print(f"   {host}: {entry['requests']} requests, {entry['connections']} connections, "
+                  f"{entry['retries']} retries, {entry['errors']} errors, "
+                  f"avg {entry.get('avg_ms', 0)} ms, p95 {entry.get('p95_ms', 0)} ms")
+
+    def close(self):
+        if self._session is not None:
+            self._session.close()
+            self._session = None
+
+http_client = HttpClient()
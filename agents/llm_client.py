@@ -0,0 +1,224 @@
+# agents/llm_client.py
+"""
+Shared LLM client for all agents.
+
+chat_model() hands out one ChatOpenAI per (model, temperature, timeout),
+all on a single pooled httpx client, so agents stop building a new client
+(and opening new connections) on every call. complete() and stream() put a
+persistent, content-addressed cache in front of the model: a response is
+keyed on model, temperature and the prompt hash, expires after
+LLM_CACHE_TTL seconds, and the least recently used entries are evicted
+past LLM_CACHE_MAX_ENTRIES. Re-running a pipeline on unchanged inputs is
+then served from disk without a single API request.
+"""
+import os
+import json
+import time
+import atexit
+import hashlib
+import threading
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Union
+
+LLM_MODEL = os.getenv("LLM_MODEL", "gpt-4o-mini")
+LLM_CACHE_DIR = Path(os.getenv("LLM_CACHE_DIR", ".cache/llm"))
+LLM_CACHE_TTL = float(os.getenv("LLM_CACHE_TTL", str(30 * 24 * 3600)))
+LLM_CACHE_MAX_ENTRIES = int(os.getenv("LLM_CACHE_MAX_ENTRIES", "5000"))
+LLM_CACHE_ENABLED = os.getenv("LLM_CACHE", "1") != "0"
+LLM_POOL_SIZE = int(os.getenv("LLM_POOL_SIZE", "10"))
+
+INDEX_FILE = "index.json"
+
+Prompt = Union[str, List[Dict[str, str]]]
+
+def as_messages(prompt: Prompt) -> List[Dict[str, str]]:
+    """A bare prompt string becomes a single user message"""
+    return [{"role": "user", "content": prompt}] if isinstance(prompt, str) else list(prompt)
+
+def cache_key(model: str, temperature: float, messages: List[Dict[str, str]]) -> str:
+    payload = json.dumps({"model": model, "temperature": temperature, "messages": messages},
+                         sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+class LLMCache:
+    """Prompt hash -> response text, with a TTL and LRU eviction by entry count"""
+
+    def __init__(self, path=LLM_CACHE_DIR, ttl: float = LLM_CACHE_TTL,
+                 max_entries: int = LLM_CACHE_MAX_ENTRIES):
+        self.path = Path(path)
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._index = None  # key -> entry metadata, loaded on first use
+        self._dirty = False  # access times changed by reads since the last save
+        atexit.register(self.flush)
+        self.stats = {"hits": 0, "misses": 0, "evicted": 0}
+
+    def _load(self):
+        if self._index is not None:
+            return
+        self._index = {}
+        index_path = self.path / INDEX_FILE
+        if index_path.exists():
+            try:
+                self._index = json.loads(index_path.read_text(encoding="utf-8"))
+            except (OSError, ValueError) as e:
+                print(f"LLM cache index unreadable, starting empty: {e}")
+
+    def _save(self):
+        self.path.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path / f"{INDEX_FILE}.{os.getpid()}.{threading.get_ident()}.tmp"
+        tmp_path.write_text(json.dumps(self._index), encoding="utf-8")
+        os.replace(tmp_path, self.path / INDEX_FILE)
+        self._dirty = False
+
+    def flush(self):
+        """Persist access times changed by reads since the last save"""
+        with self._lock:
+            if self._dirty:
+                self._save()
+
+    def get(self, key: str) -> Optional[str]:
+        """Cached response for key if younger than the TTL"""
+        with self._lock:
+            self._load()
+            entry = self._index.get(key)
+            if entry is None or time.time() - entry["created"] >= self.ttl:
+                self.stats["misses"] += 1
+                return None
+            try:
+                text = (self.path / f"{key}.txt").read_text(encoding="utf-8")
+            except OSError:
+                self._index.pop(key, None)
+                self.stats["misses"] += 1
+                return None
+            entry["accessed"] = time.time()
+            self._dirty = True
+            self.stats["hits"] += 1
+            return text
+
+    def put(self, key: str, text: str, model: str):
+        """Store a response, then drop expired and least recently used entries"""
+        self.path.mkdir(parents=True, exist_ok=True)
+        (self.path / f"{key}.txt").write_text(text, encoding="utf-8")
+        now = time.time()
+        with self._lock:
+            self._load()
+            self._index[key] = {"model": model, "created": now, "accessed": now, "chars": len(text)}
+            self._evict(now)
+            self._save()
+
+    def _evict(self, now: float):
+        expired = [key for key, entry in self._index.items() if now - entry["created"] >= self.ttl]
+        by_age = sorted(self._index, key=lambda k: self._index[k]["accessed"])
+        overflow = by_age[:max(0, len(self._index) - len(expired) - self.max_entries)]
+        for key in set(expired) | set(overflow):
+            self._index.pop(key, None)
+            self.stats["evicted"] += 1
+            try:
+                (self.path / f"{key}.txt").unlink()
+            except OSError:
+                pass
+
+    def count(self) -> int:
+        with self._lock:
+            self._load()
+            return len(self._index)
+
+class LLMClient:
+    """ChatOpenAI factory on one pooled HTTP client, with a response cache"""
+
+    def __init__(self, cache: Optional[LLMCache] = None, pool_size: int = LLM_POOL_SIZE):
+        self.cache = cache if cache is not None else (LLMCache() if LLM_CACHE_ENABLED else None)
+        self.pool_size = pool_size
+        self._http = None
+        self._models = {}
+        self._lock = threading.Lock()
+        self.requests = 0
+
+    @property
+    def http(self):
+        """httpx.Client shared by every chat model, created on first use"""
+        if self._http is None:
+            with self._lock:
+                if self._http is None:
+                    import httpx
+                    self._http = httpx.Client(limits=httpx.Limits(
+                        max_connections=self.pool_size, max_keepalive_connections=self.pool_size
+                    ))
+        return self._http
+
+    def chat_model(self, model: str = LLM_MODEL, temperature: float = 0.3, timeout: Optional[float] = None):
+        """The shared ChatOpenAI for these settings"""
+        settings = (model, temperature, timeout)
+        if settings not in self._models:
+            from langchain_openai import ChatOpenAI
+            http = self.http
+            with self._lock:
+                if settings not in self._models:
+                    self._models[settings] = ChatOpenAI(model=model, temperature=temperature,
+                                                        timeout=timeout, http_client=http)
+        return self._models[settings]
+
+    def _count_request(self):
+        with self._lock:
+            self.requests += 1
+
+    def complete(self, prompt: Prompt, model: str = LLM_MODEL, temperature: float = 0.3,
+                 timeout: Optional[float] = None, cache: bool = True) -> str:
+        """Response text for prompt, from the cache when the same request was made before"""
+        messages = as_messages(prompt)
+        key = cache_key(model, temperature, messages)
+        use_cache = cache and self.cache is not None
+        if use_cache:
+            cached = self.cache.get(key)
+            if cached is not None:
+                return cached
+        self._count_request()
+        text = self.chat_model(model, temperature, timeout).invoke(messages).content
+        if use_cache:
+            self.cache.put(key, text, model)
+        return text
+
+    def stream(self, prompt: Prompt, model: str = LLM_MODEL, temperature: float = 0.3,
+               timeout: Optional[float] = None, cache: bool = True) -> Iterator[str]:
+        """Yield response text as it is generated; a cache hit is yielded in one piece.
+
+        Only streams that run to completion are cached.
+        """
+        messages = as_messages(prompt)
+        key = cache_key(model, temperature, messages)
+        use_cache = cache and self.cache is not None
+        if use_cache:
+            cached = self.cache.get(key)
+            if cached is not None:
+                yield cached
+                return
+        self._count_request()
+        parts = []
+        for chunk in self.chat_model(model, temperature, timeout).stream(messages):
+            text = chunk.content if isinstance(chunk.content, str) else ""
+            if text:
+                parts.append(text)
+                yield text
+        if use_cache:
+            self.cache.put(key, "".join(parts), model)
+
+    def print_stats(self):
+        """Print API requests made and saved this run"""
+        if self.cache is None:
+            if self.requests:
+                print(f"🤖 LLM: {self.requests} requests (cache disabled)")
+            return
+        s = self.cache.stats
+        if self.requests or s["hits"]:
+            print(f"🤖 LLM: {self.requests} requests, {s['hits']} served from cache "
+                  f"({self.cache.count()} cached responses)")
+
+    def close(self):
+        if self._http is not None:
+            self._http.close()
+            self._http = None
+            self._models = {}
+
+llm_client = LLMClient()
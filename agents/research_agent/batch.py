@@ -0,0 +1,95 @@
+# agents/research_agent/batch.py
+"""
+Batch research: many topics in one process.
+
+Topics run on a thread pool of at most `concurrency` at a time and share
+everything that is expensive to set up: the pooled HTTP client, the fetch
+and search caches, the embedding model and LanceDB connection, one
+extraction process pool and one compiled research graph (so the per-host
+fetch limits hold across topics). Each topic writes its outputs to
+out/<slug>/, and the run writes out/batch-<ts>.json with per-topic timings.
+"""
+import os
+import re
+import json
+import time
+import datetime
+from pathlib import Path
+from typing import Dict, List
+from concurrent.futures import ThreadPoolExecutor
+
+BATCH_CONCURRENCY = int(os.getenv("RESEARCH_BATCH_CONCURRENCY", "3"))
+
+def read_topics(path: str) -> List[str]:
+    """One topic per line; blank lines and # comments are skipped, duplicates dropped"""
+    topics = []
+    for line in Path(path).read_text(encoding="utf-8").splitlines():
+        line = line.strip()
+        if line and not line.startswith("#"):
+            topics.append(line)
+    return list(dict.fromkeys(topics))
+
+def slugify(topic: str, limit: int = 60) -> str:
+    slug = re.sub(r"[^a-z0-9]+", "-", topic.lower()).strip("-")
+    return slug[:limit].rstrip("-") or "topic"
+
+def run_batch(topics: List[str], concurrency: int = BATCH_CONCURRENCY, out_dir=None) -> Dict:
+    """Research every topic, at most concurrency at once, and write a summary"""
+    from .main import research_topic, OUT
+
+    out_dir = Path(out_dir or OUT)
+    start = time.perf_counter()
+    ts = datetime.datetime.now(datetime.timezone.utc).strftime("%Y%m%d-%H%M%S")
+    print(f"📚 Researching {len(topics)} topics, {concurrency} at a time")
+
+    graph = None
+    extractor = None
+    try:
+        from .langgraph_agent import LANGGRAPH_AVAILABLE, build_graph, open_checkpointer
+        if LANGGRAPH_AVAILABLE:
+            from .extraction import ExtractionPool
+            extractor = ExtractionPool()
+            graph = build_graph(open_checkpointer(), extractor)
+    except Exception as e:
+        print(f"Could not build shared research graph: {e}")
+
+    slugs = {}
+    for topic in topics:
+        slug = slugify(topic)
+        # Distinct topics that slugify alike still get their own directory
+        slugs[topic] = slug if slug not in slugs.values() else f"{slug}-{len(slugs)}"
+
+    def run(topic: str) -> Dict:
+        try:
+            return research_topic(topic, out_dir / slugs[topic], graph=graph, id_prefix=f"{ts}-{slugs[topic]}")
+        except Exception as e:
+            print(f"❌ {topic}: {e}")
+            return {"topic": topic, "status": "error", "error": str(e)}
+
+    try:
+        with ThreadPoolExecutor(max_workers=max(1, concurrency), thread_name_prefix="research-topic") as pool:
+            results = list(pool.map(run, topics))
+    finally:
+        if extractor is not None:
+            extractor.close()
+
+    completed = [r for r in results if r.get("status") == "completed"]
+    summary = {
+        "topics": len(topics),
+        "completed": len(completed),
+        "failed": len(topics) - len(completed),
+        "concurrency": concurrency,
+        "seconds": round(time.perf_counter() - start, 3),
+        "topic_seconds": round(sum(r.get("seconds", 0) for r in results), 3),
+        "results": results,
+    }
+    out_dir.mkdir(parents=True, exist_ok=True)
+    (out_dir / f"batch-{ts}.json").write_text(json.dumps(summary, ensure_ascii=False, indent=2), encoding="utf-8")
+
+    print(f"\n{'topic':<50} {'status':>10} {'method':>10} {'seconds':>8}")
+    for r in results:
+        seconds = f"{r['seconds']:.1f}" if "seconds" in r else "-"
+        print(f"{r['topic'][:50]:<50} {r['status']:>10} {r.get('method', '-'):>10} {seconds:>8}")
+    print(f"📚 {summary['completed']}/{summary['topics']} topics in {summary['seconds']:.1f}s "
+          f"({summary['topic_seconds']:.1f}s of topic time); summary in {out_dir}/batch-{ts}.json")
+    return summary
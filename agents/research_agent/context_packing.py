@@ -0,0 +1,146 @@
+# agents/research_agent/context_packing.py
+"""
+Token-budgeted context packing for draft prompts.
+
+Sources are split into short passages, each passage is scored against the
+topic with the MiniLM embeddings the vector store already uses, and the
+best passages are packed into a fixed prompt token budget. Every source
+first gets its best passage (coverage), then the remaining budget goes to
+the highest scoring passages overall. Passages are rendered in their
+original order under their source, so the LLM still reads coherent text.
+Without an embedding model, passages are taken in reading order instead.
+"""
+import os
+import re
+from functools import lru_cache
+from typing import Callable, Dict, Iterator, List, Tuple
+
+from ..vector_search.chunking import iter_chunks, estimate_tokens
+
+CONTEXT_TOKENS = int(os.getenv("RESEARCH_CONTEXT_TOKENS", "400"))
+PASSAGE_TOKENS = 60
+LLM_MODEL = "gpt-4o-mini"
+SLICE_CHARS = 300  # what the prompts used to keep of each source
+
+SENTENCE_END = re.compile(r"(?<=[.!?])\s+|\n+")
+
+@lru_cache(maxsize=None)
+def token_counter(model: str = LLM_MODEL) -> Callable[[str], int]:
+    """Prompt token counter for model: tiktoken if it can load, else ~4 chars per token"""
+    try:
+        import tiktoken
+        encoding = tiktoken.encoding_for_model(model)
+        encoding.encode("warm up")
+        return lambda text: len(encoding.encode(text))
+    except Exception:
+        return lambda text: (len(text) + 3) // 4
+
+def _sentences(text: str, max_tokens: int) -> Iterator[Tuple[str, int]]:
+    """Yield (sentence, tokens); sentences over max_tokens are cut with iter_chunks"""
+    for sentence in SENTENCE_END.split(text):
+        tokens = sum(estimate_tokens(sentence.split()))
+        if tokens > max_tokens:
+            for piece in iter_chunks(sentence, max_tokens, overlap=0):
+                yield piece, sum(estimate_tokens(piece.split()))
+        elif tokens:
+            yield sentence.strip(), tokens
+
+def split_passages(sources: List[Dict], max_tokens: int = PASSAGE_TOKENS) -> List[Dict]:
+    """Cut every source's content into passages of whole sentences, about max_tokens word pieces each"""
+    passages = []
+    for index, source in enumerate(sources):
+        texts, current, current_tokens = [], [], 0
+        for sentence, tokens in _sentences(source.get("content") or "", max_tokens):
+            if current and current_tokens + tokens > max_tokens:
+                texts.append(" ".join(current))
+                current, current_tokens = [], 0
+            current.append(sentence)
+            current_tokens += tokens
+        if current:
+            texts.append(" ".join(current))
+        passages.extend({"source": index, "position": position, "text": text} for position, text in enumerate(texts))
+    return passages
+
+def score_passages(topic: str, passages: List[Dict]) -> List[float]:
+    """Cosine similarity of each passage to the topic; reading order if no model"""
+    try:
+        import numpy as np
+        from ..vector_search.lancedb_client import vector_client
+        vectors = vector_client.embed([topic] + [p["text"] for p in passages])
+        vectors = vectors / np.maximum(np.linalg.norm(vectors, axis=1, keepdims=True), 1e-12)
+        return (vectors[1:] @ vectors[0]).tolist()
+    except Exception as e:
+        print(f"Passage scoring unavailable ({e}) - packing passages in reading order")
+        return [-float(p["position"]) for p in passages]
+
+def source_header(source: Dict) -> str:
+    return f"- {source.get('title', 'Untitled')} ({source.get('url', '')}):"
+
+def render(sources: List[Dict], passages: List[Dict]) -> str:
+    """Chosen passages grouped under their source, in reading order"""
+    by_source = {}
+    for passage in sorted(passages, key=lambda p: (p["source"], p["position"])):
+        by_source.setdefault(passage["source"], []).append(passage["text"])
+    return "\n\n".join(
+        source_header(sources[index]) + "\n" + "\n".join(f"  {text}" for text in texts)
+        for index, texts in by_source.items()
+    )
+
+def sliced_context(sources: List[Dict], chars: int = SLICE_CHARS) -> str:
+    """The old prompt context: the first chars characters of every source"""
+    return "\n\n".join(f"- {s.get('title', 'Untitled')}: {(s.get('content') or '')[:chars]}..." for s in sources)
+
+def pack_context(topic: str, sources: List[Dict], budget: int = CONTEXT_TOKENS,
+                 count_tokens: Callable[[str], int] = None) -> Tuple[str, Dict]:
+    """Pack the passages most relevant to topic into budget prompt tokens.
+
+    Returns (context, stats); stats compares the packed context with the
+    old 300-character slices and with the full source text.
+    """
+    count_tokens = count_tokens or token_counter()
+    passages = split_passages(sources)
+    for passage, score in zip(passages, score_passages(topic, passages) if passages else []):
+        passage["score"] = score
+        passage["tokens"] = count_tokens(passage["text"]) + 1  # + indent and newline
+
+    ranked = sorted(passages, key=lambda p: p["score"], reverse=True)
+    best_per_source = {}
+    for passage in ranked:
+        best_per_source.setdefault(passage["source"], passage)
+
+    chosen = []
+    taken = set()
+    headers = set()
+    used = 0
+    for passage in list(best_per_source.values()) + ranked:
+        key = (passage["source"], passage["position"])
+        if key in taken:
+            continue
+        cost = passage["tokens"]
+        if passage["source"] not in headers:
+            cost += count_tokens(source_header(sources[passage["source"]])) + 2
+        if used + cost > budget:
+            continue
+        chosen.append(passage)
+        taken.add(key)
+        headers.add(passage["source"])
+        used += cost
+
+    context = render(sources, chosen)
+    stats = {
+        "budget": budget,
+        "tokens": count_tokens(context),
+        "slice_tokens": count_tokens(sliced_context(sources)),
+        "full_tokens": sum(p["tokens"] for p in passages),
+        "passages": len(chosen),
+        "candidates": len(passages),
+        "sources_covered": len(headers),
+        "sources": len(sources),
+    }
+    return context, stats
+
+def print_stats(stats: Dict):
+    print(f"🧮 Prompt context: {stats['tokens']} tokens "
+          f"(300-char slices: {stats['slice_tokens']}, full sources: {stats['full_tokens']}), "
+          f"{stats['passages']}/{stats['candidates']} passages from "
+          f"{stats['sources_covered']}/{stats['sources']} sources")
@@ -0,0 +1,112 @@
+# agents/research_agent/extraction.py
+"""
+HTML -> text extraction stage.
+
+trafilatura is CPU-bound lxml work, so with several fetches in flight it
+runs in a process pool instead of on the fetch threads. Documents are
+size-guarded before parsing (huge pages are truncated, absurd ones
+skipped) and each extraction gets a wall-clock limit inside the worker,
+so one pathological page cannot stall the run.
+"""
+import os
+import signal
+import multiprocessing as mp
+from typing import Iterable, List, Optional
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeout
+
+MAX_HTML_CHARS = int(os.getenv("RESEARCH_MAX_HTML_CHARS", str(2 * 1024 * 1024)))
+SKIP_HTML_CHARS = int(os.getenv("RESEARCH_SKIP_HTML_CHARS", str(20 * 1024 * 1024)))
+EXTRACT_TIMEOUT = float(os.getenv("RESEARCH_EXTRACT_TIMEOUT", "10"))
+EXTRACT_WORKERS = int(os.getenv("RESEARCH_EXTRACT_WORKERS", str(min(4, os.cpu_count() or 1))))
+MAX_TEXT_CHARS = 100000
+
+def guard_html(html: str) -> Optional[str]:
+    """Drop documents too large to be articles and truncate merely big ones"""
+    if not html or len(html) > SKIP_HTML_CHARS:
+        return None
+    if len(html) > MAX_HTML_CHARS:
+        # Cut at a tag boundary so lxml does not see half an element
+        cut = html.rfind("<", 0, MAX_HTML_CHARS)
+        html = html[:cut if cut > 0 else MAX_HTML_CHARS]
+    return html
+
+def extract_text(html: str) -> str:
+    """Size-guarded trafilatura extraction, capped at MAX_TEXT_CHARS"""
+    html = guard_html(html)
+    if html is None:
+        return ""
+    import trafilatura
+    return (trafilatura.extract(html) or "")[:MAX_TEXT_CHARS]
+
+def _on_alarm(signum, frame):
+    raise TimeoutError("extraction timed out")
+
+def _init_worker():
+    import trafilatura  # noqa: F401 - pay the import once per worker
+    signal.signal(signal.SIGALRM, _on_alarm)
+
+def _extract_with_timeout(html: str, timeout: float) -> Optional[str]:
+    """Runs in a worker; None means the document hit the timeout"""
+    signal.setitimer(signal.ITIMER_REAL, timeout)
+    try:
+        return extract_text(html)
+    except TimeoutError:
+        return None
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+
+class ExtractionPool:
+    """Process pool running extract_text with a per-document timeout.
+
+    With workers <= 1 (or no SIGALRM, i.e. Windows) extraction runs inline
+    in the calling thread and only the size guards apply.
+    """
+
+    def __init__(self, workers: int = EXTRACT_WORKERS, timeout: float = EXTRACT_TIMEOUT):
+        self.workers = workers
+        self.timeout = timeout
+        self.timeouts = 0
+        self._executor = None
+        if workers > 1 and hasattr(signal, "setitimer"):
+            self._executor = ProcessPoolExecutor(max_workers=workers, mp_context=mp.get_context("spawn"),
+                                                 initializer=_init_worker)
+
+    def extract(self, html: str) -> str:
+        """Extract one document, blocking the caller until it is done"""
+        if self._executor is None:
+            return extract_text(html)
+        if guard_html(html) is None:
+            return ""
+        future = self._executor.submit(_extract_with_timeout, html, self.timeout)
+        try:
+            # The worker enforces the timeout; the slack covers queueing behind other documents
+            return self._result(future.result(timeout=self.timeout * (self.workers + 1)))
+        except FutureTimeout:
+            return self._result(None)
+
+    def _result(self, text: Optional[str]) -> str:
+        if text is None:
+            self.timeouts += 1
+            return ""
+        return text
+
+    def map(self, documents: Iterable[str]) -> List[str]:
+        """Extract many documents, in order"""
+        if self._executor is None:
+            return [extract_text(html) for html in documents]
+        futures = [
+            self._executor.submit(_extract_with_timeout, html, self.timeout) if guard_html(html) is not None else None
+            for html in documents
+        ]
+        return [self._result(future.result()) if future is not None else "" for future in futures]
+
+    def close(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,229 @@
+# agents/research_agent/fetch_cache.py
+"""
+Persistent caches for the research agent: fetched pages and search results.
+
+Each URL maps to a gzip'd copy of the raw HTML, the extracted text and the
+validators (ETag / Last-Modified) needed for conditional GETs. Entries
+younger than the TTL are served without touching the network; older ones
+are revalidated, so an unchanged page costs a 304 instead of a download and
+is never re-extracted. Least recently used entries are evicted once the
+cache grows past max_bytes. Reads only update access times in memory; the
+index is written on put, touch and eviction, and once at exit if reads
+changed it.
+
+Search results are cached per normalized query for a TTL, so scheduled
+runs on the same topic do not pay for the same API calls every week.
+"""
+import os
+import re
+import gzip
+import json
+import time
+import atexit
+import hashlib
+import threading
+import unicodedata
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+CACHE_DIR = Path(os.getenv("RESEARCH_CACHE_DIR", ".cache/research"))
+FETCH_TTL = float(os.getenv("RESEARCH_FETCH_TTL", str(24 * 3600)))
+FETCH_CACHE_BYTES = int(os.getenv("RESEARCH_FETCH_CACHE_BYTES", str(500 * 1024 * 1024)))
+SEARCH_TTL = float(os.getenv("RESEARCH_SEARCH_TTL", str(7 * 24 * 3600)))
+OFFLINE = os.getenv("RESEARCH_OFFLINE", "0") == "1"
+
+INDEX_FILE = "index.json"
+
+def content_hash(data: str) -> str:
+    return hashlib.sha256(data.encode("utf-8", "replace")).hexdigest()
+
+class FetchCache:
+    """URL -> raw HTML, extracted text and HTTP validators"""
+
+    def __init__(self, path=CACHE_DIR / "fetch", ttl: float = FETCH_TTL,
+                 max_bytes: int = FETCH_CACHE_BYTES):
+        self.path = Path(path)
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._index = None  # key -> entry metadata, loaded on first use
+        self._dirty = False  # access times changed since the last save
+        atexit.register(self.flush)
+        self.stats = {"fresh": 0, "revalidated": 0, "unchanged": 0,
+                      "downloaded": 0, "truncated": 0, "rejected": 0, "extracted": 0,
+                      "offline_misses": 0, "evicted": 0}
+
+    def key(self, url: str) -> str:
+        return hashlib.sha256(url.encode("utf-8")).hexdigest()
+
+    def _load(self):
+        if self._index is not None:
+            return
+        self._index = {}
+        index_path = self.path / INDEX_FILE
+        if index_path.exists():
+            try:
+                self._index = json.loads(index_path.read_text(encoding="utf-8"))
+            except (OSError, ValueError) as e:
+                print(f"Fetch cache index unreadable, starting empty: {e}")
+
+    def _save(self):
+        self.path.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path / f"{INDEX_FILE}.{os.getpid()}.{threading.get_ident()}.tmp"
+        tmp_path.write_text(json.dumps(self._index), encoding="utf-8")
+        os.replace(tmp_path, self.path / INDEX_FILE)
+        self._dirty = False
+
+    def flush(self):
+        """Persist access times changed by reads since the last save"""
+        with self._lock:
+            if self._dirty:
+                self._save()
+
+    def get(self, url: str) -> Optional[Dict[str, Any]]:
+        """Cached entry for url with its text, or None"""
+        key = self.key(url)
+        with self._lock:
+            self._load()
+            entry = self._index.get(key)
+            if entry is None:
+                return None
+            entry["accessed"] = time.time()
+            self._dirty = True
+        try:
+            text = (self.path / f"{key}.txt").read_text(encoding="utf-8")
+        except OSError:
+            return None
+        return dict(entry, text=text, fresh=time.time() - entry["fetched"] < self.ttl)
+
+    def conditional_headers(self, entry: Optional[Dict[str, Any]]) -> Dict[str, str]:
+        """If-None-Match / If-Modified-Since headers for revalidating an entry"""
+        headers = {}
+        if entry and entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry and entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def touch(self, url: str):
+        """Mark an entry as freshly validated (after a 304)"""
+        with self._lock:
+            self._load()
+            entry = self._index.get(self.key(url))
+            if entry is not None:
+                entry["fetched"] = entry["accessed"] = time.time()
+                self._save()
+
+    def put(self, url: str, html: str, text: str, etag: Optional[str] = None,
+            last_modified: Optional[str] = None):
+        """Store a fetched page and its extracted text"""
+        key = self.key(url)
+        self.path.mkdir(parents=True, exist_ok=True)
+        with gzip.open(self.path / f"{key}.html.gz", "wt", encoding="utf-8") as f:
+            f.write(html)
+        (self.path / f"{key}.txt").write_text(text, encoding="utf-8")
+        size = (self.path / f"{key}.html.gz").stat().st_size + (self.path / f"{key}.txt").stat().st_size
+
+        now = time.time()
+        with self._lock:
+            self._load()
+            self._index[key] = {
+                "url": url,
+                "etag": etag,
+                "last_modified": last_modified,
+                "html_hash": content_hash(html),
+                "fetched": now,
+                "accessed": now,
+                "size": size
+            }
+            self._evict()
+            self._save()
+
+    def count(self, name: str):
+        with self._lock:
+            self.stats[name] += 1
+
+    def print_stats(self):
+        """Print this run's cache hits and network/extraction work"""
+        s = self.stats
+        print(f"🗄️  Fetch cache: {s['fresh']} fresh hits, {s['revalidated']} revalidated (304), "
+              f"{s['unchanged']} unchanged bodies, {s['downloaded']} downloads "
+              f"({s['truncated']} truncated, {s['rejected']} rejected), {s['extracted']} extractions"
+              + (f", {s['offline_misses']} offline misses" if s["offline_misses"] else ""))
+
+    def _evict(self):
+        total = sum(entry["size"] for entry in self._index.values())
+        for key in sorted(self._index, key=lambda k: self._index[k]["accessed"]):
+            if total <= self.max_bytes:
+                break
+            total -= self._index.pop(key)["size"]
+            self.stats["evicted"] += 1
+            for suffix in (".html.gz", ".txt"):
+                try:
+                    (self.path / f"{key}{suffix}").unlink()
+                except OSError:
+                    pass
+
+def normalize_query(query: str) -> str:
+    """Case, punctuation and whitespace-insensitive form of a search query"""
+    text = unicodedata.normalize("NFKC", query or "").lower()
+    return " ".join(re.sub(r"[^\w\s]", " ", text).split())
+
+class SearchCache:
+    """Normalized query -> search results, expiring after ttl seconds"""
+
+    def __init__(self, path=CACHE_DIR / "search.json", ttl: float = SEARCH_TTL):
+        self.path = Path(path)
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._entries = None
+        self.stats = {"api_calls": 0, "cache_hits": 0, "duplicate_urls": 0}
+
+    def _load(self):
+        if self._entries is not None:
+            return
+        self._entries = {}
+        if self.path.exists():
+            try:
+                self._entries = json.loads(self.path.read_text(encoding="utf-8"))
+            except (OSError, ValueError) as e:
+                print(f"Search cache unreadable, starting empty: {e}")
+
+    def get(self, query: str) -> Optional[List[Dict]]:
+        """Cached results for query if younger than the TTL"""
+        with self._lock:
+            self._load()
+            entry = self._entries.get(normalize_query(query))
+            if entry is None or time.time() - entry["fetched"] >= self.ttl:
+                return None
+            self.stats["cache_hits"] += 1
+            return entry["results"]
+
+    def put(self, query: str, results: List[Dict]):
+        """Store fresh API results, dropping expired entries"""
+        now = time.time()
+        with self._lock:
+            self._load()
+            self.stats["api_calls"] += 1
+            self._entries = {
+                key: entry for key, entry in self._entries.items()
+                if now - entry["fetched"] < self.ttl
+            }
+            self._entries[normalize_query(query)] = {"query": query, "results": results, "fetched": now}
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.path.with_name(f"{self.path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+            tmp_path.write_text(json.dumps(self._entries, ensure_ascii=False), encoding="utf-8")
+            os.replace(tmp_path, self.path)
+
+    def count(self, name: str, n: int = 1):
+        with self._lock:
+            self.stats[name] += n
+
+    def print_stats(self):
+        """Print API calls made and saved this run"""
+        s = self.stats
+        print(f"🔎 Search: {s['api_calls']} API calls, {s['cache_hits']} saved by cache, "
+              f"{s['duplicate_urls']} duplicate URLs skipped")
+
+fetch_cache = FetchCache()
+search_cache = SearchCache()
@@ -0,0 +1,145 @@
+# agents/research_agent/fetch_pipeline.py
+"""
+Concurrent search -> fetch pipeline for research sources.
+
+All searches run at once; as each one returns, its top URLs are queued for
+fetching straight away instead of waiting for the other searches. Fetched
+HTML is handed to a process pool for extraction, so parsing never holds up
+the fetch threads. Fetches are limited per host so one site is never hit
+by more than per_host requests at a time, and the whole pipeline stops at
+a global deadline, returning whatever sources were fetched by then. Each
+fetch gets the time left as its timeout, so no fetch thread outlives the
+deadline for long.
+"""
+import os
+import time
+import threading
+from typing import Callable, Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+
+from .extraction import ExtractionPool, EXTRACT_WORKERS
+from .fetch_cache import normalize_query
+
+FETCH_WORKERS = int(os.getenv("RESEARCH_FETCH_WORKERS", "8"))
+PER_HOST_LIMIT = int(os.getenv("RESEARCH_PER_HOST_LIMIT", "2"))
+DEADLINE_SECONDS = float(os.getenv("RESEARCH_FETCH_DEADLINE", "60"))
+FETCH_TIMEOUT = 15
+
+class HostLimiter:
+    """One bounded semaphore per host"""
+    def __init__(self, limit: int):
+        self.limit = limit
+        self._lock = threading.Lock()
+        self._hosts = {}
+
+    def get(self, url: str) -> threading.BoundedSemaphore:
+        host = urlsplit(url).netloc.lower()
+        with self._lock:
+            if host not in self._hosts:
+                self._hosts[host] = threading.BoundedSemaphore(self.limit)
+            return self._hosts[host]
+
+def gather_sources(queries: List[str], per_query: int = 2,
+                   search: Optional[Callable] = None, fetch: Optional[Callable] = None,
+                   max_workers: int = FETCH_WORKERS, per_host: int = PER_HOST_LIMIT,
+                   deadline: float = DEADLINE_SECONDS,
+                   extract_workers: int = EXTRACT_WORKERS) -> Tuple[List[Dict], Dict]:
+    """Search all queries concurrently and fetch the top per_query hits of each.
+
+    Returns (sources, stats). Sources keep query order, then rank order, and
+    each page is fetched once even if several queries return it (URLs are
+    compared in canonical form, without tracking parameters). Anything
+    still running at the deadline, or still waiting for a per-host slot, is
+    abandoned and counted in stats["timed_out"]; fetches that raised are
+    counted in stats["fetch_errors"] and pages with no text in
+    stats["empty"]. fetch is called as fetch(url, timeout=..., extract=...)
+    and must finish within that timeout.
+    """
+    if search is None or fetch is None:
+        from .main import search_tavily, fetch_text
+        search = search or search_tavily
+        fetch = fetch or fetch_text
+    from ..vector_search.lancedb_client import canonical_url
+
+    start = time.monotonic()
+    stop_at = start + deadline
+    limiter = HostLimiter(per_host)
+    extractor = ExtractionPool(extract_workers)
+    # Queries that differ only in case or punctuation are searched once
+    by_form = {}
+    for query in queries:
+        by_form.setdefault(normalize_query(query), query)
+    unique = list(by_form.values())
+    stats = {"searches": len(unique), "duplicate_queries": len(queries) - len(unique),
+             "search_errors": 0, "fetched": 0, "fetch_errors": 0,
+             "duplicate_urls": 0, "empty": 0, "timed_out": 0, "extract_timeouts": 0, "seconds": 0.0}
+
+    def remaining() -> float:
+        return max(0.0, stop_at - time.monotonic())
+
+    def fetch_one(url: str) -> Optional[str]:
+        """The page text, or None if the deadline passed before it could be fetched"""
+        semaphore = limiter.get(url)
+        if not semaphore.acquire(timeout=remaining()):
+            return None
+        try:
+            if remaining() <= 0:
+                return None
+            return fetch(url, timeout=min(FETCH_TIMEOUT, remaining()), extract=extractor.extract)
+        finally:
+            semaphore.release()
+
+    sources = {}
+    seen = set()
+    pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="research-fetch")
+    pending = {pool.submit(search, query): ("search", i) for i, query in enumerate(unique)}
+    try:
+        while pending and remaining() > 0:
+            done, _ = wait(pending, timeout=remaining(), return_when=FIRST_COMPLETED)
+            for future in done:
+                kind, payload = pending.pop(future)
+                if kind == "search":
+                    try:
+                        results = future.result() or []
+                    except Exception as e:
+                        print(f"search error: {e}")
+                        stats["search_errors"] += 1
+                        continue
+                    for rank, result in enumerate(results[:per_query]):
+                        url = result.get("url")
+                        if not url:
+                            continue
+                        if canonical_url(url) in seen:
+                            stats["duplicate_urls"] += 1
+                            continue
+                        seen.add(canonical_url(url))
+                        order = (payload, rank)
+                        pending[pool.submit(fetch_one, url)] = ("fetch", (order, result))
+                else:
+                    order, result = payload
+                    try:
+                        content = future.result()
+                    except Exception as e:
+                        print(f"fetch error: {e}")
+                        stats["fetch_errors"] += 1
+                        continue
+                    if content is None:
+                        stats["timed_out"] += 1
+                    elif content:
+                        stats["fetched"] += 1
+                        sources[order] = {
+                            "url": result["url"],
+                            "title": result.get("title", "Untitled"),
+                            "content": content
+                        }
+                    else:
+                        stats["empty"] += 1
+    finally:
+        stats["timed_out"] += len(pending)
+        pool.shutdown(wait=False, cancel_futures=True)
+        extractor.close()
+        stats["extract_timeouts"] = extractor.timeouts
+
+    stats["seconds"] = round(time.monotonic() - start, 3)
+    return [sources[order] for order in sorted(sources)], stats
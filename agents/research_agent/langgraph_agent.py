@@ -1,91 +1,320 @@
 # agents/research_agent/langgraph_agent.py
 """
 LangGraph-based Research Agent with structured workflow
+
+generate_queries -> search (one task per query) -> select_urls
+-> fetch (one task per URL) -> analyze -> pack_context -> draft
+
+Search and fetch fan out with Send, so their tasks run in parallel, and
+every completed step is checkpointed: a run that fails or is interrupted
+part-way resumes from the last finished node instead of searching and
+fetching again, as long as its checkpoint is younger than
+RESEARCH_CHECKPOINT_MAX_AGE. A failed fetch only loses its own URL.
+Fetches share one RESEARCH_FETCH_DEADLINE per run, as in gather_sources:
+those still waiting when it passes are skipped and the draft is written
+from whatever was fetched by then.
 """
 import os
-import json
-from typing import Dict, List, Any
-from pathlib import Path
+import time
+import inspect
+import hashlib
+import operator
+from typing import Dict, List, Any, Annotated, Optional, TypedDict
 from datetime import datetime, timezone
 
 try:
-    from langgraph.graph import StateGraph, END
-    from langchain_openai import ChatOpenAI
+    from langgraph.graph import StateGraph, START, END
+    from langgraph.types import Send
     LANGGRAPH_AVAILABLE = True
 except ImportError:
     LANGGRAPH_AVAILABLE = False
     print("LangGraph not available - using fallback mode")
 
-class ResearchState:
+from .fetch_cache import CACHE_DIR
+
+CHECKPOINT_DB = CACHE_DIR / "checkpoints.sqlite"
+CHECKPOINT_MAX_AGE = float(os.getenv("RESEARCH_CHECKPOINT_MAX_AGE", str(6 * 3600)))  # seconds
+SOURCES_PER_QUERY = 2
+SOURCE_CHARS = 2000  # of each source's text in prompt notes; the vector store gets all of it
+
+class ResearchState(TypedDict, total=False):
     """State for the research workflow"""
-    def __init__(self, topic: str):
-        self.topic = topic
-        self.search_queries = []
-        self.sources = []
-        self.draft = ""
-        self.metadata = {
+    topic: str
+    search_queries: List[str]
+    search_results: Annotated[List[Dict], operator.add]  # appended by parallel search tasks
+    fetch_queue: List[Dict]
+    fetched: Annotated[List[Dict], operator.add]  # appended by parallel fetch tasks
+    sources: List[Dict]
+    context: str  # the passages of sources packed into the draft prompt
+    draft: str
+    timings: Annotated[List[Dict], operator.add]
+    metadata: Dict[str, Any]
+
+def timed(name, node):
+    """Wrap a node so each call appends its wall time to state["timings"]"""
+    takes_config = "config" in inspect.signature(node).parameters
+    def run(state, config):
+        start = time.perf_counter()
+        update = node(state, config) if takes_config else node(state)
+        update["timings"] = [{"node": name, "seconds": round(time.perf_counter() - start, 3)}]
+        return update
+    return run
+
+def summarize_timings(timings: List[Dict]) -> Dict[str, Dict[str, float]]:
+    """Per-node call count, total and max seconds"""
+    summary = {}
+    for entry in timings:
+        node = summary.setdefault(entry["node"], {"calls": 0, "seconds": 0.0, "max_seconds": 0.0})
+        node["calls"] += 1
+        node["seconds"] = round(node["seconds"] + entry["seconds"], 3)
+        node["max_seconds"] = max(node["max_seconds"], entry["seconds"])
+    return summary
+
+def generate_queries(state: ResearchState) -> Dict:
+    topic = state["topic"]
+    return {
+        "search_queries": [
+            f"{topic} latest trends",
+            f"{topic} expert analysis",
+            f"{topic} case studies"
+        ],
+        "metadata": {
             "created_at": datetime.now(timezone.utc).isoformat(),
             "topic": topic,
-            "status": "initialized"
+            "status": "searching"
         }
+    }
 
-def run_research_workflow(topic: str) -> Dict[str, Any]:
-    """Run the complete research workflow"""
-    if not LANGGRAPH_AVAILABLE:
-        # Fallback to simple workflow
-        return {"status": "completed", "method": "fallback"}
-    
+def fan_out_searches(state: ResearchState):
+    return [Send("search", {"query": query, "index": i}) for i, query in enumerate(state["search_queries"])]
+
+def search(task: Dict) -> Dict:
+    from .main import search_tavily
     try:
-        # Initialize state
-        state = ResearchState(topic)
-        
-        # Generate search queries
-        state.search_queries = [
-            f"{topic} latest trends",
-            f"{topic} expert analysis", 
-            f"{topic} case studies"
-        ]
-        
-        # Search and fetch sources
-        from .main import search_tavily, fetch_text
-        for query in state.search_queries:
-            results = search_tavily(query)
-            for result in results[:2]:
-                content = fetch_text(result["url"])
-                if content:
-                    state.sources.append({
-                        "url": result["url"],
-                        "title": result.get("title", "Untitled"),
-                        "content": content[:2000]
-                    })
-        
-        # Generate draft
-        if os.getenv("OPENAI_API_KEY"):
-            from langchain_openai import ChatOpenAI
-            llm = ChatOpenAI(model="gpt-4o-mini", temperature=0.3)
-            
-            sources_text = "\n\n".join([
-                f"- {s['title']}: {s['content'][:300]}..."
-                for s in state.sources
-            ])
-            
-            prompt = f"""Create a research draft on "{topic}" based on these sources:
+        results = search_tavily(task["query"])
+    except Exception as e:
+        print(f"search error: {e}")
+        results = []
+    return {"search_results": [
+        {"order": [task["index"], rank], "url": r["url"], "title": r.get("title", "Untitled")}
+        for rank, r in enumerate(results[:SOURCES_PER_QUERY]) if r.get("url")
+    ]}
+
+def select_urls(state: ResearchState) -> Dict:
+    """Queue each search hit for fetching once, even if several queries returned it"""
+    from .fetch_cache import search_cache
+    from ..vector_search.lancedb_client import canonical_url
+
+    queue = {}
+    results = sorted(state.get("search_results", []), key=lambda r: r["order"])
+    for result in results:
+        queue.setdefault(canonical_url(result["url"]), result)
+    duplicates = len(results) - len(queue)
+    search_cache.count("duplicate_urls", duplicates)
+    return {
+        "fetch_queue": list(queue.values()),
+        "metadata": dict(state["metadata"], status="fetching", duplicate_urls=duplicates)
+    }
+
+def fan_out_fetches(state: ResearchState):
+    return [Send("fetch", result) for result in state.get("fetch_queue", [])] or ["analyze"]
+
+def make_fetch(limiter, extractor):
+    def fetch(task: Dict, config) -> Dict:
+        """Fetch one URL unless the run's fetch deadline (config["configurable"]["fetch_deadline"],
+        an epoch time) passes first; waits for the host slot and the request share that deadline"""
+        from .main import fetch_text
+        from .fetch_pipeline import FETCH_TIMEOUT, DEADLINE_SECONDS
+
+        stop_at = config["configurable"].get("fetch_deadline") or time.time() + DEADLINE_SECONDS
+        def remaining() -> float:
+            return max(0.0, stop_at - time.time())
+
+        content, timed_out, failed = "", True, False
+        semaphore = limiter.get(task["url"])
+        if remaining() > 0 and semaphore.acquire(timeout=remaining()):
+            try:
+                if remaining() > 0:
+                    timed_out = False
+                    content = fetch_text(task["url"], timeout=min(FETCH_TIMEOUT, remaining()),
+                                         extract=extractor.extract)
+            except Exception as e:
+                # One bad URL must not fail the run (and refetch every other URL)
+                print(f"fetch error {task['url']}: {e}")
+                failed = True
+            finally:
+                semaphore.release()
+        return {"fetched": [{
+            "order": task["order"],
+            "url": task["url"],
+            "title": task["title"],
+            "content": content,
+            "timed_out": timed_out,
+            "failed": failed
+        }]}
+    return fetch
+
+def analyze(state: ResearchState) -> Dict:
+    """Order fetched sources by query and rank and drop empty pages"""
+    fetched = sorted(state.get("fetched", []), key=lambda s: s["order"])
+    sources = [
+        {"url": s["url"], "title": s["title"], "content": s["content"]}
+        for s in fetched if s["content"]
+    ]
+    timed_out = sum(1 for s in fetched if s.get("timed_out"))
+    failed = sum(1 for s in fetched if s.get("failed"))
+    print(f"🌐 Fetched {len(sources)} of {len(fetched)} sources"
+          + (f" ({timed_out} skipped at the fetch deadline)" if timed_out else "")
+          + (f" ({failed} failed)" if failed else ""))
+    return {"sources": sources, "metadata": dict(state["metadata"], status="drafting",
+                                                 sources=len(sources), timed_out=timed_out, failed=failed)}
+
+def pack_context(state: ResearchState) -> Dict:
+    """Fill the prompt token budget with the source passages closest to the topic"""
+    from .context_packing import pack_context as pack, print_stats
+
+    notes = [dict(s, content=s["content"][:SOURCE_CHARS]) for s in state.get("sources", [])]
+    context, stats = pack(state["topic"], notes)
+    print_stats(stats)
+    return {"context": context, "metadata": dict(state["metadata"], context=stats)}
+
+def draft(state: ResearchState, config) -> Dict:
+    """Write the draft, streaming it into config["configurable"]["draft_path"] if set"""
+    topic = state["topic"]
+    sources = state.get("sources", [])
+    metadata = dict(state["metadata"], status="completed")
+    if os.getenv("OPENAI_API_KEY"):
+        from ..llm_client import llm_client
+        from .llm_stream import stream_with_retry, STREAM_DRAFTS, LLM_TIMEOUT
+
+        sources_text = state.get("context", "")
+
+        prompt = f"""Create a research draft on "{topic}" based on these sources:
 
 {sources_text}
 
 Write a comprehensive, well-structured Markdown article."""
-            
-            response = llm.invoke([{"role": "user", "content": prompt}])
-            state.draft = response.content
+
+        draft_path = config["configurable"].get("draft_path")
+        if STREAM_DRAFTS and draft_path:
+            result = stream_with_retry(lambda: llm_client.stream(prompt, temperature=0.3, timeout=LLM_TIMEOUT),
+                                       draft_path)
+            text = result.pop("text")
+            metadata["llm"] = result
+        else:
+            start = time.perf_counter()
+            text = llm_client.complete(prompt, temperature=0.3, timeout=LLM_TIMEOUT)
+            metadata["llm"] = {"seconds": round(time.perf_counter() - start, 3)}
+    else:
+        text = f"# DRAFT (LLM disabled)\n\nTopic: {topic}\n\nSources found: {len(sources)}"
+    return {"draft": text, "metadata": metadata}
+
+def build_graph(checkpointer=None, extractor=None):
+    """Compile the research StateGraph"""
+    from .fetch_pipeline import HostLimiter, PER_HOST_LIMIT
+    from .extraction import ExtractionPool
+
+    extractor = extractor or ExtractionPool(workers=1)
+    builder = StateGraph(ResearchState)
+    builder.add_node("generate_queries", timed("generate_queries", generate_queries))
+    builder.add_node("search", timed("search", search))
+    builder.add_node("select_urls", timed("select_urls", select_urls))
+    builder.add_node("fetch", timed("fetch", make_fetch(HostLimiter(PER_HOST_LIMIT), extractor)))
+    builder.add_node("analyze", timed("analyze", analyze))
+    builder.add_node("pack_context", timed("pack_context", pack_context))
+    builder.add_node("draft", timed("draft", draft))
+
+    builder.add_edge(START, "generate_queries")
+    builder.add_conditional_edges("generate_queries", fan_out_searches, ["search"])
+    builder.add_edge("search", "select_urls")
+    builder.add_conditional_edges("select_urls", fan_out_fetches, ["fetch", "analyze"])
+    builder.add_edge("fetch", "analyze")
+    builder.add_edge("analyze", "pack_context")
+    builder.add_edge("pack_context", "draft")
+    builder.add_edge("draft", END)
+    return builder.compile(checkpointer=checkpointer)
+
+def open_checkpointer():
+    """SQLite checkpoints that survive the process, else in-memory ones"""
+    try:
+        import sqlite3
+        from langgraph.checkpoint.sqlite import SqliteSaver
+        CHECKPOINT_DB.parent.mkdir(parents=True, exist_ok=True)
+        return SqliteSaver(sqlite3.connect(str(CHECKPOINT_DB), check_same_thread=False))
+    except ImportError:
+        from langgraph.checkpoint.memory import MemorySaver
+        print("langgraph-checkpoint-sqlite not installed - checkpoints are not persisted")
+        return MemorySaver()
+
+def thread_id(topic: str) -> str:
+    """One checkpoint thread per topic (and per RESEARCH_RUN_ID, if set)"""
+    return (os.getenv("RESEARCH_RUN_ID") or "research") + "-" + hashlib.sha256(topic.encode("utf-8")).hexdigest()[:16]
+
+def discard_checkpoint(graph, config: Dict):
+    """Delete the checkpoints of a run's thread, if the checkpointer supports it"""
+    delete_thread = getattr(graph.checkpointer, "delete_thread", None)
+    if delete_thread is not None:
+        delete_thread(config["configurable"]["thread_id"])
+
+def checkpoint_age(snapshot) -> Optional[float]:
+    """Seconds since a state snapshot was checkpointed, None if unknown"""
+    if not snapshot.created_at:
+        return None
+    created = datetime.fromisoformat(snapshot.created_at.replace("Z", "+00:00"))
+    return (datetime.now(timezone.utc) - created).total_seconds()
+
+def run_research_workflow(topic: str, draft_path: str = None, graph=None) -> Dict[str, Any]:
+    """Run the complete research workflow, resuming a recent unfinished run of the same topic.
+
+    With draft_path the draft is streamed into that file as it is generated.
+    graph is a compiled graph to reuse (see build_graph); by default one is
+    built for this run with its own checkpointer and extraction pool.
+    """
+    if not LANGGRAPH_AVAILABLE:
+        # Fallback to simple workflow
+        return {"status": "completed", "method": "fallback"}
+
+    if graph is None:
+        try:
+            from .extraction import ExtractionPool
+            with ExtractionPool() as extractor:
+                return run_research_workflow(topic, draft_path, build_graph(open_checkpointer(), extractor))
+        except Exception as e:
+            print(f"Error in research workflow: {e}")
+            return {"status": "error", "method": "langgraph", "error": str(e)}
+
+    from .fetch_pipeline import FETCH_WORKERS, DEADLINE_SECONDS
+
+    # The fetch deadline and draft path live in the config, not the state, so a resumed run gets fresh ones
+    config = {"configurable": {"thread_id": thread_id(topic), "fetch_deadline": time.time() + DEADLINE_SECONDS,
+                               "draft_path": str(draft_path or "")},
+              "max_concurrency": FETCH_WORKERS}
+    try:
+        snapshot = graph.get_state(config)
+        resume = bool(snapshot.next)
+        if resume:
+            age = checkpoint_age(snapshot)
+            if age is None or age > CHECKPOINT_MAX_AGE:
+                print("🗑️  Discarding stale checkpoint of an unfinished run"
+                      + (f" ({age / 3600:.1f}h old)" if age is not None else ""))
+                discard_checkpoint(graph, config)
+                resume = False
+        if resume:
+            print(f"♻️  Resuming unfinished run at: {', '.join(snapshot.next)}")
+            state = graph.invoke(None, config)
         else:
-            state.draft = f"# DRAFT (LLM disabled)\n\nTopic: {topic}\n\nSources found: {len(state.sources)}"
-        
+            state = graph.invoke({"topic": topic}, config)
+
+        # Checkpoints only matter for unfinished runs; the next run of this topic starts fresh
+        discard_checkpoint(graph, config)
+        state["metadata"] = dict(state["metadata"], timings=summarize_timings(state.get("timings", [])))
         return {
             "status": "completed",
             "method": "langgraph",
             "state": state
         }
-        
+
     except Exception as e:
+        # The checkpoint is kept: the next run of this topic resumes after the last finished node
         print(f"Error in research workflow: {e}")
         return {"status": "error", "method": "langgraph", "error": str(e)}
@@ -0,0 +1,154 @@
+# agents/research_agent/llm_stream.py
+"""
+Streaming LLM output straight into the draft file.
+
+Tokens are appended and flushed to the file as they arrive, with a live
+rich status line in the terminal, so a draft is readable while it is being
+written. The stream runs on a helper thread and is read against a
+deadline: if the LLM stalls past RESEARCH_LLM_TIMEOUT or the stream
+breaks, whatever arrived so far is kept, marked as incomplete. A stream
+that fails before producing any text is started again, up to
+RESEARCH_STREAM_ATTEMPTS times. Time to first token and total generation
+time are returned for the run metadata.
+"""
+import os
+import time
+import queue
+import threading
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable
+
+STREAM_DRAFTS = os.getenv("RESEARCH_STREAM", "1") != "0"
+LLM_TIMEOUT = float(os.getenv("RESEARCH_LLM_TIMEOUT", "300"))
+STREAM_ATTEMPTS = int(os.getenv("RESEARCH_STREAM_ATTEMPTS", "2"))
+
+_DONE = object()
+
+class StreamFailed(Exception):
+    """The stream failed before producing any text"""
+
+def _chunk_text(chunk: Any) -> str:
+    """Chat models stream message chunks, completion models plain strings"""
+    content = getattr(chunk, "content", chunk)
+    return content if isinstance(content, str) else ""
+
+def _produce(chunks: Iterable, out: "queue.Queue", stop: threading.Event):
+    try:
+        for chunk in chunks:
+            if stop.is_set():
+                return
+            out.put(chunk)
+    except Exception as e:
+        out.put(e)
+    out.put(_DONE)
+
+def _progress():
+    """rich progress with one task showing chars received, or None without rich"""
+    try:
+        from rich.progress import Progress, SpinnerColumn, TextColumn, TimeElapsedColumn
+    except ImportError:
+        return None
+    return Progress(
+        SpinnerColumn(),
+        TextColumn("{task.description}"),
+        TextColumn("{task.fields[chars]} chars"),
+        TextColumn("{task.fields[rate]}"),
+        TimeElapsedColumn(),
+    )
+
+def stream_to_file(chunks: Iterable, path: Path, timeout: float = LLM_TIMEOUT,
+                   label: str = "✍️  Drafting") -> Dict[str, Any]:
+    """Write a stream of LLM chunks to path as they arrive.
+
+    Returns {"text", "complete", "error", "ttft_seconds", "seconds", "chars"}.
+    An incomplete draft ends with an HTML comment saying why. Raises
+    StreamFailed if nothing at all was received (see stream_with_retry).
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    out = queue.Queue()
+    stop = threading.Event()
+    threading.Thread(target=_produce, args=(chunks, out, stop), daemon=True).start()
+
+    start = time.perf_counter()
+    deadline = start + timeout
+    ttft = None
+    error = None
+    parts = []
+    chars = 0
+    progress = _progress()
+    task = None
+    if progress is not None:
+        try:
+            progress.start()
+        except Exception:
+            progress = None  # another draft owns the live display (batch mode)
+    if progress is not None:
+        task = progress.add_task(label, chars=0, rate="waiting for first token")
+    try:
+        with open(path, "w", encoding="utf-8") as f:
+            while True:
+                try:
+                    item = out.get(timeout=max(0.0, deadline - time.perf_counter()))
+                except queue.Empty:
+                    error = f"timed out after {timeout:.0f}s"
+                    break
+                if item is _DONE:
+                    break
+                if isinstance(item, Exception):
+                    error = f"{type(item).__name__}: {item}"
+                    break
+                text = _chunk_text(item)
+                if not text:
+                    continue
+                if ttft is None:
+                    ttft = time.perf_counter() - start
+                parts.append(text)
+                chars += len(text)
+                f.write(text)
+                f.flush()
+                if progress is not None:
+                    elapsed = time.perf_counter() - start
+                    progress.update(task, chars=chars, rate=f"{chars / max(elapsed, 1e-6):.0f} chars/s")
+            if error and parts:
+                marker = f"\n\n<!-- draft incomplete: {error} -->\n"
+                parts.append(marker)
+                f.write(marker)
+    finally:
+        stop.set()
+        if progress is not None:
+            progress.stop()
+
+    seconds = time.perf_counter() - start
+    if error and not parts:
+        path.unlink(missing_ok=True)
+        raise StreamFailed(f"no output from LLM ({error})")
+    if error:
+        print(f"⚠️  Draft incomplete ({error}); kept {chars} chars in {path}")
+    else:
+        first = f"{ttft:.2f}s" if ttft is not None else "none"
+        print(f"✍️  Draft streamed: {chars} chars, first token {first}, total {seconds:.2f}s")
+    return {
+        "text": "".join(parts),
+        "complete": error is None,
+        "error": error,
+        "ttft_seconds": round(ttft, 3) if ttft is not None else None,
+        "seconds": round(seconds, 3),
+        "chars": chars,
+    }
+
+def stream_with_retry(open_stream: Callable[[], Iterable], path: Path,
+                      attempts: int = STREAM_ATTEMPTS, **kwargs) -> Dict[str, Any]:
+    """stream_to_file, opening a fresh stream when one fails before any text arrives.
+
+    open_stream starts a new LLM request each time it is called. A stream
+    that broke part-way is not retried: its partial draft is returned.
+    Raises StreamFailed once every attempt came back empty.
+    """
+    for attempt in range(1, attempts + 1):
+        try:
+            return stream_to_file(open_stream(), path, **kwargs)
+        except StreamFailed as e:
+            if attempt >= attempts:
+                raise
+            print(f"⚠️  {e}; retrying ({attempt}/{attempts - 1})")
@@ -1,123 +1,237 @@
 # agents/research_agent/main.py
 """
 Run: python -m agents.research_agent.main "Research topic"
+     python -m agents.research_agent.main --topics topics.txt --concurrency 4
 """
 import os
-import sys
 import json
+import time
+import argparse
 import datetime
+import threading
 from pathlib import Path
 
+from ..http_client import http_client, ResponseRejected
+from ..llm_client import llm_client
+from .fetch_cache import fetch_cache, search_cache, content_hash, OFFLINE
+from .extraction import extract_text, MAX_HTML_CHARS, SKIP_HTML_CHARS
+
+# Bytes of a page body read at most; larger declared bodies are refused unread
+MAX_FETCH_BYTES = int(os.getenv("RESEARCH_MAX_FETCH_BYTES", str(MAX_HTML_CHARS)))
+
 OUT = Path("out")
 OUT.mkdir(exist_ok=True)
 
+_store_lock = threading.Lock()
+
 def search_tavily(query):
     key = os.getenv("TAVILY_API_KEY")
     if not key:
         print("TAVILY_API_KEY not set — dry-run returning example results")
         return [{"title":"Example","url":"https://example.com","snippet":"Example snippet"}]
-    import requests
+    cached = search_cache.get(query)
+    if cached is not None:
+        return cached
+    if OFFLINE:
+        return []
     endpoint = os.getenv("TAVILY_ENDPOINT","https://api.tavily.com/search")
-    r = requests.get(endpoint, params={"q": query, "key": key}, timeout=15)
+    r = http_client.get(endpoint, params={"q": query, "key": key}, timeout=15)
     r.raise_for_status()
-    return r.json().get("results", [])[:8]
+    results = r.json().get("results", [])[:8]
+    search_cache.put(query, results)
+    return results
 
-def fetch_text(url):
+def fetch_text(url, timeout=15, extract=None):
+    # timeout bounds the whole download, retries and body included
+    deadline = time.monotonic() + timeout
+    # Fresh cache hits (or any hit when offline) skip the network entirely
+    entry = fetch_cache.get(url)
+    if entry and (entry["fresh"] or OFFLINE):
+        fetch_cache.count("fresh")
+        return entry["text"]
+    if OFFLINE:
+        fetch_cache.count("offline_misses")
+        return ""
     try:
-        import requests, trafilatura
-        html = requests.get(url, timeout=15).text
-        text = trafilatura.extract(html) or ""
-        return text[:100000]
+        r, html, truncated = http_client.stream_text(
+            url, MAX_FETCH_BYTES, reject_over=SKIP_HTML_CHARS,
+            timeout=timeout, deadline=deadline, headers=fetch_cache.conditional_headers(entry)
+        )
+        if r.status_code == 304 and entry:
+            fetch_cache.count("revalidated")
+            fetch_cache.touch(url)
+            return entry["text"]
+        fetch_cache.count("downloaded")
+        if truncated:
+            fetch_cache.count("truncated")
+        if entry and entry["html_hash"] == content_hash(html):
+            fetch_cache.count("unchanged")
+            fetch_cache.touch(url)
+            return entry["text"]
+        text = (extract or extract_text)(html)
+        fetch_cache.count("extracted")
+        # A body cut off by the deadline is used for this run but not cached
+        if r.ok and not (truncated and time.monotonic() >= deadline):
+            fetch_cache.put(url, html, text, r.headers.get("ETag"), r.headers.get("Last-Modified"))
+        return text
+    except ResponseRejected as e:
+        fetch_cache.count("rejected")
+        print(f"skipped {url}: {e}")
+        return ""
     except Exception as e:
         print("fetch error", e)
         return ""
 
-def call_llm_system(prompt):
+def call_llm_system(prompt, draft_path=None):
+    """Generate a draft; with draft_path (and RESEARCH_STREAM on) it is streamed into that file.
+    
+    Returns {"text": draft, **stats}: the stream's completeness, TTFT, seconds
+    and chars when streamed, else the seconds the call took (none in dry-run).
+    """
     if not os.getenv("OPENAI_API_KEY"):
-        return "# DRAFT (LLM disabled)\n\n" + prompt[:1000]
-    from langchain.llms import OpenAI
-    llm = OpenAI(temperature=0.2)
-    return llm(prompt)
+        return {"text": "# DRAFT (LLM disabled)\n\n" + prompt[:1000]}
+    from .llm_stream import stream_with_retry, STREAM_DRAFTS, LLM_TIMEOUT
+    if STREAM_DRAFTS and draft_path:
+        return stream_with_retry(lambda: llm_client.stream(prompt, temperature=0.2, timeout=LLM_TIMEOUT),
+                                 draft_path)
+    start = time.perf_counter()
+    text = llm_client.complete(prompt, temperature=0.2, timeout=LLM_TIMEOUT)
+    return {"text": text, "seconds": round(time.perf_counter() - start, 3)}
 
-def main():
-    topic = " ".join(sys.argv[1:]) or "Auto-generated topic"
+def store_sources(topic, id_prefix, ts, sources):
+    """Upsert a run's sources into the vector database (one writer at a time)"""
+    try:
+        from ..vector_search.lancedb_client import vector_client
+        with _store_lock:
+            stored = vector_client.upsert_sources_batch(
+                {
+                    "id": f"{id_prefix}-source-{i}",
+                    "url": source["url"],
+                    "title": source["title"],
+                    "content": source["content"],
+                    "metadata": {"topic": topic, "timestamp": ts}
+                }
+                for i, source in enumerate(sources)
+            )
+        if not stored:
+            # upsert_sources_batch returns {} after printing the error
+            print(f"Warning: Could not store {len(sources)} sources in vector database")
+            return
+        print(f"📊 Stored sources in vector database: {stored['inserted']} new, "
+              f"{stored['updated']} updated, {stored['unchanged']} unchanged")
+    except Exception as e:
+        print(f"Warning: Could not store in vector database: {e}")
+
+def research_topic(topic, out_dir=OUT, graph=None, id_prefix=None):
+    """Research one topic and write its draft, sources and metadata to out_dir.
+    
+    graph is a compiled research graph to reuse (batch mode shares one).
+    Returns a summary with the status, method and wall time of the run.
+    """
+    start = time.perf_counter()
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    ts = datetime.datetime.now(datetime.timezone.utc).strftime("%Y%m%d-%H%M")
+    id_prefix = id_prefix or ts
+    draft_path = out_dir / f"draft-{ts}.md"
+    summary = {"topic": topic, "draft": str(draft_path)}
     
     # Try LangGraph workflow first
     try:
         from .langgraph_agent import run_research_workflow
-        result = run_research_workflow(topic)
+        result = run_research_workflow(topic, draft_path=draft_path, graph=graph)
         
         if result["status"] == "completed" and result["method"] == "langgraph":
             state = result["state"]
             
-            # Save outputs
-            ts = datetime.datetime.now(datetime.timezone.utc).strftime("%Y%m%d-%H%M")
-            (OUT / f"draft-{ts}.md").write_text(state.draft, encoding="utf-8")
+            # Save outputs (the draft may already have been streamed there)
+            draft_path.write_text(state["draft"], encoding="utf-8")
             
             # Save sources
             sources_data = []
-            for source in state.sources:
+            for source in state["sources"]:
                 sources_data.append({
                     "url": source["url"],
                     "title": source["title"],
                     "excerpt": source["content"][:2000]
                 })
             
-            (OUT / f"sources-{ts}.json").write_text(
+            (out_dir / f"sources-{ts}.json").write_text(
                 json.dumps(sources_data, ensure_ascii=False, indent=2), 
                 encoding="utf-8"
             )
             
-            # Store in vector database
-            try:
-                from ..vector_search.lancedb_client import vector_client
-                for i, source in enumerate(state.sources):
-                    source_id = f"{ts}-source-{i}"
-                    vector_client.add_source(
-                        source_id=source_id,
-                        url=source["url"],
-                        title=source["title"],
-                        content=source["content"],
-                        metadata={"topic": topic, "timestamp": ts}
-                    )
-                print(f"📊 Stored {len(state.sources)} sources in vector database")
-            except Exception as e:
-                print(f"Warning: Could not store in vector database: {e}")
+            # Save run metadata, including per-node timings
+            (out_dir / f"metadata-{ts}.json").write_text(
+                json.dumps(state["metadata"], ensure_ascii=False, indent=2),
+                encoding="utf-8"
+            )
+            print("⏱️  " + ", ".join(
+                f"{node} {t['seconds']:.2f}s" + (f" ({t['calls']}x)" if t["calls"] > 1 else "")
+                for node, t in state["metadata"]["timings"].items()
+            ))
             
-            print(f"✅ LangGraph workflow completed. Wrote draft and sources to out/")
-            return
+            store_sources(topic, id_prefix, ts, state["sources"])
+            print(f"✅ LangGraph workflow completed. Wrote draft and sources to {out_dir}/")
+            summary.update(status="completed", method="langgraph", sources=len(state["sources"]),
+                           timings=state["metadata"]["timings"],
+                           seconds=round(time.perf_counter() - start, 3))
+            return summary
     except Exception as e:
         print(f"LangGraph workflow failed: {e}, falling back to simple workflow")
     
     # Fallback to simple workflow
-    hits = search_tavily(topic)
-    notes = []
-    for h in hits[:5]:
-        txt = fetch_text(h["url"])
-        notes.append({"url": h["url"], "title": h.get("title"), "excerpt": txt[:2000]})
-    prompt = f"Topic: {topic}\n\nSources:\n" + "\n\n".join([f"- {n['url']}: {n['excerpt'][:300]}" for n in notes])
-    draft = call_llm_system(prompt)
-    ts = datetime.datetime.now(datetime.timezone.utc).strftime("%Y%m%d-%H%M")
-    (OUT / f"draft-{ts}.md").write_text(draft, encoding="utf-8")
-    (OUT / f"sources-{ts}.json").write_text(json.dumps(notes, ensure_ascii=False, indent=2), encoding="utf-8")
+    from .fetch_pipeline import gather_sources
+    sources, fetch_stats = gather_sources([topic], per_query=5)
+    search_cache.count("duplicate_urls", fetch_stats["duplicate_urls"])
+    print(f"🌐 Fetched {fetch_stats['fetched']} sources in {fetch_stats['seconds']:.1f}s")
+    notes = [{"url": s["url"], "title": s["title"], "excerpt": s["content"][:2000]} for s in sources]
+    from .context_packing import pack_context, print_stats
+    context, context_stats = pack_context(topic, [{**n, "content": n["excerpt"]} for n in notes])
+    print_stats(context_stats)
+    prompt = f"Topic: {topic}\n\nSources:\n" + context
+    llm = call_llm_system(prompt, draft_path=draft_path)
+    draft_path.write_text(llm.pop("text"), encoding="utf-8")
+    (out_dir / f"sources-{ts}.json").write_text(json.dumps(notes, ensure_ascii=False, indent=2), encoding="utf-8")
+    metadata = {
+        "created_at": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+        "topic": topic,
+        "status": "completed",
+        "method": "fallback",
+        "sources": len(notes),
+        "fetch": fetch_stats,
+        "context": context_stats,
+    }
+    if llm:
+        metadata["llm"] = llm
+    (out_dir / f"metadata-{ts}.json").write_text(
+        json.dumps(metadata, ensure_ascii=False, indent=2),
+        encoding="utf-8"
+    )
     
-    # Store in vector database
-    try:
-        from ..vector_search.lancedb_client import vector_client
-        for i, note in enumerate(notes):
-            source_id = f"{ts}-source-{i}"
-            vector_client.add_source(
-                source_id=source_id,
-                url=note["url"],
-                title=note["title"],
-                content=note["excerpt"],
-                metadata={"topic": topic, "timestamp": ts}
-            )
-        print(f"📊 Stored {len(notes)} sources in vector database")
-    except Exception as e:
-        print(f"Warning: Could not store in vector database: {e}")
+    store_sources(topic, id_prefix, ts, sources)
+    print(f"✅ Simple workflow completed. Wrote draft, sources and metadata to {out_dir}/")
+    summary.update(status="completed", method="fallback", sources=len(notes),
+                   seconds=round(time.perf_counter() - start, 3))
+    return summary
+
+def main():
+    parser = argparse.ArgumentParser(description="Research a topic and write a draft to out/")
+    parser.add_argument("topic", nargs="*", help="Research topic")
+    parser.add_argument("--topics", help="File with one topic per line: research them all in one process")
+    parser.add_argument("--concurrency", type=int, default=None, help="Topics researched at once in batch mode")
+    args = parser.parse_args()
+    
+    if args.topics:
+        from .batch import run_batch, read_topics, BATCH_CONCURRENCY
+        run_batch(read_topics(args.topics), concurrency=args.concurrency or BATCH_CONCURRENCY)
+    else:
+        research_topic(" ".join(args.topic) or "Auto-generated topic")
     
-    print("✅ Simple workflow completed. Wrote draft and sources to out/")
+    search_cache.print_stats()
+    fetch_cache.print_stats()
+    http_client.print_metrics()
+    llm_client.print_stats()
 
 if __name__ == "__main__":
     main()
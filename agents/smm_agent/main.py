@@ -9,6 +9,8 @@ import json
 import datetime
 from pathlib import Path
 
+from ..http_client import http_client
+
 def extract_post_metadata(markdown_content):
     """Extract metadata from markdown post"""
     lines = markdown_content.split('\n')
@@ -56,10 +58,9 @@ def send_telegram_message(message):
         return False
     
     try:
-        import requests
         url = f"https://api.telegram.org/bot{token}/sendMessage"
         data = {"chat_id": chat_id, "text": message, "parse_mode": "Markdown"}
-        response = requests.post(url, json=data)
+        response = http_client.post(url, json=data)
         return response.status_code == 200
     except Exception as e:
         print(f"Telegram error: {e}")
@@ -141,6 +142,7 @@ def main():
         print(f"{status} {platform}")
     
     print(f"Results saved to: out/smm-{timestamp}.json")
+    http_client.print_metrics()
 
 if __name__ == "__main__":
     main()
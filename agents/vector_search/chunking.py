@@ -0,0 +1,75 @@
+# agents/vector_search/chunking.py
+"""
+Token-aware, overlapping chunking for long documents.
+
+Chunks are produced lazily: words are pulled from the text a block at a
+time and only the current window is held in memory, so a 100k character
+article costs no more to chunk than a short one.
+"""
+import re
+from collections import deque
+from typing import Callable, Iterator, List, Optional, Tuple
+
+CHUNK_TOKENS = 200  # MiniLM truncates at 256 word pieces; leave room for special tokens
+CHUNK_OVERLAP = 40
+WORD_BLOCK = 256
+
+WORD_PATTERN = re.compile(r"\S+")
+
+def estimate_tokens(words: List[str]) -> List[int]:
+    """Rough word piece counts when no tokenizer is available"""
+    return [max(1, (len(word) + 3) // 4) for word in words]
+
+def tokenizer_counter(tokenizer) -> Callable[[List[str]], List[int]]:
+    """Wrap a Hugging Face tokenizer as a batched word -> token count function"""
+    def count(words: List[str]) -> List[int]:
+        encoded = tokenizer(words, add_special_tokens=False)["input_ids"]
+        return [max(1, len(ids)) for ids in encoded]
+    return count
+
+def _words(text: str, count_tokens) -> Iterator[Tuple[int, int, int]]:
+    """Yield (start, end, tokens) per word, tokenizing WORD_BLOCK words at a time"""
+    block = []
+    for match in WORD_PATTERN.finditer(text):
+        block.append(match)
+        if len(block) == WORD_BLOCK:
+            yield from zip((m.start() for m in block), (m.end() for m in block),
+                           count_tokens([m.group() for m in block]))
+            block = []
+    if block:
+        yield from zip((m.start() for m in block), (m.end() for m in block),
+                       count_tokens([m.group() for m in block]))
+
+def iter_chunks(text: str, max_tokens: int = CHUNK_TOKENS, overlap: int = CHUNK_OVERLAP,
+                count_tokens: Optional[Callable[[List[str]], List[int]]] = None) -> Iterator[str]:
+    """Split text into chunks of at most max_tokens, each repeating about
+    overlap tokens from the end of the previous chunk. A single word longer
+    than max_tokens becomes its own chunk.
+    """
+    if overlap >= max_tokens:
+        raise ValueError("overlap must be smaller than max_tokens")
+    count_tokens = count_tokens or estimate_tokens
+
+    window = deque()  # (start, end, tokens) of the words in the current chunk
+    window_tokens = 0
+    fresh = False  # whether the window holds words not yet emitted
+    for start, end, tokens in _words(text, count_tokens):
+        if window and window_tokens + tokens > max_tokens:
+            yield text[window[0][0]:window[-1][1]]
+            fresh = False
+            # Keep the tail of the chunk as overlap for the next one
+            carried = 0
+            tail = deque()
+            while window and carried + window[-1][2] <= overlap:
+                word = window.pop()
+                tail.appendleft(word)
+                carried += word[2]
+            if carried + tokens > max_tokens:
+                tail.clear()
+                carried = 0
+            window, window_tokens = tail, carried
+        window.append((start, end, tokens))
+        window_tokens += tokens
+        fresh = True
+    if window and fresh:
+        yield text[window[0][0]:window[-1][1]]
@@ -3,46 +3,178 @@
 CLI tool for vector search operations
 """
 import sys
+import time
 import argparse
 from pathlib import Path
 
+def print_cache_stats(vector_client):
+    """Embedding cache hits and misses of this run, if it embedded anything"""
+    cache = vector_client._cache
+    if cache is not None and cache.hits + cache.misses:
+        print(f"🧠 Embedding cache: {cache.hits} hits, {cache.misses} misses ({len(cache)} entries)")
+
 def main():
     parser = argparse.ArgumentParser(description="Vector Search CLI")
-    parser.add_argument("command", choices=["search", "stats", "add"], help="Command to execute")
+    parser.add_argument("command", choices=["search", "stats", "add", "index", "migrate", "compact", "reindex"], help="Command to execute")
     parser.add_argument("--query", "-q", help="Search query")
     parser.add_argument("--limit", "-l", type=int, default=5, help="Number of results to return")
     parser.add_argument("--type", "-t", choices=["posts", "sources"], default="sources", help="Type to search")
+    parser.add_argument("--topic", help="Only return results stored under this research topic")
+    parser.add_argument("--since", help="Only return results stored on or after this date (YYYY-MM-DD)")
+    parser.add_argument("--mode", choices=["vector", "fts", "hybrid"], default="vector", help="Dense, keyword (BM25) or fused search")
+    parser.add_argument("--fusion", choices=["rrf", "weighted"], default="rrf", help="How hybrid mode merges keyword and vector hits")
+    parser.add_argument("--alpha", type=float, default=0.5, help="Vector weight for --fusion weighted")
+    parser.add_argument("--nprobes", type=int, help="IVF partitions to probe when searching an indexed table")
+    parser.add_argument("--refine-factor", type=int, help="Re-rank limit * factor candidates with exact distances")
+    parser.add_argument("--chunks", action="store_true", help="Search every chunk of long documents and rank documents by their chunks")
+    parser.add_argument("--chunk-scoring", choices=["max", "sum"], default="max", help="Score a document by its best chunk or by all matching chunks")
+    parser.add_argument("--index-type", choices=["IVF_PQ", "IVF_HNSW_SQ", "IVF_HNSW_PQ"], default="IVF_PQ", help="ANN index type to build")
+    parser.add_argument("--partitions", type=int, help="Number of IVF partitions (default: ~sqrt(rows))")
+    parser.add_argument("--sub-vectors", type=int, help="Number of PQ sub-vectors (must divide 384)")
+    parser.add_argument("--auto", action="store_true", help="Only rebuild the index if enough rows are unindexed")
+    parser.add_argument("--fts", action="store_true", help="Build the full-text index instead of the vector index")
+    parser.add_argument("--workers", type=int, help="Encoder processes for reindex (default: VECTOR_ENCODER_WORKERS or 1)")
+    parser.add_argument("--threads-per-worker", type=int, help="Torch threads per encoder process (default: cores / workers)")
+    parser.add_argument("--scalar", action="store_true", help="Build scalar indexes on topic, kind and timestamp")
     
     args = parser.parse_args()
     
     try:
-        from .lancedb_client import vector_client
+        from .lancedb_client import vector_client, build_filter
         
         if args.command == "search":
             if not args.query:
                 print("Error: --query is required for search command")
                 sys.exit(1)
             
-            if args.type == "posts":
-                results = vector_client.search_posts(args.query, args.limit)
-            else:
-                results = vector_client.search_sources(args.query, args.limit)
+            search_kwargs = {
+                "nprobes": args.nprobes,
+                "refine_factor": args.refine_factor,
+                "mode": args.mode,
+                "fusion": args.fusion,
+                "alpha": args.alpha,
+                "where": build_filter(topic=args.topic, since=args.since),
+                "chunks": args.chunks,
+                "chunk_scoring": args.chunk_scoring
+            }
+            if not vector_client.db:
+                print("Error: LanceDB not available")
+                sys.exit(1)
+            
+            # Only read the columns we print; metadata is never parsed
+            results = vector_client.search_results(
+                args.type, args.query, args.limit,
+                columns=["title", "url", "content"],
+                **search_kwargs
+            )
             
-            print(f"\n🔍 Search results for: '{args.query}'")
+            print(f"\n🔍 Search results for: '{args.query}' ({args.mode})")
             print(f"Found {len(results)} results\n")
             
             for i, result in enumerate(results, 1):
-                print(f"{i}. {result['title']}")
-                print(f"   URL: {result['url']}")
-                print(f"   Score: {result['score']:.4f}")
-                print(f"   Content: {result['content'][:200]}...")
+                print(f"{i}. {result.title}")
+                print(f"   URL: {result.url}")
+                print(f"   Score: {result.score:.4f}")
+                print(f"   Content: {result.content[:200]}...")
                 print()
+            print_cache_stats(vector_client)
         
         elif args.command == "stats":
             stats = vector_client.get_stats()
             print("\n📊 Vector Database Statistics")
             print(f"Posts: {stats['posts']}")
             print(f"Sources: {stats['sources']}")
+            if "chunks" in stats:
+                print(f"Chunks: {stats['chunks']}")
+            if "embedding_cache" in stats:
+                cache = stats["embedding_cache"]
+                print(f"Cached embeddings: {cache['entries']} (max {cache['max_entries']})")
+            print()
+        
+        elif args.command == "index":
+            if not vector_client.db:
+                print("Error: LanceDB not available")
+                sys.exit(1)
+            
+            if args.fts:
+                columns = vector_client.create_fts_index(args.type)
+                print(f"\n🔤 Built full-text index on {args.type} ({', '.join(columns)})\n")
+                return
+            
+            if args.scalar:
+                columns = vector_client.create_scalar_indexes(args.type)
+                print(f"\n🏷️  Built scalar indexes on {args.type} ({', '.join(columns)})\n")
+                return
+            
+            if args.auto:
+                summary = vector_client.maybe_reindex(args.type)
+            else:
+                summary = vector_client.create_index(
+                    args.type,
+                    index_type=args.index_type,
+                    num_partitions=args.partitions,
+                    num_sub_vectors=args.sub_vectors
+                )
+            
+            if summary:
+                print(f"\n🗂️  Built {summary['index_type']} index on {summary['table']}")
+                print(f"Rows: {summary['rows']}")
+                print(f"Partitions: {summary['num_partitions']}, sub-vectors: {summary['num_sub_vectors']}")
+                print(f"Took {summary['seconds']:.2f}s")
+            
+            status = vector_client.index_status(args.type)
+            print(f"\n📊 Index status for {status['table']}")
+            print(f"Rows: {status['rows']}")
+            if status["indexed"]:
+                print(f"Index: {status['index_type']} ({status['unindexed_rows']} unindexed rows)")
+            else:
+                print("Index: none")
+            print()
+        
+        elif args.command == "migrate":
+            if not vector_client.db:
+                print("Error: LanceDB not available")
+                sys.exit(1)
+            
+            migrated = vector_client.migrate()
+            if not migrated:
+                print("\n✅ Tables already use typed metadata columns\n")
+            for table_name, rows in migrated.items():
+                print(f"\n🔧 Migrated {table_name}: {rows} rows now have topic, timestamp and kind columns")
+            print()
+        
+        elif args.command == "compact":
+            if not vector_client.db:
+                print("Error: LanceDB not available")
+                sys.exit(1)
+            
+            result = vector_client.compact(args.type)
+            removed = result["rows_before"] - result["rows_after"]
+            print(f"\n🧹 Compacted {result['table']}")
+            print(f"Rows: {result['rows_before']} → {result['rows_after']} ({removed} duplicates removed)")
+            print(f"Size: {result['bytes_before'] / 1e6:.2f} MB → {result['bytes_after'] / 1e6:.2f} MB")
+            print()
+        
+        elif args.command == "reindex":
+            if not vector_client.db:
+                print("Error: LanceDB not available")
+                sys.exit(1)
+            
+            from agents.vector_search.lancedb_client import ENCODER_WORKERS
+            workers = args.workers or ENCODER_WORKERS
+            start = time.perf_counter()
+            vector_client.start_pool(workers, args.threads_per_worker)
+            try:
+                counts = vector_client.reembed(args.type)
+            finally:
+                vector_client.stop_pool()
+            elapsed = time.perf_counter() - start
+            total = sum(counts.values())
+            print(f"\n♻️  Re-embedded {args.type} with {workers} worker(s)")
+            for table_name, count in counts.items():
+                print(f"{table_name}: {count} rows")
+            print(f"Time: {elapsed:.1f}s ({total / max(elapsed, 1e-9):.1f} rows/s)")
+            print_cache_stats(vector_client)
             print()
         
         elif args.command == "add":
@@ -0,0 +1,170 @@
+# agents/vector_search/embedding_cache.py
+"""
+Persistent content-hash embedding cache.
+
+Vectors live in a memory-mapped float32 file (one row per entry) next to a
+JSON index that maps a hash of model name + normalized text to a row slot.
+Least recently used entries are evicted once max_entries is reached.
+Only inserts and evictions mark the cache dirty; a hit just reorders the
+LRU in memory, and that order is written out with the next flush.
+"""
+import os
+import json
+import hashlib
+import threading
+import unicodedata
+from pathlib import Path
+from collections import OrderedDict
+from typing import Dict, List, Optional
+
+import numpy as np
+
+INDEX_FILE = "index.json"
+VECTORS_FILE = "vectors.f32"
+INITIAL_CAPACITY = 1024
+
+def normalize_text(text: str) -> str:
+    """Normalize text so trivially different inputs share a cache entry"""
+    return " ".join(unicodedata.normalize("NFKC", text or "").split())
+
+class EmbeddingCache:
+    """On-disk LRU cache of embeddings keyed by content hash"""
+
+    def __init__(self, path, model_name: str, dim: int, max_entries: int = 100_000):
+        self.path = Path(path)
+        self.path.mkdir(parents=True, exist_ok=True)
+        self.model_name = model_name
+        self.dim = dim
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()  # key -> slot, least recently used first
+        self._free_slots = []
+        self._dirty = False
+        self._load()
+
+    def key(self, text: str) -> str:
+        """Cache key for a text under this cache's model"""
+        payload = f"{self.model_name}\0{normalize_text(text)}".encode("utf-8")
+        return hashlib.sha256(payload).hexdigest()
+
+    def _load(self):
+        index_path = self.path / INDEX_FILE
+        index = {}
+        if index_path.exists():
+            try:
+                index = json.loads(index_path.read_text(encoding="utf-8"))
+            except (OSError, ValueError) as e:
+                print(f"Embedding cache index unreadable, starting empty: {e}")
+                index = {}
+
+        if index.get("model") != self.model_name or index.get("dim") != self.dim:
+            index = {}
+
+        capacity = max(index.get("capacity", 0), INITIAL_CAPACITY)
+        self._open_vectors(capacity)
+
+        used = set()
+        for key, slot in index.get("entries", []):
+            if slot < self._capacity and slot not in used:
+                self._entries[key] = slot
+                used.add(slot)
+        self._free_slots = sorted(set(range(self._capacity)) - used, reverse=True)
+        self._evict_overflow()
+
+    def _open_vectors(self, capacity: int):
+        vectors_path = self.path / VECTORS_FILE
+        size = capacity * self.dim * 4
+        with open(vectors_path, "ab") as f:
+            if f.tell() < size:
+                f.truncate(size)
+        self._capacity = capacity
+        self._vectors = np.memmap(vectors_path, dtype=np.float32, mode="r+", shape=(capacity, self.dim))
+
+    def _grow(self):
+        new_capacity = min(self._capacity * 2, max(self.max_entries, INITIAL_CAPACITY))
+        if new_capacity <= self._capacity:
+            return
+        self._vectors.flush()
+        old_capacity = self._capacity
+        del self._vectors
+        self._open_vectors(new_capacity)
+        self._free_slots = list(range(new_capacity - 1, old_capacity - 1, -1)) + self._free_slots
+
+    def _evict_overflow(self):
+        while len(self._entries) > self.max_entries:
+            _, slot = self._entries.popitem(last=False)
+            self._free_slots.append(slot)
+            self._dirty = True
+
+    def _allocate(self) -> int:
+        if len(self._entries) >= self.max_entries:
+            _, slot = self._entries.popitem(last=False)
+            return slot
+        if not self._free_slots:
+            self._grow()
+        if self._free_slots:
+            return self._free_slots.pop()
+        _, slot = self._entries.popitem(last=False)
+        return slot
+
+    def get_many(self, texts: List[str]) -> List[Optional[np.ndarray]]:
+        """Return cached vectors (or None on miss) in input order; never dirties the index"""
+        results = []
+        with self._lock:
+            for text in texts:
+                key = self.key(text)
+                slot = self._entries.get(key)
+                if slot is None:
+                    self.misses += 1
+                    results.append(None)
+                else:
+                    self.hits += 1
+                    self._entries.move_to_end(key)
+                    results.append(np.array(self._vectors[slot]))
+        return results
+
+    def put_many(self, texts: List[str], vectors):
+        """Store vectors for texts, evicting least recently used entries"""
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            for text, vector in zip(texts, vectors):
+                key = self.key(text)
+                slot = self._entries.get(key)
+                if slot is None:
+                    slot = self._allocate()
+                self._vectors[slot] = vector
+                self._entries[key] = slot
+                self._entries.move_to_end(key)
+                self._dirty = True
+
+    def flush(self):
+        """Persist vectors and the index to disk if anything was inserted or evicted"""
+        with self._lock:
+            if not self._dirty:
+                return
+            self._vectors.flush()
+            index = {
+                "model": self.model_name,
+                "dim": self.dim,
+                "capacity": self._capacity,
+                "entries": [[key, slot] for key, slot in self._entries.items()]
+            }
+            tmp_path = self.path / f"{INDEX_FILE}.tmp"
+            tmp_path.write_text(json.dumps(index), encoding="utf-8")
+            os.replace(tmp_path, self.path / INDEX_FILE)
+            self._dirty = False
+
+    def stats(self) -> Dict[str, int]:
+        """Entry count and hit/miss counters for this process"""
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses
+        }
+
+    def __len__(self):
+        return len(self._entries)
@@ -0,0 +1,185 @@
+# agents/vector_search/encoder_pool.py
+"""
+Multi-process embedding pool.
+
+Each worker process loads its own copy of the model and is limited to a
+share of the CPU cores (OMP/MKL/torch threads), so N workers together use
+about as many cores as one unconstrained process but without the GIL and
+intra-op contention. Jobs go through a bounded queue: the caller never has
+more than queue_size batches waiting, however many texts it submits.
+
+The thread-count variables are set in the environment the workers are
+spawned with: a spawned worker imports this module (and numpy) before
+_worker runs, and BLAS reads them only once, at import.
+"""
+import os
+import queue
+import threading
+import multiprocessing as mp
+from contextlib import contextmanager
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+
+READY = -1
+THREAD_VARS = ("OMP_NUM_THREADS", "MKL_NUM_THREADS", "OPENBLAS_NUM_THREADS")
+
+_spawn_lock = threading.Lock()
+
+def load_sentence_transformer(model_name: str):
+    """Default worker loader; imports torch only inside the worker"""
+    from sentence_transformers import SentenceTransformer
+    return SentenceTransformer(model_name, device="cpu")
+
+def _thread_env(threads: int) -> Dict[str, str]:
+    env = {var: str(threads) for var in THREAD_VARS}
+    env["TOKENIZERS_PARALLELISM"] = "false"
+    return env
+
+@contextmanager
+def _spawn_env(env: Dict[str, str]):
+    """Set env for processes started inside the block, restoring the parent's afterwards"""
+    with _spawn_lock:
+        saved = {name: os.environ.get(name) for name in env}
+        os.environ.update(env)
+        try:
+            yield
+        finally:
+            for name, value in saved.items():
+                if value is None:
+                    os.environ.pop(name, None)
+                else:
+                    os.environ[name] = value
+
+def _limit_threads(threads: int):
+    """torch reads its thread counts at runtime, so they can still be set in the worker"""
+    os.environ.update(_thread_env(threads))
+    try:
+        import torch
+        torch.set_num_threads(threads)
+        torch.set_num_interop_threads(1)
+    except (ImportError, RuntimeError):
+        pass
+
+def _worker(model_name: str, threads: int, loader: Callable, inputs, outputs):
+    _limit_threads(threads)
+    try:
+        model = loader(model_name)
+    except Exception as e:
+        outputs.put((READY, None, f"{type(e).__name__}: {e}"))
+        return
+    outputs.put((READY, None, None))
+
+    while True:
+        job = inputs.get()
+        if job is None:
+            break
+        job_id, texts, batch_size = job
+        try:
+            vectors = model.encode(texts, batch_size=batch_size, convert_to_numpy=True,
+                                   show_progress_bar=False)
+            outputs.put((job_id, np.asarray(vectors, dtype=np.float32), None))
+        except Exception as e:
+            outputs.put((job_id, None, f"{type(e).__name__}: {e}"))
+
+class EncoderPool:
+    """Fan embedding batches out over worker processes"""
+
+    def __init__(self, model_name: str, workers: int, threads_per_worker: Optional[int] = None,
+                 queue_size: Optional[int] = None, loader: Callable = load_sentence_transformer):
+        if workers < 1:
+            raise ValueError("workers must be at least 1")
+        self.model_name = model_name
+        self.workers = workers
+        self.threads_per_worker = threads_per_worker or max(1, (os.cpu_count() or 1) // workers)
+        self.queue_size = queue_size or 2 * workers
+        self.loader = loader
+        self._processes = []
+        self._lock = threading.Lock()
+        self._next_job = 0
+
+    def start(self):
+        """Spawn the workers and wait until every model is loaded"""
+        if self._processes:
+            return self
+        ctx = mp.get_context("spawn")
+        self._inputs = ctx.Queue(maxsize=self.queue_size)
+        self._outputs = ctx.Queue()
+        self._processes = [
+            ctx.Process(
+                target=_worker,
+                args=(self.model_name, self.threads_per_worker, self.loader, self._inputs, self._outputs),
+                daemon=True
+            )
+            for _ in range(self.workers)
+        ]
+        with _spawn_env(_thread_env(self.threads_per_worker)):
+            for process in self._processes:
+                process.start()
+
+        for _ in range(self.workers):
+            _, _, error = self._receive()
+            if error:
+                self.close()
+                raise RuntimeError(f"Encoder worker failed to load {self.model_name}: {error}")
+        return self
+
+    def _receive(self):
+        while True:
+            try:
+                return self._outputs.get(timeout=1.0)
+            except queue.Empty:
+                if not all(process.is_alive() for process in self._processes):
+                    raise RuntimeError("Encoder worker exited unexpectedly")
+
+    def encode(self, texts: List[str], batch_size: int = 64):
+        """Encode texts across the pool, returning a float32 matrix in input order"""
+        if not texts:
+            return np.zeros((0, 0), dtype=np.float32)
+        if not self._processes:
+            self.start()
+
+        with self._lock:
+            first_job = self._next_job
+            starts = range(0, len(texts), batch_size)
+            self._next_job += len(starts)
+            results = {}
+            in_flight = 0
+            error = None
+            for offset, start in enumerate(starts):
+                # Bounded: wait for a result before queueing more than the pool can hold
+                while in_flight >= self.queue_size + self.workers:
+                    job_id, vectors, job_error = self._receive()
+                    results[job_id] = vectors
+                    error = error or job_error
+                    in_flight -= 1
+                self._inputs.put((first_job + offset, texts[start:start + batch_size], batch_size))
+                in_flight += 1
+            while in_flight:
+                job_id, vectors, job_error = self._receive()
+                results[job_id] = vectors
+                error = error or job_error
+                in_flight -= 1
+
+        if error:
+            raise RuntimeError(f"Encoder worker failed: {error}")
+        return np.vstack([results[first_job + offset] for offset in range(len(starts))])
+
+    def close(self):
+        """Stop the workers"""
+        if not self._processes:
+            return
+        for process in self._processes:
+            if process.is_alive():
+                self._inputs.put(None)
+        for process in self._processes:
+            process.join(timeout=10)
+            if process.is_alive():
+                process.terminate()
+        self._processes = []
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.close()
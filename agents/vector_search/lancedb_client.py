@@ -4,196 +4,1095 @@ LanceDB client for vector search capabilities
 """
 import os
 import json
-from typing import List, Dict, Any, Optional
+import time
+import atexit
+import hashlib
+import threading
+from typing import List, Dict, Any, Iterable, Optional, Tuple
 from pathlib import Path
+from datetime import datetime, timedelta, timezone
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+from concurrent.futures import ThreadPoolExecutor
+
+from .results import SearchResult, results_from_arrow
 
 try:
     import lancedb
     import numpy as np
-    from sentence_transformers import SentenceTransformer
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    from lancedb.index import IvfPq, IvfHnswSq, IvfHnswPq, BTree, Bitmap, FTS
+    from .embedding_cache import EmbeddingCache, normalize_text
+    from .chunking import iter_chunks, tokenizer_counter, estimate_tokens
+    from .encoder_pool import EncoderPool
     LANCEDB_AVAILABLE = True
 except ImportError:
     LANCEDB_AVAILABLE = False
     print("LanceDB not available - install with: pip install lancedb sentence-transformers")
 
+EMBEDDING_MODEL = 'all-MiniLM-L6-v2'
+EMBEDDING_DIM = 384
+DEFAULT_BATCH_SIZE = 64
+EMBEDDING_CACHE_SIZE = int(os.getenv("VECTOR_EMBEDDING_CACHE_SIZE", "100000"))
+ENCODER_WORKERS = int(os.getenv("VECTOR_ENCODER_WORKERS", "1"))
+
+# ANN index settings
+VECTOR_INDEX_NAME = "embedding_idx"
+INDEX_TYPES = ("IVF_PQ", "IVF_HNSW_SQ", "IVF_HNSW_PQ")
+DEFAULT_INDEX_TYPE = "IVF_PQ"
+MIN_INDEX_ROWS = 256  # PQ training needs at least one row per centroid
+AUTO_REINDEX_ROWS = int(os.getenv("VECTOR_AUTO_REINDEX_ROWS", "10000"))
+
+# Keyword / hybrid search settings
+SEARCH_MODES = ("vector", "fts", "hybrid")
+FTS_COLUMNS = ("title", "content")
+RRF_K = 60
+HYBRID_CANDIDATE_FACTOR = 4
+DEFAULT_RESULT_COLUMNS = ("id", "title", "content", "url", "metadata")
+
+# Typed metadata columns promoted out of the JSON metadata blob
+TABLE_KINDS = {"posts": "post", "sources": "source"}
+SCALAR_INDEXES = {"topic": "BITMAP", "kind": "BITMAP", "timestamp": "BTREE", "key": "BTREE", "parent_key": "BTREE"}
+TIMESTAMP_FORMATS = ("%Y%m%d-%H%M", "%Y-%m-%d")
+
+# Long documents are split into overlapping chunks stored in a child table
+CHUNKS_TABLE = "chunks"
+CHUNK_DOCUMENTS = os.getenv("VECTOR_CHUNK_DOCUMENTS", "1") != "0"
+CHUNK_WRITE_BATCH = 512
+CHUNK_CANDIDATE_FACTOR = 10
+CHUNK_SCORING = ("max", "sum")
+
+UPSERT_LOOKUP_CHUNK = 500
+# Query params dropped from canonical URLs: utm_* by prefix, the rest by exact name
+TRACKING_PREFIXES = ("utm_",)
+TRACKING_PARAMS = {"fbclid", "gclid", "mc_cid", "mc_eid", "ref"}
+EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+# Old table versions kept after a rewrite so readers still on them keep working
+CLEANUP_GRACE = timedelta(minutes=int(os.getenv("VECTOR_CLEANUP_GRACE_MINUTES", "10")))
+
+def list_table_names(db) -> List[str]:
+    """Names of every table in a LanceDB connection, following list_tables pagination"""
+    names, page_token = [], None
+    while True:
+        response = db.list_tables(page_token=page_token)
+        names.extend(response.tables)
+        page_token = response.page_token
+        if not page_token:
+            return names
+
+def canonical_url(url: str) -> str:
+    """Normalize a URL so trivially different links to one page compare equal"""
+    parts = urlsplit((url or "").strip())
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or "").lower()
+    if host.startswith("www."):
+        host = host[4:]
+    port = parts.port
+    if port and not (scheme == "http" and port == 80 or scheme == "https" and port == 443):
+        host = f"{host}:{port}"
+    query = sorted(
+        (name, value) for name, value in parse_qsl(parts.query, keep_blank_values=True)
+        if not (name.lower().startswith(TRACKING_PREFIXES) or name.lower() in TRACKING_PARAMS)
+    )
+    path = parts.path.rstrip("/") or "/"
+    return urlunsplit((scheme, host, path, urlencode(query), ""))
+
+def record_keys(table_name: str, url: str, title: str, content: str) -> Dict[str, str]:
+    """Upsert key and content hash for a record.
+    
+    Sources (and posts with a URL) are keyed by their canonical URL; posts
+    without one are keyed by their content hash.
+    """
+    content_hash = hashlib.sha256(normalize_text(f"{title} {content}").encode("utf-8")).hexdigest()
+    if url:
+        key = hashlib.sha256(canonical_url(url).encode("utf-8")).hexdigest()
+    else:
+        key = content_hash
+    return {"key": key, "content_hash": content_hash}
+
+def table_schema(table_name: str) -> "pa.Schema":
+    """Arrow schema for the posts, sources or chunks table"""
+    if table_name == CHUNKS_TABLE:
+        return pa.schema([
+            ("id", pa.string()),
+            ("parent_table", pa.string()),
+            ("parent_key", pa.string()),
+            ("chunk_index", pa.int32()),
+            ("content", pa.string()),
+            ("embedding", pa.list_(pa.float32(), EMBEDDING_DIM)),
+            ("topic", pa.string()),
+            ("timestamp", pa.timestamp("us", tz="UTC")),
+            ("kind", pa.string())
+        ])
+    if table_name == "posts":
+        leading = [("id", pa.string()), ("title", pa.string()), ("content", pa.string()), ("url", pa.string())]
+    else:
+        leading = [("id", pa.string()), ("url", pa.string()), ("title", pa.string()), ("content", pa.string())]
+    return pa.schema(leading + [
+        ("embedding", pa.list_(pa.float32(), EMBEDDING_DIM)),
+        ("metadata", pa.string()),
+        ("topic", pa.string()),
+        ("timestamp", pa.timestamp("us", tz="UTC")),
+        ("kind", pa.string()),
+        ("key", pa.string()),
+        ("content_hash", pa.string())
+    ])
+
+def parse_timestamp(value) -> Optional[datetime]:
+    """Parse the timestamps agents write ("20260101-0800", ISO 8601, datetimes) as UTC"""
+    if value is None or value == "":
+        return None
+    if isinstance(value, datetime):
+        parsed = value
+    else:
+        value = str(value)
+        for fmt in TIMESTAMP_FORMATS:
+            try:
+                parsed = datetime.strptime(value, fmt)
+                break
+            except ValueError:
+                continue
+        else:
+            try:
+                parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+            except ValueError:
+                return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.astimezone(timezone.utc)
+
+def typed_metadata(metadata: Dict, default_kind: str) -> Dict[str, Any]:
+    """Extract the typed column values from a record's metadata dict"""
+    return {
+        "topic": metadata.get("topic"),
+        "timestamp": parse_timestamp(metadata.get("timestamp")),
+        "kind": metadata.get("kind") or default_kind
+    }
+
+def build_filter(topic: Optional[str] = None, since=None, kind: Optional[str] = None) -> Optional[str]:
+    """Build a LanceDB SQL filter over the typed metadata columns"""
+    clauses = []
+    if topic:
+        clauses.append("topic = '{}'".format(topic.replace("'", "''")))
+    if kind:
+        clauses.append("kind = '{}'".format(kind.replace("'", "''")))
+    if since:
+        parsed = parse_timestamp(since)
+        if parsed is None:
+            raise ValueError(f"Unrecognized timestamp {since!r}")
+        clauses.append(f"timestamp >= TIMESTAMP '{parsed.strftime('%Y-%m-%d %H:%M:%S')}'")
+    return " AND ".join(clauses) or None
+
+def fuse_rankings(vector_hits: List[Tuple[str, float]], fts_hits: List[Tuple[str, float]],
+                  limit: int, fusion: str = "rrf", alpha: float = 0.5) -> List[Tuple[str, float]]:
+    """Merge vector and keyword (id, score) rankings into one.
+    
+    "rrf" uses reciprocal rank fusion (sum of 1 / (RRF_K + rank)). "weighted"
+    min-max normalizes both score lists and mixes them as
+    alpha * vector + (1 - alpha) * keyword. Vector scores are distances
+    (lower is better), keyword scores are BM25 (higher is better).
+    """
+    if fusion not in ("rrf", "weighted"):
+        raise ValueError(f"Unknown fusion method {fusion!r}, expected 'rrf' or 'weighted'")
+    
+    def normalized(hits, higher_is_better):
+        if not hits:
+            return []
+        scores = [score for _, score in hits]
+        low, high = min(scores), max(scores)
+        span = high - low
+        if not span:
+            # A lone hit or tied scores: all equally the best of this list
+            return [(doc_id, 1.0) for doc_id, _ in hits]
+        return [
+            (doc_id, (score - low) / span if higher_is_better else (high - score) / span)
+            for doc_id, score in hits
+        ]
+    
+    fused = {}
+    if fusion == "rrf":
+        for hits in (vector_hits, fts_hits):
+            for rank, (doc_id, _) in enumerate(hits, 1):
+                fused[doc_id] = fused.get(doc_id, 0.0) + 1.0 / (RRF_K + rank)
+    else:
+        for hits, weight, higher_is_better in ((vector_hits, alpha, False), (fts_hits, 1.0 - alpha, True)):
+            for doc_id, score in normalized(hits, higher_is_better):
+                fused[doc_id] = fused.get(doc_id, 0.0) + weight * score
+    
+    ranked = sorted(fused, key=fused.get, reverse=True)[:limit]
+    return [(doc_id, fused[doc_id]) for doc_id in ranked]
+
 class VectorSearchClient:
-    """Client for vector search operations"""
+    """Client for vector search operations.
+    
+    Construction is cheap: the LanceDB connection is opened on first use and
+    the SentenceTransformer (and torch) is only imported when an embedding
+    is actually computed, so metadata-only calls like get_stats never pay
+    for model loading.
+    """
     
     def __init__(self, db_path: str = "vector_db"):
         self.db_path = Path(db_path)
-        self.db_path.mkdir(exist_ok=True)
+        self._db = None
+        self._model = None
+        self._cache = None
+        self._pool = None
+        self._count_tokens = None
+        self._db_failed = False
+        self._model_failed = False
+        self._init_lock = threading.Lock()
+        self._fts_ready = set()
+    
+    @property
+    def db(self):
+        """LanceDB connection, opened (and tables created) on first access"""
+        if self._db is not None or self._db_failed or not LANCEDB_AVAILABLE:
+            return self._db
+        
+        with self._init_lock:
+            if self._db is None and not self._db_failed:
+                try:
+                    self.db_path.mkdir(exist_ok=True)
+                    db = lancedb.connect(self.db_path)
+                    self._ensure_tables(db)
+                    self._db = db
+                except Exception as e:
+                    print(f"Error initializing LanceDB: {e}")
+                    self._db_failed = True
+        return self._db
+    
+    @property
+    def model(self):
+        """Embedding model, loaded on first access"""
+        if self._model is not None or self._model_failed or not LANCEDB_AVAILABLE:
+            return self._model
+        
+        with self._init_lock:
+            if self._model is None and not self._model_failed:
+                try:
+                    from sentence_transformers import SentenceTransformer
+                    self._model = SentenceTransformer(EMBEDDING_MODEL)
+                except Exception as e:
+                    print(f"Error loading embedding model: {e}")
+                    self._model_failed = True
+        return self._model
+    
+    @property
+    def cache(self):
+        """Embedding cache keyed by model + normalized text"""
+        if self._cache is None and LANCEDB_AVAILABLE and EMBEDDING_CACHE_SIZE > 0:
+            with self._init_lock:
+                if self._cache is None:
+                    self._cache = EmbeddingCache(
+                        self.db_path / "embedding_cache",
+                        EMBEDDING_MODEL,
+                        EMBEDDING_DIM,
+                        max_entries=EMBEDDING_CACHE_SIZE
+                    )
+                    # Query embeddings are only persisted with the next batch flush, or here
+                    atexit.register(self._cache.flush)
+        return self._cache
+    
+    def flush_cache(self):
+        """Write new embedding cache entries to disk (once per batch ingest, not per query)"""
+        if self._cache is not None:
+            self._cache.flush()
+    
+    def _ensure_tables(self, db):
+        """Ensure required tables exist, warning about pre-migration layouts"""
+        existing = list_table_names(db)
+        for table_name in TABLE_KINDS:
+            if table_name not in existing:
+                db.create_table(table_name, schema=table_schema(table_name))
+            elif not set(table_schema(table_name).names) <= set(db.open_table(table_name).schema.names):
+                print(f"Table {table_name} predates the current schema - "
+                      f"run: python -m agents.vector_search.cli migrate")
+        if CHUNKS_TABLE not in existing:
+            db.create_table(CHUNKS_TABLE, schema=table_schema(CHUNKS_TABLE))
+    
+    def _backfill(self, table_name: str, old: "pa.Table") -> "pa.Table":
+        """Add any columns missing from an old table, derived from its existing data"""
+        schema = table_schema(table_name)
+        missing = [name for name in schema.names if name not in old.column_names]
+        computed = {name: [] for name in missing}
+        if missing:
+            rows = zip(
+                old["metadata"].to_pylist(),
+                old["url"].to_pylist(),
+                old["title"].to_pylist(),
+                old["content"].to_pylist()
+            )
+            for metadata_json, url, title, content in rows:
+                values = typed_metadata(json.loads(metadata_json or "{}"), TABLE_KINDS[table_name])
+                values.update(record_keys(table_name, url, title, content))
+                for name in missing:
+                    computed[name].append(values[name])
+        
+        arrays = [
+            pa.array(computed[field.name], type=field.type) if field.name in computed else old[field.name]
+            for field in schema
+        ]
+        return pa.Table.from_arrays(arrays, schema=schema)
+    
+    def _rewrite_table(self, table_name: str, data: "pa.Table"):
+        """Replace a table's contents and rebuild the indexes it had"""
+        table = self.db.open_table(table_name)
+        had_vector_index = VECTOR_INDEX_NAME in [index.name for index in table.list_indices()]
+        
+        self.db.create_table(table_name, data=data, mode="overwrite")
+        self.db.open_table(table_name).optimize(cleanup_older_than=CLEANUP_GRACE)
+        
+        self._fts_ready.discard(table_name)
+        self.create_scalar_indexes(table_name)
+        if had_vector_index and data.num_rows >= MIN_INDEX_ROWS:
+            self.create_index(table_name)
+    
+    def migrate(self) -> Dict[str, int]:
+        """Rewrite tables created before the current schema.
+        
+        topic/timestamp/kind are backfilled from the JSON metadata column and
+        key/content_hash from url, title and content, the rows are written
+        back with the current schema, and vector / full-text / scalar indexes
+        are rebuilt. Returns migrated row counts per table.
+        """
+        migrated = {}
+        for table_name in TABLE_KINDS:
+            table = self.db.open_table(table_name)
+            if set(table_schema(table_name).names) <= set(table.schema.names):
+                continue
+            
+            old = table.to_arrow()
+            self._rewrite_table(table_name, self._backfill(table_name, old))
+            migrated[table_name] = old.num_rows
+        return migrated
+    
+    def compact(self, table_name: str) -> Dict[str, Any]:
+        """Drop duplicate rows (same key, newest timestamp wins) and compact fragments"""
+        self.migrate()
+        table = self.db.open_table(table_name)
+        before = {"rows": table.count_rows(), "bytes": self._table_bytes(table_name)}
+        
+        data = table.to_arrow()
+        keys = data["key"].to_pylist()
+        timestamps = data["timestamp"].to_pylist()
+        newest = {}
+        for position, (key, timestamp) in enumerate(zip(keys, timestamps)):
+            current = newest.get(key)
+            if current is None or (timestamp or EPOCH) >= (timestamps[current] or EPOCH):
+                newest[key] = position
+        
+        if len(newest) < data.num_rows:
+            keep = pa.array(sorted(newest.values()), type=pa.int64())
+            self._rewrite_table(table_name, data.take(keep))
+        else:
+            table.optimize(cleanup_older_than=CLEANUP_GRACE)
+        self._dedupe_chunks()
         
-        if not LANCEDB_AVAILABLE:
-            self.db = None
-            self.model = None
+        return {
+            "table": table_name,
+            "rows_before": before["rows"],
+            "rows_after": self.db.open_table(table_name).count_rows(),
+            "bytes_before": before["bytes"],
+            "bytes_after": self._table_bytes(table_name)
+        }
+    
+    def _dedupe_chunks(self):
+        """Keep the latest copy of each chunk id written by repeated adds"""
+        chunks = self.db.open_table(CHUNKS_TABLE)
+        ids = chunks.search().select(["id"]).limit(None).to_arrow()["id"].to_pylist()
+        if len(set(ids)) == len(ids):
+            chunks.optimize(cleanup_older_than=CLEANUP_GRACE)
             return
+        last = {chunk_id: position for position, chunk_id in enumerate(ids)}
+        data = chunks.to_arrow()
+        self._rewrite_table(CHUNKS_TABLE, data.take(pa.array(sorted(last.values()), type=pa.int64())))
+    
+    def _table_bytes(self, table_name: str) -> int:
+        """On-disk size of a table directory"""
+        root = self.db_path / f"{table_name}.lance"
+        return sum(path.stat().st_size for path in root.rglob("*") if path.is_file())
+    
+    def create_scalar_indexes(self, table_name: str) -> List[str]:
+        """Index the typed metadata columns so filters prune rows before scanning"""
+        table = self.db.open_table(table_name)
+        columns = [column for column in SCALAR_INDEXES if column in table.schema.names]
+        for column in columns:
+            config = Bitmap() if SCALAR_INDEXES[column] == "BITMAP" else BTree()
+            table.create_index(column, config=config, replace=True)
+        return columns
+    
+    def start_pool(self, workers: int = ENCODER_WORKERS, threads_per_worker: Optional[int] = None):
+        """Encode through a pool of worker processes instead of the in-process model.
+        
+        workers <= 1 keeps encoding in-process. Each worker gets
+        threads_per_worker torch threads (default: cores // workers).
+        """
+        self.stop_pool()
+        if workers > 1:
+            self._pool = EncoderPool(EMBEDDING_MODEL, workers, threads_per_worker).start()
+        return self._pool
+    
+    def stop_pool(self):
+        """Shut down the encoder pool, if any"""
+        if self._pool is not None:
+            self._pool.close()
+            self._pool = None
+    
+    def _encode_batches(self, texts: List[str], batch_size: int):
+        """Encode texts in chunks of batch_size, returning a float32 matrix"""
+        if self._pool is not None:
+            if not texts:
+                return np.zeros((0, EMBEDDING_DIM), dtype=np.float32)
+            return self._pool.encode(texts, batch_size)
+        
+        if self.model is None:
+            raise RuntimeError("Embedding model not available - install with: pip install sentence-transformers")
+        
+        chunks = []
+        for start in range(0, len(texts), batch_size):
+            chunk = texts[start:start + batch_size]
+            chunks.append(self.model.encode(
+                chunk,
+                batch_size=batch_size,
+                convert_to_numpy=True,
+                show_progress_bar=False
+            ).astype(np.float32))
+        if not chunks:
+            return np.zeros((0, EMBEDDING_DIM), dtype=np.float32)
+        return np.vstack(chunks)
+    
+    def _embed(self, texts: List[str], batch_size: int = DEFAULT_BATCH_SIZE):
+        """Embed texts, serving cache hits without touching the model"""
+        cache = self.cache
+        if cache is None:
+            return self._encode_batches(texts, batch_size)
+        
+        embeddings = np.zeros((len(texts), EMBEDDING_DIM), dtype=np.float32)
+        missing = []
+        for i, cached in enumerate(cache.get_many(texts)):
+            if cached is None:
+                missing.append(i)
+            else:
+                embeddings[i] = cached
+        
+        if missing:
+            # Encode each distinct missing text once
+            unique_texts = list(dict.fromkeys(texts[i] for i in missing))
+            encoded = self._encode_batches(unique_texts, batch_size)
+            by_text = dict(zip(unique_texts, encoded))
+            for i in missing:
+                embeddings[i] = by_text[texts[i]]
+            cache.put_many(unique_texts, encoded)
+        
+        return embeddings
+    
+    def embed(self, texts: List[str]):
+        """Embed texts with the store's model and embedding cache (float32 matrix)"""
+        return self._embed(list(texts))
+    
+    def _with_embeddings(self, data: "pa.Table", embeddings) -> "pa.Table":
+        """Replace the embedding column of an Arrow table"""
+        position = data.schema.get_field_index("embedding")
+        field = data.schema.field(position)
+        values = pa.array(embeddings.reshape(-1), type=pa.float32())
+        return data.set_column(position, field, pa.FixedSizeListArray.from_arrays(values, EMBEDDING_DIM))
+    
+    def reembed(self, table_name: str, batch_size: int = DEFAULT_BATCH_SIZE) -> Dict[str, int]:
+        """Recompute the embeddings of a table and its chunks, e.g. after a model change.
+        
+        Parent rows are re-embedded from their stored title and content,
+        chunks from their own text. Start a pool first (start_pool) to spread
+        the work over several cores. Returns re-embedded row counts.
+        """
+        self.migrate()
+        data = self.db.open_table(table_name).to_arrow()
+        texts = [
+            f"{title} {content}"
+            for title, content in zip(data["title"].to_pylist(), data["content"].to_pylist())
+        ]
+        self._rewrite_table(table_name, self._with_embeddings(data, self._embed(texts, batch_size)))
+        
+        chunks = self.db.open_table(CHUNKS_TABLE).to_arrow()
+        own = pc.equal(chunks["parent_table"], table_name)
+        mine = chunks.filter(own)
+        if mine.num_rows:
+            mine = self._with_embeddings(mine, self._embed(mine["content"].to_pylist(), batch_size))
+            self._rewrite_table(CHUNKS_TABLE, pa.concat_tables([chunks.filter(pc.invert(own)), mine]))
+        
+        self.flush_cache()
+        return {table_name: data.num_rows, CHUNKS_TABLE: mine.num_rows}
+    
+    def _to_arrow(self, table, columns: Dict[str, List], embeddings) -> "pa.Table":
+        """Build an Arrow table matching the target table's schema"""
+        schema = table.schema
+        arrays = []
+        for field in schema:
+            if field.name == "embedding":
+                if pa.types.is_fixed_size_list(field.type):
+                    values = pa.array(embeddings.reshape(-1), type=pa.float32())
+                    arrays.append(pa.FixedSizeListArray.from_arrays(values, field.type.list_size))
+                else:
+                    arrays.append(pa.array(embeddings.tolist(), type=field.type))
+            else:
+                arrays.append(pa.array(columns[field.name], type=field.type))
+        return pa.Table.from_arrays(arrays, schema=schema)
+    
+    def _prepare(self, table_name: str, records: Iterable[Dict]):
+        """Turn records into column lists (minus embeddings) plus the texts to embed"""
+        columns = {name: [] for name in table_schema(table_name).names if name != "embedding"}
+        texts = []
+        for record in records:
+            title = record.get("title") or ""
+            content = record.get("content") or ""
+            url = record.get("url") or ""
+            metadata = record.get("metadata") or {}
+            columns["id"].append(record["id"])
+            columns["title"].append(title)
+            columns["content"].append(content[:1000])  # Limit content length
+            columns["url"].append(url)
+            columns["metadata"].append(json.dumps(metadata))
+            for name, value in typed_metadata(metadata, TABLE_KINDS[table_name]).items():
+                columns[name].append(value)
+            for name, value in record_keys(table_name, url, title, content).items():
+                columns[name].append(value)
+            texts.append(f"{title} {content}")
+        return columns, texts
+    
+    def _token_counter(self):
+        """Batched word -> token count function from the model's tokenizer.
+        
+        Never loads the model (and torch) just to count tokens: the loaded
+        model's tokenizer is used if there is one, else the tokenizer alone is
+        loaded through transformers, else tokens are estimated.
+        """
+        if self._count_tokens is None:
+            if self._model is not None:
+                tokenizer = getattr(self._model, "tokenizer", None)
+            else:
+                try:
+                    from transformers import AutoTokenizer
+                    tokenizer = AutoTokenizer.from_pretrained(f"sentence-transformers/{EMBEDDING_MODEL}")
+                except Exception:
+                    tokenizer = None
+            self._count_tokens = tokenizer_counter(tokenizer) if tokenizer is not None else estimate_tokens
+        return self._count_tokens
+    
+    def _write_chunks(self, table_name: str, columns: Dict[str, List], texts: List[str],
+                      batch_size: int) -> int:
+        """Chunk, embed and store the full text of each parent row.
+        
+        Chunks stream through the encoder CHUNK_WRITE_BATCH at a time, so
+        memory stays flat however long a document is.
+        """
+        if not CHUNK_DOCUMENTS:
+            return 0
+        
+        chunk_table = self.db.open_table(CHUNKS_TABLE)
+        count_tokens = self._token_counter()
+        names = [name for name in table_schema(CHUNKS_TABLE).names if name != "embedding"]
+        buffer = {name: [] for name in names}
+        chunk_texts = []
+        written = 0
+        
+        def flush():
+            chunk_table.add(self._to_arrow(chunk_table, buffer, self._embed(chunk_texts, batch_size)))
+            for values in buffer.values():
+                values.clear()
+            chunk_texts.clear()
+        
+        for position, text in enumerate(texts):
+            key = columns["key"][position]
+            for index, chunk in enumerate(iter_chunks(text, count_tokens=count_tokens)):
+                buffer["id"].append(f"{table_name}:{key}:{index}")
+                buffer["parent_table"].append(table_name)
+                buffer["parent_key"].append(key)
+                buffer["chunk_index"].append(index)
+                buffer["content"].append(chunk)
+                for name in ("topic", "timestamp", "kind"):
+                    buffer[name].append(columns[name][position])
+                chunk_texts.append(chunk)
+                written += 1
+                if len(chunk_texts) >= CHUNK_WRITE_BATCH:
+                    flush()
+        if chunk_texts:
+            flush()
+        
+        self.maybe_reindex(CHUNKS_TABLE)
+        return written
+    
+    def _delete_chunks(self, table_name: str, keys: List[str]):
+        """Remove the chunks of the given parent rows"""
+        chunk_table = self.db.open_table(CHUNKS_TABLE)
+        for start in range(0, len(keys), UPSERT_LOOKUP_CHUNK):
+            chunk = keys[start:start + UPSERT_LOOKUP_CHUNK]
+            quoted = ", ".join("'{}'".format(k.replace("'", "''")) for k in chunk)
+            chunk_table.delete(f"parent_table = '{table_name}' AND parent_key IN ({quoted})")
+    
+    def _add_batch(self, table_name: str, records: Iterable[Dict], batch_size: int) -> int:
+        """Embed records in batches and commit them with a single table.add.
+        
+        Parent rows are appended (compact drops older copies of a key), but
+        the chunks of a re-added key replace its existing chunks.
+        """
+        columns, texts = self._prepare(table_name, records)
+        if not texts:
+            return 0
+        
+        embeddings = self._embed(texts, batch_size)
+        table = self.db.open_table(table_name)
+        table.add(self._to_arrow(table, columns, embeddings))
+        if CHUNK_DOCUMENTS:
+            # Within one batch the last record for a key wins, as in _upsert_batch
+            last = {key: position for position, key in enumerate(columns["key"])}
+            keep = sorted(last.values())
+            self._delete_chunks(table_name, list(last))
+            self._write_chunks(table_name, {name: [values[i] for i in keep] for name, values in columns.items()},
+                               [texts[i] for i in keep], batch_size)
+        self.flush_cache()
+        self.maybe_reindex(table_name)
+        return len(texts)
+    
+    def _existing_hashes(self, table, keys: List[str]) -> Dict[str, str]:
+        """Map key -> stored content_hash for the keys already in a table"""
+        found = {}
+        for start in range(0, len(keys), UPSERT_LOOKUP_CHUNK):
+            chunk = keys[start:start + UPSERT_LOOKUP_CHUNK]
+            where = "key IN ({})".format(", ".join("'{}'".format(k.replace("'", "''")) for k in chunk))
+            rows = table.search().where(where).select(["key", "content_hash"]).limit(len(chunk) * 4).to_arrow()
+            found.update(zip(rows["key"].to_pylist(), rows["content_hash"].to_pylist()))
+        return found
+    
+    def _upsert_batch(self, table_name: str, records: Iterable[Dict], batch_size: int) -> Dict[str, int]:
+        """Insert new keys, replace changed ones and skip rows whose content hash is unchanged"""
+        self.migrate()  # matching needs the key / content_hash columns of the current schema
+        columns, texts = self._prepare(table_name, records)
+        stats = {"inserted": 0, "updated": 0, "unchanged": 0, "duplicates": 0}
+        if not texts:
+            return stats
+        
+        # Within one batch the last record for a key wins
+        last = {key: position for position, key in enumerate(columns["key"])}
+        stats["duplicates"] = len(texts) - len(last)
+        
+        table = self.db.open_table(table_name)
+        existing = self._existing_hashes(table, list(last))
+        
+        keep = []
+        for key, position in last.items():
+            stored = existing.get(key)
+            if stored is None:
+                stats["inserted"] += 1
+            elif stored != columns["content_hash"][position]:
+                stats["updated"] += 1
+            else:
+                stats["unchanged"] += 1
+                continue
+            keep.append(position)
+        
+        if not keep:
+            return stats
+        
+        keep.sort()
+        columns = {name: [values[i] for i in keep] for name, values in columns.items()}
+        texts = [texts[i] for i in keep]
+        embeddings = self._embed(texts, batch_size)
+        (
+            table.merge_insert("key")
+            .when_matched_update_all()
+            .when_not_matched_insert_all()
+            .execute(self._to_arrow(table, columns, embeddings))
+        )
+        if CHUNK_DOCUMENTS:
+            self._delete_chunks(table_name, [key for key in columns["key"] if key in existing])
+            self._write_chunks(table_name, columns, texts, batch_size)
+        self.flush_cache()
+        self.maybe_reindex(table_name)
+        return stats
+    
+    def upsert_posts_batch(self, posts: Iterable[Dict], batch_size: int = DEFAULT_BATCH_SIZE) -> Dict[str, int]:
+        """Idempotently add posts, keyed by canonical URL (content hash when there is no URL).
+        
+        Posts whose content hash matches the stored row are skipped without
+        re-embedding; changed posts replace their row. Returns counts of
+        inserted, updated, unchanged and in-batch duplicate records.
+        """
+        if not self.db:
+            print("LanceDB not available")
+            return {}
         
         try:
-            # Initialize LanceDB
-            self.db = lancedb.connect(self.db_path)
-            
-            # Load embedding model
-            self.model = SentenceTransformer('all-MiniLM-L6-v2')
-            
-            # Create tables if they don't exist
-            self._ensure_tables()
-            
+            return self._upsert_batch("posts", posts, batch_size)
         except Exception as e:
-            print(f"Error initializing LanceDB: {e}")
-            self.db = None
-            self.model = None
+            print(f"Error upserting posts: {e}")
+            return {}
     
-    def _ensure_tables(self):
-        """Ensure required tables exist"""
+    def upsert_sources_batch(self, sources: Iterable[Dict], batch_size: int = DEFAULT_BATCH_SIZE) -> Dict[str, int]:
+        """Idempotently add sources, keyed by canonical URL (see upsert_posts_batch)"""
         if not self.db:
-            return
+            print("LanceDB not available")
+            return {}
         
-        # Posts table
-        if "posts" not in self.db.table_names():
-            schema = {
-                "id": "string",
-                "title": "string", 
-                "content": "string",
-                "url": "string",
-                "embedding": "float32[384]",
-                "metadata": "string"
-            }
-            self.db.create_table("posts", schema=schema)
-        
-        # Sources table
-        if "sources" not in self.db.table_names():
-            schema = {
-                "id": "string",
-                "url": "string",
-                "title": "string",
-                "content": "string", 
-                "embedding": "float32[384]",
-                "metadata": "string"
-            }
-            self.db.create_table("sources", schema=schema)
+        try:
+            return self._upsert_batch("sources", sources, batch_size)
+        except Exception as e:
+            print(f"Error upserting sources: {e}")
+            return {}
     
-    def add_post(self, post_id: str, title: str, content: str, url: str, metadata: Dict = None):
-        """Add a blog post to the vector database"""
-        if not self.db or not self.model:
+    def add_posts_batch(self, posts: Iterable[Dict], batch_size: int = DEFAULT_BATCH_SIZE) -> int:
+        """Add many blog posts in one commit.
+        
+        Each post is a dict with id, title, content, url and optional metadata.
+        Returns the number of posts written.
+        """
+        if not self.db:
             print("LanceDB not available")
-            return False
+            return 0
         
         try:
-            # Generate embedding
-            text = f"{title} {content}"
-            embedding = self.model.encode(text).tolist()
-            
-            # Prepare data
-            data = {
-                "id": post_id,
-                "title": title,
-                "content": content[:1000],  # Limit content length
-                "url": url,
-                "embedding": embedding,
-                "metadata": json.dumps(metadata or {})
-            }
-            
-            # Insert into table
-            table = self.db.open_table("posts")
-            table.add([data])
-            
-            return True
-            
+            return self._add_batch("posts", posts, batch_size)
+        except Exception as e:
+            print(f"Error adding posts: {e}")
+            return 0
+    
+    def add_sources_batch(self, sources: Iterable[Dict], batch_size: int = DEFAULT_BATCH_SIZE) -> int:
+        """Add many sources in one commit.
+        
+        Each source is a dict with id, url, title, content and optional metadata.
+        Returns the number of sources written.
+        """
+        if not self.db:
+            print("LanceDB not available")
+            return 0
+        
+        try:
+            return self._add_batch("sources", sources, batch_size)
         except Exception as e:
-            print(f"Error adding post: {e}")
-            return False
+            print(f"Error adding sources: {e}")
+            return 0
+    
+    def add_post(self, post_id: str, title: str, content: str, url: str, metadata: Dict = None):
+        """Add a blog post to the vector database"""
+        return self.add_posts_batch([{
+            "id": post_id,
+            "title": title,
+            "content": content,
+            "url": url,
+            "metadata": metadata
+        }]) == 1
     
     def add_source(self, source_id: str, url: str, title: str, content: str, metadata: Dict = None):
         """Add a source to the vector database"""
-        if not self.db or not self.model:
-            print("LanceDB not available")
-            return False
+        return self.add_sources_batch([{
+            "id": source_id,
+            "url": url,
+            "title": title,
+            "content": content,
+            "metadata": metadata
+        }]) == 1
+    
+    def index_status(self, table_name: str) -> Dict[str, Any]:
+        """Describe the vector index on a table"""
+        table = self.db.open_table(table_name)
+        status = {
+            "table": table_name,
+            "rows": table.count_rows(),
+            "indexed": False,
+            "index_type": None,
+            "unindexed_rows": None
+        }
+        names = [index.name for index in table.list_indices()]
+        if VECTOR_INDEX_NAME in names:
+            stats = table.index_stats(VECTOR_INDEX_NAME)
+            status["indexed"] = True
+            status["index_type"] = stats.index_type
+            status["unindexed_rows"] = stats.num_unindexed_rows
+        return status
+    
+    def create_index(self, table_name: str, index_type: str = DEFAULT_INDEX_TYPE,
+                     num_partitions: Optional[int] = None,
+                     num_sub_vectors: Optional[int] = None) -> Dict[str, Any]:
+        """Build (or rebuild) the ANN index on a table's embedding column.
+        
+        num_partitions defaults to roughly sqrt(rows) and num_sub_vectors to
+        EMBEDDING_DIM / 16; sub-vectors must divide EMBEDDING_DIM evenly.
+        """
+        if index_type not in INDEX_TYPES:
+            raise ValueError(f"Unknown index type {index_type!r}, expected one of {INDEX_TYPES}")
+        
+        table = self.db.open_table(table_name)
+        rows = table.count_rows()
+        if rows < MIN_INDEX_ROWS:
+            raise ValueError(f"Table {table_name} has {rows} rows, need at least {MIN_INDEX_ROWS} to train an index")
+        
+        if num_partitions is None:
+            num_partitions = max(1, min(int(rows ** 0.5), rows // MIN_INDEX_ROWS))
+        if num_sub_vectors is None:
+            num_sub_vectors = EMBEDDING_DIM // 16
+        if EMBEDDING_DIM % num_sub_vectors:
+            raise ValueError(f"num_sub_vectors must divide {EMBEDDING_DIM}, got {num_sub_vectors}")
+        
+        if index_type == "IVF_HNSW_SQ":
+            config = IvfHnswSq(distance_type="l2", num_partitions=num_partitions)
+        else:
+            config_class = IvfPq if index_type == "IVF_PQ" else IvfHnswPq
+            config = config_class(distance_type="l2", num_partitions=num_partitions,
+                                  num_sub_vectors=num_sub_vectors)
+        
+        start = time.perf_counter()
+        table.create_index("embedding", config=config, replace=True, name=VECTOR_INDEX_NAME)
+        return {
+            "table": table_name,
+            "rows": rows,
+            "index_type": index_type,
+            "num_partitions": num_partitions,
+            "num_sub_vectors": num_sub_vectors,
+            "seconds": time.perf_counter() - start
+        }
+    
+    def maybe_reindex(self, table_name: str, threshold: int = AUTO_REINDEX_ROWS) -> Optional[Dict[str, Any]]:
+        """Rebuild the index once at least threshold rows are not covered by it.
+        
+        Tables without an index get one as soon as they reach threshold rows.
+        Returns the create_index summary, or None when nothing was rebuilt.
+        """
+        if threshold <= 0:
+            return None
         
         try:
-            # Generate embedding
-            text = f"{title} {content}"
-            embedding = self.model.encode(text).tolist()
-            
-            # Prepare data
-            data = {
-                "id": source_id,
-                "url": url,
-                "title": title,
-                "content": content[:1000],  # Limit content length
-                "embedding": embedding,
-                "metadata": json.dumps(metadata or {})
-            }
-            
-            # Insert into table
-            table = self.db.open_table("sources")
-            table.add([data])
-            
-            return True
+            status = self.index_status(table_name)
+            if status["indexed"]:
+                if status["unindexed_rows"] < threshold:
+                    return None
+                index_type = status["index_type"]
+                if index_type not in INDEX_TYPES:
+                    index_type = DEFAULT_INDEX_TYPE
+            else:
+                if status["rows"] < max(threshold, MIN_INDEX_ROWS):
+                    return None
+                index_type = DEFAULT_INDEX_TYPE
             
+            print(f"Rebuilding {index_type} index on {table_name} ({status['rows']} rows)")
+            summary = self.create_index(table_name, index_type=index_type)
+            self.create_scalar_indexes(table_name)
+            return summary
         except Exception as e:
-            print(f"Error adding source: {e}")
-            return False
+            print(f"Error rebuilding index on {table_name}: {e}")
+            return None
+    
+    def _vector_search(self, table_name: str, query: str, limit: int,
+                       nprobes: Optional[int] = None,
+                       refine_factor: Optional[int] = None,
+                       where: Optional[str] = None, prefilter: bool = True):
+        """Build a vector query; nprobes/refine_factor only apply to indexed tables"""
+        query_embedding = self._embed([query])[0]
+        table = self.db.open_table(table_name)
+        builder = table.search(query_embedding, vector_column_name="embedding").limit(limit)
+        if where:
+            builder = builder.where(where, prefilter=prefilter)
+        if nprobes:
+            builder = builder.nprobes(nprobes)
+        if refine_factor:
+            builder = builder.refine_factor(refine_factor)
+        return builder
+    
+    def create_fts_index(self, table_name: str) -> List[str]:
+        """Build (or rebuild) BM25 full-text indexes over title and content"""
+        table = self.db.open_table(table_name)
+        for column in FTS_COLUMNS:
+            table.create_index(column, config=FTS(), replace=True)
+        self._fts_ready.add(table_name)
+        return list(FTS_COLUMNS)
+    
+    def _ensure_fts_index(self, table_name: str):
+        """Create missing full-text indexes the first time a table is keyword-searched"""
+        if table_name in self._fts_ready:
+            return
+        table = self.db.open_table(table_name)
+        existing = {index.name for index in table.list_indices()}
+        for column in FTS_COLUMNS:
+            if f"{column}_idx" not in existing:
+                table.create_index(column, config=FTS(), replace=True)
+        self._fts_ready.add(table_name)
+    
+    def _fts_search(self, table_name: str, query: str, limit: int, where: Optional[str] = None):
+        """Build a BM25 keyword query over title and content"""
+        self._ensure_fts_index(table_name)
+        table = self.db.open_table(table_name)
+        builder = table.search(query, query_type="fts", fts_columns=list(FTS_COLUMNS)).limit(limit)
+        if where:
+            builder = builder.where(where)
+        return builder
+    
+    def _with_score(self, results, score_column: str):
+        """Rename the engine's distance/BM25 column to a uniform "score" column"""
+        return results.rename_columns(["score" if name == score_column else name for name in results.column_names])
+    
+    def search_arrow(self, table_name: str, query: str, limit: int = 5,
+                     columns: Optional[List[str]] = None, mode: str = "vector",
+                     nprobes: Optional[int] = None, refine_factor: Optional[int] = None,
+                     fusion: str = "rrf", alpha: float = 0.5,
+                     where: Optional[str] = None, prefilter: bool = True,
+                     chunks: bool = False, chunk_scoring: str = "max") -> "pa.Table":
+        """Search one table and return the hits as an Arrow table.
+        
+        Only the requested columns (plus id and a "score" column) are read;
+        the embedding column is never returned unless asked for. where is a
+        SQL filter (see build_filter) pushed down to LanceDB; with prefilter
+        it runs before the vector search so limit rows always match.
+        
+        With chunks=True the query runs against document chunks and hits are
+        collapsed back to their parent rows (vector mode only).
+        """
+        if mode not in SEARCH_MODES:
+            raise ValueError(f"Unknown search mode {mode!r}, expected one of {SEARCH_MODES}")
+        
+        select = list(dict.fromkeys(["id"] + [c for c in (columns or DEFAULT_RESULT_COLUMNS) if c != "score"]))
+        
+        if chunks:
+            if mode != "vector":
+                raise ValueError("Chunk search only supports vector mode")
+            return self._search_chunks(table_name, query, limit, select, nprobes, refine_factor,
+                                       where, prefilter, chunk_scoring)
+        
+        if mode == "vector":
+            builder = self._vector_search(table_name, query, limit, nprobes, refine_factor, where, prefilter)
+            results = builder.select(select + ["_distance"]).to_arrow()
+            return self._with_score(results, "_distance")
+        
+        if mode == "fts":
+            results = self._fts_search(table_name, query, limit, where).select(select + ["_score"]).to_arrow()
+            return self._with_score(results, "_score")
+        
+        # Hybrid: run both retrievers concurrently over a wider candidate pool
+        candidates = limit * HYBRID_CANDIDATE_FACTOR
+        self._ensure_fts_index(table_name)
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            vector_future = pool.submit(
+                lambda: self._vector_search(table_name, query, candidates, nprobes, refine_factor, where, prefilter)
+                .select(select + ["_distance"]).to_arrow()
+            )
+            fts_future = pool.submit(
+                lambda: self._fts_search(table_name, query, candidates, where).select(select + ["_score"]).to_arrow()
+            )
+            vector_hits = vector_future.result()
+            fts_hits = fts_future.result()
+        
+        ranking = fuse_rankings(
+            list(zip(vector_hits["id"].to_pylist(), vector_hits["_distance"].to_pylist())),
+            list(zip(fts_hits["id"].to_pylist(), fts_hits["_score"].to_pylist())),
+            limit, fusion=fusion, alpha=alpha
+        )
+        
+        combined = pa.concat_tables([vector_hits.select(select), fts_hits.select(select)])
+        positions = {}
+        for position, doc_id in enumerate(combined["id"].to_pylist()):
+            positions.setdefault(doc_id, position)
+        results = combined.take(pa.array([positions[doc_id] for doc_id, _ in ranking], type=pa.int64()))
+        return results.append_column("score", pa.array([score for _, score in ranking], type=pa.float64()))
     
-    def search_posts(self, query: str, limit: int = 5) -> List[Dict]:
-        """Search posts by similarity"""
-        if not self.db or not self.model:
+    def _search_chunks(self, table_name: str, query: str, limit: int, select: List[str],
+                       nprobes: Optional[int], refine_factor: Optional[int],
+                       where: Optional[str], prefilter: bool, chunk_scoring: str) -> "pa.Table":
+        """Vector-search chunks and collapse them to documents.
+        
+        Chunk distances become cosine similarities (1 - d / 2 for squared L2
+        between unit vectors); a document scores the max or the sum of its
+        chunks' similarities, higher is better.
+        """
+        if chunk_scoring not in CHUNK_SCORING:
+            raise ValueError(f"Unknown chunk scoring {chunk_scoring!r}, expected one of {CHUNK_SCORING}")
+        
+        chunk_where = f"parent_table = '{table_name}'"
+        if where:
+            chunk_where += f" AND ({where})"
+        hits = (
+            self._vector_search(CHUNKS_TABLE, query, limit * CHUNK_CANDIDATE_FACTOR,
+                                nprobes, refine_factor, chunk_where, prefilter)
+            .select(["parent_key", "_distance"])
+            .to_arrow()
+        )
+        
+        scores = {}
+        for key, distance in zip(hits["parent_key"].to_pylist(), hits["_distance"].to_pylist()):
+            similarity = 1.0 - distance / 2.0
+            if chunk_scoring == "max":
+                scores[key] = max(scores.get(key, similarity), similarity)
+            else:
+                scores[key] = scores.get(key, 0.0) + similarity
+        ranked = sorted(scores, key=scores.get, reverse=True)[:limit]
+        
+        table = self.db.open_table(table_name)
+        if not ranked:
+            empty = pa.schema([table.schema.field(name) for name in select]).empty_table()
+            return empty.append_column("score", pa.array([], type=pa.float64()))
+        
+        quoted = ", ".join("'{}'".format(k.replace("'", "''")) for k in ranked)
+        parents = (
+            table.search().where(f"key IN ({quoted})")
+            .select(list(dict.fromkeys(select + ["key"])))
+            .limit(len(ranked) * 4)
+            .to_arrow()
+        )
+        positions = {}
+        for position, key in enumerate(parents["key"].to_pylist()):
+            positions.setdefault(key, position)
+        ranked = [key for key in ranked if key in positions]
+        results = parents.take(pa.array([positions[key] for key in ranked], type=pa.int64())).select(select)
+        return results.append_column("score", pa.array([scores[key] for key in ranked], type=pa.float64()))
+    
+    def search_results(self, table_name: str, query: str, limit: int = 5,
+                       columns: Optional[List[str]] = None, **kwargs) -> List[SearchResult]:
+        """Search one table and return lightweight SearchResult objects"""
+        return results_from_arrow(self.search_arrow(table_name, query, limit, columns, **kwargs))
+    
+    def search_posts(self, query: str, limit: int = 5,
+                     nprobes: Optional[int] = None,
+                     refine_factor: Optional[int] = None,
+                     mode: str = "vector", fusion: str = "rrf",
+                     alpha: float = 0.5, where: Optional[str] = None,
+                     prefilter: bool = True, chunks: bool = False,
+                     chunk_scoring: str = "max") -> List[Dict]:
+        """Search posts by similarity, keywords or both.
+        
+        score is the L2 distance in vector mode (lower is better), the BM25
+        score in fts mode and the fused score in hybrid mode (higher is better).
+        where filters on columns, e.g. build_filter(topic="AI", since="2026-01-01").
+        chunks=True searches every chunk of long documents and scores each
+        post by its best ("max") or combined ("sum") chunk similarity.
+        """
+        if not self.db:
             print("LanceDB not available")
             return []
         
         try:
-            # Generate query embedding
-            query_embedding = self.model.encode(query).tolist()
-            
-            # Search table
-            table = self.db.open_table("posts")
-            results = table.search(query_embedding).limit(limit).to_pandas()
-            
-            # Convert to list of dicts
-            posts = []
-            for _, row in results.iterrows():
-                posts.append({
-                    "id": row["id"],
-                    "title": row["title"],
-                    "content": row["content"],
-                    "url": row["url"],
-                    "score": row["_distance"],
-                    "metadata": json.loads(row["metadata"])
-                })
-            
-            return posts
-            
+            results = self.search_results("posts", query, limit, mode=mode, nprobes=nprobes,
+                                          refine_factor=refine_factor, fusion=fusion, alpha=alpha,
+                                          where=where, prefilter=prefilter,
+                                          chunks=chunks, chunk_scoring=chunk_scoring)
+            return [result.to_dict() for result in results]
         except Exception as e:
             print(f"Error searching posts: {e}")
             return []
     
-    def search_sources(self, query: str, limit: int = 5) -> List[Dict]:
-        """Search sources by similarity"""
-        if not self.db or not self.model:
+    def search_sources(self, query: str, limit: int = 5,
+                       nprobes: Optional[int] = None,
+                       refine_factor: Optional[int] = None,
+                       mode: str = "vector", fusion: str = "rrf",
+                       alpha: float = 0.5, where: Optional[str] = None,
+                       prefilter: bool = True, chunks: bool = False,
+                       chunk_scoring: str = "max") -> List[Dict]:
+        """Search sources by similarity, keywords or both (see search_posts for scores)"""
+        if not self.db:
             print("LanceDB not available")
             return []
         
         try:
-            # Generate query embedding
-            query_embedding = self.model.encode(query).tolist()
-            
-            # Search table
-            table = self.db.open_table("sources")
-            results = table.search(query_embedding).limit(limit).to_pandas()
-            
-            # Convert to list of dicts
-            sources = []
-            for _, row in results.iterrows():
-                sources.append({
-                    "id": row["id"],
-                    "url": row["url"],
-                    "title": row["title"],
-                    "content": row["content"],
-                    "score": row["_distance"],
-                    "metadata": json.loads(row["metadata"])
-                })
-            
-            return sources
-            
+            results = self.search_results("sources", query, limit, mode=mode, nprobes=nprobes,
+                                          refine_factor=refine_factor, fusion=fusion, alpha=alpha,
+                                          where=where, prefilter=prefilter,
+                                          chunks=chunks, chunk_scoring=chunk_scoring)
+            return [result.to_dict() for result in results]
         except Exception as e:
             print(f"Error searching sources: {e}")
             return []
@@ -205,15 +1104,22 @@ class VectorSearchClient:
         
         try:
             stats = {}
+            existing = list_table_names(self.db)
             
-            if "posts" in self.db.table_names():
+            if "posts" in existing:
                 posts_table = self.db.open_table("posts")
                 stats["posts"] = len(posts_table)
             
-            if "sources" in self.db.table_names():
+            if "sources" in existing:
                 sources_table = self.db.open_table("sources")
                 stats["sources"] = len(sources_table)
             
+            if CHUNKS_TABLE in existing:
+                stats["chunks"] = self.db.open_table(CHUNKS_TABLE).count_rows()
+            
+            if self.cache is not None:
+                stats["embedding_cache"] = self.cache.stats()
+            
             return stats
             
         except Exception as e:
@@ -0,0 +1,58 @@
+# agents/vector_search/results.py
+"""
+Lightweight search result objects built straight from Arrow columns
+"""
+import json
+from typing import Any, Dict, List, Optional
+
+RESULT_FIELDS = ("id", "title", "content", "url", "score", "metadata")
+
+class SearchResult:
+    """One search hit; metadata JSON is only parsed when first accessed"""
+
+    __slots__ = ("id", "title", "content", "url", "score", "_metadata_json", "_metadata")
+
+    def __init__(self, id: str, title: Optional[str] = None, content: Optional[str] = None,
+                 url: Optional[str] = None, score: Optional[float] = None,
+                 metadata_json: Optional[str] = None):
+        self.id = id
+        self.title = title
+        self.content = content
+        self.url = url
+        self.score = score
+        self._metadata_json = metadata_json
+        self._metadata = None
+
+    @property
+    def metadata(self) -> Dict[str, Any]:
+        if self._metadata is None:
+            self._metadata = json.loads(self._metadata_json) if self._metadata_json else {}
+        return self._metadata
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Dict in the shape search_posts/search_sources have always returned"""
+        return {
+            "id": self.id,
+            "title": self.title,
+            "content": self.content,
+            "url": self.url,
+            "score": self.score,
+            "metadata": self.metadata
+        }
+
+    def __repr__(self):
+        return f"SearchResult(id={self.id!r}, score={self.score!r}, title={self.title!r})"
+
+def results_from_arrow(table) -> List[SearchResult]:
+    """Build SearchResult objects column-wise from an Arrow table.
+
+    Missing columns (not selected by the caller) become None. The score is
+    read from a "score" column.
+    """
+    n = table.num_rows
+    names = set(table.column_names)
+    columns = [
+        table.column(name).to_pylist() if name in names else [None] * n
+        for name in RESULT_FIELDS
+    ]
+    return [SearchResult(*row) for row in zip(*columns)]
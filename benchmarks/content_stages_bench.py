@@ -0,0 +1,69 @@
+# benchmarks/content_stages_bench.py
+"""
+Post-draft latency of the content agent: critique, SEO and social stages run
+one after another vs concurrently, against a stub LLM with fixed delays
+Run: python -m benchmarks.content_stages_bench --delays 1.0 0.8 0.6
+"""
+import os
+import time
+import argparse
+
+DRAFT = "# Vector search for agents\n\n" + "Retrieval keeps agent answers grounded. " * 200
+
+class StubChat:
+    """Stands in for ChatOpenAI: sleeps a fixed delay chosen by the prompt, then answers"""
+    delays = {}
+
+    def __init__(self, **kwargs):
+        pass
+
+    def invoke(self, messages):
+        prompt = messages[-1]["content"]
+        for prefix, delay in self.delays.items():
+            if prompt.startswith(prefix):
+                time.sleep(delay)
+                break
+        text = '{"telegram": "t", "facebook": "f", "twitter": "x"}' if "social" in prompt.lower() else "ok"
+        return type("Message", (), {"content": text})()
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--delays", type=float, nargs=3, default=[1.0, 0.8, 0.6],
+                        metavar=("CRITIQUE", "SEO", "SOCIAL"), help="Stub LLM seconds per stage")
+    parser.add_argument("--timeout", type=float, default=5.0, help="Per-stage timeout")
+    parser.add_argument("--hang", type=float, default=30.0, help="Delay of the hung stage in the timeout run")
+    args = parser.parse_args()
+
+    os.environ.setdefault("OPENAI_API_KEY", "stub")
+    import langchain_openai
+    from agents.content_agent import main as content
+    from agents.content_agent.prompts import SELF_CRITIQUE_PROMPT, SEO_CHECKLIST_PROMPT, SOCIAL_MEDIA_PROMPT
+    from agents.llm_client import llm_client
+
+    langchain_openai.ChatOpenAI = StubChat
+    llm_client.cache = None  # every run must reach the stub
+    prefixes = [p.split("\n", 1)[0] for p in (SELF_CRITIQUE_PROMPT, SEO_CHECKLIST_PROMPT, SOCIAL_MEDIA_PROMPT)]
+    StubChat.delays = dict(zip(prefixes, args.delays))
+
+    print(f"stub delays: critique {args.delays[0]}s, seo {args.delays[1]}s, social {args.delays[2]}s\n")
+    print(f"{'mode':>12} {'seconds':>8}  stages")
+
+    start = time.perf_counter()
+    for stage, _ in content.POST_DRAFT_STAGES.values():
+        stage(DRAFT)
+    print(f"{'sequential':>12} {time.perf_counter() - start:>8.2f}")
+
+    results, latency = content.run_post_draft_stages(DRAFT, timeout=args.timeout)
+    stages = ", ".join(f"{name} {s['seconds']:.2f}s {s['status']}" for name, s in latency["stages"].items())
+    print(f"{'concurrent':>12} {latency['seconds']:>8.2f}  {stages}")
+
+    # One stage hangs: the others still finish and it falls back at the timeout
+    StubChat.delays[prefixes[2]] = args.hang
+    timeout = max(args.delays[:2]) + 0.5
+    results, latency = content.run_post_draft_stages(DRAFT, timeout=timeout)
+    stages = ", ".join(f"{name} {s['seconds']:.2f}s {s['status']}" for name, s in latency["stages"].items())
+    print(f"{'social hung':>12} {latency['seconds']:>8.2f}  {stages}")
+    print(f"\nhung stage fallback: {results['social']['twitter']!r}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+# benchmarks/context_packing_bench.py
+"""
+Draft prompt context: tokens and topic coverage of the old 300-character
+slices vs token-budgeted passage packing
+Run: python -m benchmarks.context_packing_bench --budgets 200 400 800
+"""
+import json
+import random
+import argparse
+
+TOPIC = "vector database latency for retrieval augmented generation"
+BOILERPLATE = [
+    "Accept cookies to continue. We use cookies to improve your experience and for analytics.",
+    "Home / Blog / Engineering / Subscribe to our newsletter for weekly updates.",
+    "Share this post on Twitter, LinkedIn and Facebook. Sign in to leave a comment.",
+]
+FILLER = (
+    "team company office event hiring culture customer story product launch "
+    "webinar partner award conference community update release roadmap"
+).split()
+FACTS = [
+    "Vector database query latency for retrieval augmented generation drops below 10 ms with an IVF-PQ index.",
+    "Retrieval latency dominates RAG response time when the vector index is not kept in memory.",
+    "Batching embedding queries cut vector search latency for retrieval augmented generation by 40 percent.",
+    "Approximate nearest neighbour search trades recall for lower latency in RAG vector stores.",
+    "Scalar filters pushed into the vector database keep retrieval latency flat as collections grow.",
+    "Caching query embeddings removes model latency from repeated retrieval augmented generation lookups.",
+]
+
+def synthetic_sources(rng, n):
+    """Pages that open with boilerplate and mention the topic only further down"""
+    sources = []
+    for i in range(n):
+        filler = [" ".join(rng.choices(FILLER, k=rng.randint(15, 30))) + "." for _ in range(8)]
+        position = rng.randint(2, len(filler))
+        paragraphs = BOILERPLATE + filler[:position] + [FACTS[i % len(FACTS)]] + filler[position:]
+        sources.append({
+            "url": f"https://example.com/post/{i}",
+            "title": f"Engineering blog post {i}",
+            "content": "\n".join(paragraphs)[:2000],
+            "fact": FACTS[i % len(FACTS)],
+        })
+    return sources
+
+def coverage(context, sources):
+    """Share of the sources whose key sentence made it into the context"""
+    facts = [s["fact"] for s in sources if s.get("fact")]
+    return sum(1 for fact in facts if fact in context) / len(facts) if facts else float("nan")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sources-json", help="A sources-*.json written to out/ (default: synthetic pages)")
+    parser.add_argument("--topic", default=TOPIC)
+    parser.add_argument("--sources", type=int, default=6, help="Synthetic sources to generate")
+    parser.add_argument("--budgets", type=int, nargs="+", default=[200, 400, 800])
+    args = parser.parse_args()
+
+    from agents.research_agent.context_packing import pack_context, sliced_context, token_counter
+
+    if args.sources_json:
+        with open(args.sources_json, encoding="utf-8") as f:
+            sources = [{**s, "content": s.get("content") or s.get("excerpt", "")} for s in json.load(f)]
+    else:
+        sources = synthetic_sources(random.Random(0), args.sources)
+    count_tokens = token_counter()
+
+    print(f"{len(sources)} sources, topic: {args.topic!r}\n")
+    print(f"{'context':>16} {'tokens':>7} {'passages':>9} {'coverage':>9}")
+    sliced = sliced_context(sources)
+    print(f"{'300-char slices':>16} {count_tokens(sliced):>7} {'-':>9} {coverage(sliced, sources):>9.0%}")
+    for budget in args.budgets:
+        context, stats = pack_context(args.topic, sources, budget=budget, count_tokens=count_tokens)
+        print(f"{'packed ' + str(budget):>16} {stats['tokens']:>7} "
+              f"{stats['passages']:>6}/{stats['candidates']:<2} {coverage(context, sources):>9.0%}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+# benchmarks/extraction_bench.py
+"""
+HTML extraction throughput (docs/sec) at different process-pool sizes
+Run: python -m benchmarks.extraction_bench --corpus saved_pages/ --workers 1 2 4
+"""
+import gzip
+import time
+import random
+import argparse
+from pathlib import Path
+
+WORDS = (
+    "agents research model retrieval latency benchmark pipeline article source "
+    "python extraction parser network cache embedding vector draft editor"
+).split()
+
+def synthetic_page(rng, paragraphs=60):
+    """A blog-like page: navigation and footer boilerplate around an article"""
+    nav = "".join(f'<li><a href="/section/{i}">Section {i}</a></li>' for i in range(40))
+    body = "\n".join(
+        f"<p>{' '.join(rng.choices(WORDS, k=rng.randint(40, 120)))}.</p>"
+        for _ in range(paragraphs)
+    )
+    footer = "".join(f'<a href="/tag/{w}">{w}</a> ' for w in WORDS * 5)
+    return (f"<html><head><title>{' '.join(rng.choices(WORDS, k=6))}</title></head><body>"
+            f"<nav><ul>{nav}</ul></nav><main><article><h1>Title</h1>{body}</article></main>"
+            f"<footer>{footer}</footer></body></html>")
+
+def load_corpus(directory):
+    """Saved pages: *.html / *.htm, or *.html.gz as written by the fetch cache"""
+    pages = []
+    for path in sorted(Path(directory).rglob("*")):
+        if path.name.endswith(".html.gz"):
+            with gzip.open(path, "rt", encoding="utf-8", errors="replace") as f:
+                pages.append(f.read())
+        elif path.suffix in (".html", ".htm"):
+            pages.append(path.read_text(encoding="utf-8", errors="replace"))
+    return pages
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--corpus", help="Directory of saved HTML pages (default: synthetic pages)")
+    parser.add_argument("--docs", type=int, default=200, help="Synthetic pages to generate")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--timeout", type=float, default=10.0)
+    args = parser.parse_args()
+
+    from agents.research_agent.extraction import ExtractionPool, guard_html
+
+    if args.corpus:
+        pages = load_corpus(args.corpus)
+    else:
+        rng = random.Random(0)
+        pages = [synthetic_page(rng) for _ in range(args.docs)]
+    skipped = sum(1 for html in pages if guard_html(html) is None)
+    size_mb = sum(len(html) for html in pages) / 1e6
+    print(f"{len(pages)} pages, {size_mb:.1f} MB of HTML ({skipped} over the size guard)\n")
+
+    print(f"{'workers':>8} {'seconds':>8} {'docs/s':>8} {'speedup':>8} {'timeouts':>9}")
+    baseline = None
+    for workers in args.workers:
+        with ExtractionPool(workers, timeout=args.timeout) as pool:
+            pool.map(pages[:workers])  # start the workers before timing
+            start = time.perf_counter()
+            texts = pool.map(pages)
+            elapsed = time.perf_counter() - start
+            timeouts = pool.timeouts
+        rate = len(pages) / elapsed
+        baseline = baseline or rate
+        print(f"{workers:>8} {elapsed:>8.2f} {rate:>8.1f} {rate / baseline:>7.2f}x {timeouts:>9}")
+
+    extracted = sum(1 for text in texts if text)
+    print(f"\n{extracted}/{len(pages)} pages produced text")
+
+if __name__ == "__main__":
+    main()
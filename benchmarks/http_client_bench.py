@@ -0,0 +1,113 @@
+# benchmarks/http_client_bench.py
+"""
+TLS handshakes and latency: one-off requests vs the shared pooled client,
+plus retry/backoff behaviour, against a local HTTPS server
+Run: python -m benchmarks.http_client_bench --requests 50
+"""
+import ssl
+import time
+import argparse
+import tempfile
+import threading
+import subprocess
+from pathlib import Path
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+class CountingHandler(BaseHTTPRequestHandler):
+    """Keep-alive handler that counts connections (= TLS handshakes) and requests"""
+    protocol_version = "HTTP/1.1"
+    wbufsize = 65536  # one write per response, so Nagle does not stall keep-alive
+    connections = 0
+    requests = 0
+    lock = threading.Lock()
+    flaky_calls = 0
+
+    def setup(self):
+        super().setup()
+        with self.lock:
+            CountingHandler.connections += 1
+
+    def do_GET(self):
+        with self.lock:
+            CountingHandler.requests += 1
+        status, headers = 200, {}
+        if self.path.startswith("/flaky"):
+            # Fail twice with 503 / 429 before succeeding
+            with self.lock:
+                CountingHandler.flaky_calls += 1
+                calls = CountingHandler.flaky_calls
+            if calls % 3 == 1:
+                status = 503
+            elif calls % 3 == 2:
+                status, headers = 429, {"Retry-After": "1"}
+        body = b'{"ok": true}' if status == 200 else b'{"error": "try again"}'
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+def self_signed_cert(directory: Path):
+    """Create a throwaway certificate for 127.0.0.1 with the openssl CLI"""
+    cert, key = directory / "cert.pem", directory / "key.pem"
+    subprocess.run(
+        ["openssl", "req", "-x509", "-newkey", "rsa:2048", "-nodes", "-days", "1",
+         "-keyout", str(key), "-out", str(cert), "-subj", "/CN=127.0.0.1",
+         "-addext", "subjectAltName=IP:127.0.0.1"],
+        check=True, capture_output=True
+    )
+    return cert, key
+
+def start_server(cert, key):
+    server = ThreadingHTTPServer(("127.0.0.1", 0), CountingHandler)
+    context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+    context.load_cert_chain(cert, key)
+    server.socket = context.wrap_socket(server.socket, server_side=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+def run(label, get, url, n):
+    before = (CountingHandler.connections, CountingHandler.requests)
+    start = time.perf_counter()
+    for _ in range(n):
+        get(url).raise_for_status()
+    elapsed = time.perf_counter() - start
+    handshakes = CountingHandler.connections - before[0]
+    served = CountingHandler.requests - before[1]
+    print(f"{label:>12} {served:>9} {handshakes:>11} {elapsed:>9.3f} {1000 * elapsed / n:>8.2f}")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=50)
+    args = parser.parse_args()
+
+    import requests
+    from agents.http_client import HttpClient
+
+    with tempfile.TemporaryDirectory() as tmp:
+        cert, key = self_signed_cert(Path(tmp))
+        server = start_server(cert, key)
+        base = f"https://127.0.0.1:{server.server_address[1]}"
+        client = HttpClient()
+        verify = str(cert)
+
+        print(f"{'client':>12} {'requests':>9} {'handshakes':>11} {'seconds':>9} {'ms/req':>8}")
+        run("requests.get", lambda url: requests.get(url, verify=verify, timeout=5), f"{base}/ok", args.requests)
+        run("HttpClient", lambda url: client.get(url, verify=verify), f"{base}/ok", args.requests)
+
+        print("\nRetry on 503 (jittered backoff) then 429 (Retry-After: 1):")
+        start = time.perf_counter()
+        response = client.get(f"{base}/flaky", verify=verify)
+        print(f"status {response.status_code} after {time.perf_counter() - start:.2f}s")
+
+        print()
+        client.print_metrics()
+        server.shutdown()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+# benchmarks/llm_cache_bench.py
+"""
+Content pipeline against a local OpenAI-compatible stub server: requests,
+connections and wall time of a cold run vs a re-run on the same outline
+(served from the LLM cache), and of a one-client-per-call baseline
+Run: python -m benchmarks.llm_cache_bench --delay 0.2
+"""
+import os
+import json
+import time
+import argparse
+import tempfile
+import threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+OUTLINE = """# Vector search for agents
+
+## Why retrieval matters
+- Grounding answers in sources
+
+## Indexing
+- Chunking and embeddings
+
+## Conclusion
+- What to try next
+"""
+
+class ChatHandler(BaseHTTPRequestHandler):
+    """POST /v1/chat/completions: answers after a fixed delay; counts requests and connections"""
+    protocol_version = "HTTP/1.1"
+    delay = 0.0
+    requests = 0
+    connections = set()
+    lock = threading.Lock()
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+        with self.lock:
+            ChatHandler.requests += 1
+            ChatHandler.connections.add(self.client_address)
+        time.sleep(self.delay)
+        prompt = body["messages"][-1]["content"]
+        text = ('{"telegram": "t", "facebook": "f", "twitter": "x"}' if "social media" in prompt
+                else f"# Response\n\nStub answer to a {len(prompt)} character prompt.")
+        payload = json.dumps({
+            "id": "chatcmpl-stub", "object": "chat.completion", "created": 0, "model": body.get("model"),
+            "choices": [{"index": 0, "message": {"role": "assistant", "content": text}, "finish_reason": "stop"}],
+            "usage": {"prompt_tokens": 1, "completion_tokens": 1, "total_tokens": 2},
+        }).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, *args):
+        pass
+
+def run_pipeline(content):
+    """outline -> draft -> concurrent critique / SEO / social, as content_agent.main does"""
+    draft = content.expand_draft(OUTLINE)
+    content.run_post_draft_stages(draft)
+
+def measure(name, run):
+    ChatHandler.requests = 0
+    ChatHandler.connections = set()
+    start = time.perf_counter()
+    run()
+    elapsed = time.perf_counter() - start
+    print(f"{name:>22} {ChatHandler.requests:>9} {len(ChatHandler.connections):>12} {elapsed:>8.2f}")
+    return ChatHandler.requests
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--delay", type=float, default=0.2, help="Stub LLM seconds per request")
+    args = parser.parse_args()
+    ChatHandler.delay = args.delay
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), ChatHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    cache_dir = tempfile.TemporaryDirectory()
+    os.environ["OPENAI_BASE_URL"] = f"http://127.0.0.1:{server.server_address[1]}/v1"
+    os.environ["OPENAI_API_KEY"] = "stub"
+    os.environ["LLM_CACHE_DIR"] = cache_dir.name
+
+    from langchain_openai import ChatOpenAI
+    from agents import llm_client as llm
+    from agents.content_agent import main as content
+
+    print(f"{'run':>22} {'requests':>9} {'connections':>12} {'seconds':>8}")
+
+    # Baseline: a fresh ChatOpenAI (and HTTP client) for every call, no cache
+    def fresh_client_complete(prompt, model=llm.LLM_MODEL, temperature=0.3, timeout=None, cache=True):
+        chat = ChatOpenAI(model=model, temperature=temperature, timeout=timeout)
+        return chat.invoke(llm.as_messages(prompt)).content
+    shared_complete = llm.llm_client.complete
+    llm.llm_client.complete = fresh_client_complete
+    measure("client per call", lambda: run_pipeline(content))
+    llm.llm_client.complete = shared_complete
+
+    measure("shared client, cold", lambda: run_pipeline(content))
+    hits = measure("shared client, re-run", lambda: run_pipeline(content))
+    print(f"\nre-run on the unchanged outline made {hits} requests "
+          f"({'OK' if hits == 0 else 'cache missed'}); {llm.llm_client.cache.count()} responses cached")
+
+    server.shutdown()
+    llm.llm_client.close()
+    cache_dir.cleanup()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+# benchmarks/research_fetch_bench.py
+"""
+Sequential vs concurrent research fetching against local stub servers
+Run: python -m benchmarks.research_fetch_bench --latency 0.3
+"""
+import os
+import json
+import time
+import argparse
+import tempfile
+import threading
+from pathlib import Path
+from urllib.parse import urlsplit, parse_qs
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+PAGE = """<html><head><title>{title}</title></head><body><article>
+<h1>{title}</h1>
+{paragraphs}
+</article></body></html>"""
+
+class StubHandler(BaseHTTPRequestHandler):
+    """Tavily-like /search endpoint plus article pages, each with injected latency"""
+    latency = 0.3
+    hosts = []
+    results_per_query = 4
+
+    def do_GET(self):
+        time.sleep(self.latency)
+        parts = urlsplit(self.path)
+        if parts.path == "/search":
+            query = parse_qs(parts.query).get("q", [""])[0]
+            results = [
+                {
+                    "title": f"{query} #{i}",
+                    "url": f"http://{self.hosts[(hash(query) + i) % len(self.hosts)]}/page/{abs(hash(query))}-{i}"
+                }
+                for i in range(self.results_per_query)
+            ]
+            body = json.dumps({"results": results}).encode("utf-8")
+            content_type = "application/json"
+        else:
+            paragraphs = "\n".join(
+                f"<p>Paragraph {i} of {parts.path}: agents fetch sources concurrently so the "
+                f"research stage waits for the slowest request rather than the sum of all.</p>"
+                for i in range(8)
+            )
+            body = PAGE.format(title=parts.path, paragraphs=paragraphs).encode("utf-8")
+            content_type = "text/html"
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def handle(self):
+        try:
+            super().handle()
+        except (BrokenPipeError, ConnectionResetError):
+            pass  # client gave up at its deadline
+
+    def log_message(self, *args):
+        pass
+
+def start_servers(count, latency):
+    """One stub server per loopback address so per-host limits apply per server"""
+    StubHandler.latency = latency
+    servers = []
+    for i in range(count):
+        server = ThreadingHTTPServer((f"127.0.0.{i + 1}", 0), StubHandler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        servers.append(server)
+    StubHandler.hosts = [f"127.0.0.{i + 1}:{s.server_address[1]}" for i, s in enumerate(servers)]
+    return servers
+
+def sequential(queries, per_query):
+    """The original loop: one search, then its fetches, one at a time"""
+    from agents.research_agent.main import search_tavily, fetch_text
+    sources = []
+    for query in queries:
+        for result in search_tavily(query)[:per_query]:
+            content = fetch_text(result["url"])
+            if content:
+                sources.append(result["url"])
+    return sources
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--latency", type=float, default=0.3, help="Seconds added to every stub response")
+    parser.add_argument("--queries", type=int, default=3)
+    parser.add_argument("--per-query", type=int, default=2)
+    parser.add_argument("--hosts", type=int, default=3)
+    parser.add_argument("--per-host", type=int, default=2)
+    args = parser.parse_args()
+
+    servers = start_servers(args.hosts, args.latency)
+    os.environ["TAVILY_API_KEY"] = "stub"
+    os.environ["TAVILY_ENDPOINT"] = f"http://{StubHandler.hosts[0]}/search"
+    from agents.research_agent import main as research
+    from agents.research_agent.fetch_cache import FetchCache, SearchCache
+    from agents.research_agent.fetch_pipeline import gather_sources
+    
+    # Every mode starts from empty fetch and search caches so all requests really
+    # hit the stub servers, and stub results never reach the real .cache/research
+    cache_root = tempfile.TemporaryDirectory()
+    def fresh_cache(name):
+        research.fetch_cache = FetchCache(Path(cache_root.name) / name)
+        research.search_cache = SearchCache(Path(cache_root.name) / name / "search.json")
+
+    queries = [f"topic query {i}" for i in range(args.queries)]
+    expected = args.queries * (1 + args.per_query) * args.latency
+    print(f"{args.queries} queries x {args.per_query} fetches, {args.latency:.2f}s latency per request "
+          f"(sequential lower bound {expected:.2f}s)\n")
+    print(f"{'mode':>22} {'seconds':>8} {'sources':>8} {'abandoned':>10}")
+
+    fresh_cache("sequential")
+    start = time.perf_counter()
+    found = sequential(queries, args.per_query)
+    print(f"{'sequential':>22} {time.perf_counter() - start:>8.2f} {len(found):>8} {'-':>10}")
+
+    fresh_cache("concurrent")
+    sources, stats = gather_sources(queries, per_query=args.per_query, per_host=args.per_host)
+    print(f"{'concurrent':>22} {stats['seconds']:>8.2f} {len(sources):>8} {stats['timed_out']:>10}")
+
+    # A deadline shorter than search + fetch returns partial results instead of waiting
+    deadline = args.latency * 1.5
+    fresh_cache("deadline")
+    sources, stats = gather_sources(queries, per_query=args.per_query, per_host=args.per_host, deadline=deadline)
+    print(f"{f'deadline {deadline:.2f}s':>22} {stats['seconds']:>8.2f} {len(sources):>8} {stats['timed_out']:>10}")
+
+    for server in servers:
+        server.shutdown()
+    cache_root.cleanup()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+# benchmarks/section_expansion_bench.py
+"""
+Draft expansion wall time and output length: one DRAFT_EXPANSION_PROMPT call vs
+section-parallel expansion + stitch, against a deterministic stub LLM whose
+latency is time-to-first-token plus output tokens / throughput, and whose
+single-call output is capped at the model's output token limit
+Run: python -m benchmarks.section_expansion_bench --sections 8 --concurrency 1 4 8
+"""
+import os
+import re
+import json
+import time
+import random
+import hashlib
+import argparse
+import threading
+
+WORDS = (
+    "retrieval agents index latency embeddings chunking evaluation pipeline cache "
+    "throughput vector model prompt context source draft quality recall"
+).split()
+TOKENS_PER_WORD = 1.3
+
+class StubLLM:
+    """Deterministic text per prompt; sleeps ttft + tokens / tokens_per_second"""
+
+    def __init__(self, ttft, tokens_per_second, section_words, max_output_tokens):
+        self.ttft = ttft
+        self.tokens_per_second = tokens_per_second
+        self.section_words = section_words
+        self.max_words = int(max_output_tokens / TOKENS_PER_WORD)
+        self.calls = 0
+        self.lock = threading.Lock()
+
+    def text(self, prompt, words):
+        rng = random.Random(hashlib.sha256(prompt.encode("utf-8")).hexdigest())
+        return " ".join(rng.choice(WORDS) for _ in range(words)) + "."
+
+    def complete(self, prompt, model=None, temperature=0.3, timeout=None, cache=True):
+        with self.lock:
+            self.calls += 1
+        if prompt.startswith("Expand one section"):
+            heading = prompt.split("## Section to Write:\n", 1)[1].splitlines()[0]
+            words = self.section_words
+            reply = f"{heading}\n\n{self.text(prompt, words)}"
+        elif prompt.startswith("The blog post"):
+            count = int(re.search(r"exactly (\d+) strings", prompt).group(1))
+            words = 25 * count
+            reply = json.dumps([self.text(f"{prompt}{i}", 25) for i in range(count)])
+        else:
+            # One call for the whole post: every section, until the output limit cuts it off
+            headings = re.findall(r"^## .+$", prompt.split("## Outline:")[1].split("## Requirements:")[0], re.MULTILINE)
+            words = min(self.section_words * len(headings), self.max_words)
+            reply = self.text(prompt, words)
+        time.sleep(self.ttft + words * TOKENS_PER_WORD / self.tokens_per_second)
+        return reply
+
+def make_outline(sections):
+    lines = ["# Retrieval for agents", "", "Why retrieval quality decides agent quality.", ""]
+    for i in range(sections):
+        lines += [f"## Part {i + 1}: {random.Random(i).choice(WORDS)}", "- Key point", "- Example", ""]
+    return "\n".join(lines)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sections", type=int, default=8)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 4, 8])
+    parser.add_argument("--section-words", type=int, default=300, help="Words the stub writes per section")
+    parser.add_argument("--ttft", type=float, default=0.3, help="Stub seconds to first token")
+    parser.add_argument("--tokens-per-second", type=float, default=1000.0)
+    parser.add_argument("--max-output-tokens", type=int, default=4096)
+    args = parser.parse_args()
+
+    os.environ.setdefault("OPENAI_API_KEY", "stub")
+    from agents.llm_client import llm_client
+    from agents.content_agent import main as content
+
+    stub = StubLLM(args.ttft, args.tokens_per_second, args.section_words, args.max_output_tokens)
+    llm_client.complete = stub.complete
+    outline = make_outline(args.sections)
+
+    print(f"{args.sections} sections, stub: {args.ttft}s to first token, {args.tokens_per_second:.0f} tokens/s, "
+          f"{args.section_words} words per section, {args.max_output_tokens} max output tokens\n")
+    print(f"{'mode':>18} {'calls':>6} {'seconds':>8} {'words':>7}")
+
+    def run(name, expand):
+        stub.calls = 0
+        start = time.perf_counter()
+        draft = expand()
+        elapsed = time.perf_counter() - start
+        print(f"{name:>18} {stub.calls:>6} {elapsed:>8.2f} {len(draft.split()):>7}")
+
+    run("single call", lambda: content.expand_draft(outline))
+    for concurrency in args.concurrency:
+        run(f"sections x{concurrency}", lambda: content.expand_draft_sections(outline, concurrency=concurrency))
+    run(f"x{args.concurrency[-1]}, no stitch",
+        lambda: content.expand_draft_sections(outline, concurrency=args.concurrency[-1], stitch=False))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+# benchmarks/seo_bench.py
+"""
+Bulk local SEO analysis: posts per second over a synthetic archive of
+Markdown posts, and how much of each post the old draft[:3000] LLM prompt saw
+Run: python -m benchmarks.seo_bench --posts 500 --words 2000
+"""
+import time
+import random
+import argparse
+import tempfile
+from pathlib import Path
+
+WORDS = (
+    "retrieval agents index latency embeddings chunking evaluation pipeline cache "
+    "throughput vector model prompt context source draft quality recall the a of and to in"
+).split()
+
+def make_post(i, words):
+    rng = random.Random(i)
+    lines = ["---", f"title: Vector search for agents, part {i}",
+             "description: " + " ".join(rng.choice(WORDS) for _ in range(25)), "keywords: [vector search]", "---", ""]
+    written = 0
+    section = 0
+    while written < words:
+        section += 1
+        lines += [f"## Section {section}", ""]
+        for _ in range(4):
+            sentence = " ".join(rng.choice(WORDS) for _ in range(40))
+            if rng.random() < 0.3:
+                sentence += f" See [related post](/posts/{rng.randint(1, 500)}) and [docs](https://lancedb.com/docs)."
+            if rng.random() < 0.1:
+                sentence += f" ![figure {section}](img/{i}-{section}.png)"
+            lines += [sentence, ""]
+            written += 40
+        if rng.random() < 0.3:
+            lines += ["```python", "print('vector search')", "```", ""]
+    return "\n".join(lines)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--posts", type=int, default=500)
+    parser.add_argument("--words", type=int, default=2000, help="Words per post")
+    args = parser.parse_args()
+
+    from agents.content_agent.seo import analyze_dir, status
+
+    with tempfile.TemporaryDirectory() as directory:
+        chars = 0
+        for i in range(args.posts):
+            text = make_post(i, args.words)
+            chars += len(text)
+            (Path(directory) / f"post-{i:04d}.md").write_text(text, encoding="utf-8")
+
+        start = time.perf_counter()
+        reports = analyze_dir(Path(directory))
+        elapsed = time.perf_counter() - start
+
+    failing = sum(1 for r in reports if status(r) == "fail")
+    print(f"{len(reports)} posts, {chars / len(reports):.0f} chars each on average")
+    print(f"local analysis: {elapsed:.2f}s, {len(reports) / elapsed:.0f} posts/s, "
+          f"{chars / elapsed / 1e6:.1f} MB/s ({failing} posts failing a check)")
+    print(f"old LLM checklist: 1 request per post, saw the first 3000 chars "
+          f"({min(1.0, 3000 * len(reports) / chars):.0%} of the archive)")
+
+if __name__ == "__main__":
+    main()
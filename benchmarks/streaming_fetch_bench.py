@@ -0,0 +1,120 @@
+# benchmarks/streaming_fetch_bench.py
+"""
+Bytes transferred and peak memory per source: a full-body requests.get plus
+extraction (the old fetch_text) vs the streaming fetch_text with the same
+extractor, against a local server with oversized and binary bodies
+Run: python -m benchmarks.streaming_fetch_bench
+"""
+import os
+import time
+import argparse
+import tempfile
+import threading
+import tracemalloc
+from pathlib import Path
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+CHUNK = 64 * 1024
+ARTICLE = ("<p>Streaming fetch keeps memory and bandwidth bounded by reading only "
+           "what the extractor can use.</p>\n") * 200
+
+class BodyHandler(BaseHTTPRequestHandler):
+    """Serves normal, oversized, chunked-endless and binary bodies; counts bytes sent"""
+    sent = {}
+    sizes = {}
+    lock = threading.Lock()
+
+    def do_GET(self):
+        path = self.path
+        if path == "/article":
+            body, content_type = ARTICLE.encode("utf-8"), "text/html; charset=utf-8"
+            self._send(content_type, len(body), [body])
+            return
+        if path == "/big-html":
+            # 50 MB declared: refused from Content-Length alone
+            size = self.sizes["big"]
+            self._send("text/html", size, self._filler(size, b"<p>big page</p>\n"))
+        elif path == "/endless-html":
+            # No Content-Length, far more body than anyone should read
+            self._send("text/html", None, self._filler(self.sizes["big"], b"<p>more</p>\n"))
+        elif path == "/paper.pdf":
+            self._send("application/pdf", self.sizes["binary"], self._filler(self.sizes["binary"], b"%PDF\x00\xff"))
+        elif path == "/video":
+            self._send("video/mp4", self.sizes["binary"], self._filler(self.sizes["binary"], b"\x00\x01\x02"))
+
+    def _filler(self, size, unit):
+        block = (unit * (CHUNK // len(unit) + 1))[:CHUNK]
+        for start in range(0, size, CHUNK):
+            yield block[:min(CHUNK, size - start)]
+
+    def _send(self, content_type, length, chunks):
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        if length is not None:
+            self.send_header("Content-Length", str(length))
+        self.end_headers()
+        try:
+            for chunk in chunks:
+                self.wfile.write(chunk)
+                with self.lock:
+                    self.sent[self.path] = self.sent.get(self.path, 0) + len(chunk)
+        except (BrokenPipeError, ConnectionResetError):
+            pass  # the client stopped reading
+
+    def log_message(self, *args):
+        pass
+
+def measure(fetch, url):
+    """Run fetch(url) returning (text length, outcome, peak MB, bytes served)"""
+    path = "/" + url.split("/", 3)[-1]
+    BodyHandler.sent.pop(path, None)
+    tracemalloc.start()
+    try:
+        text = fetch(url)
+        outcome = "ok" if text else "empty"
+    except Exception as e:
+        text, outcome = "", type(e).__name__
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    time.sleep(0.2)  # let the server notice the closed connection
+    served = BodyHandler.sent.get(path, 0)
+    return len(text), outcome, peak / 1e6, served / 1e6
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--big-mb", type=int, default=50, help="Size of the oversized HTML bodies")
+    parser.add_argument("--binary-mb", type=int, default=20, help="Size of the PDF / video bodies")
+    args = parser.parse_args()
+    BodyHandler.sizes = {"big": args.big_mb * 1024 * 1024, "binary": args.binary_mb * 1024 * 1024}
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), BodyHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base = f"http://127.0.0.1:{server.server_address[1]}"
+
+    cache_dir = tempfile.TemporaryDirectory()
+    os.environ["RESEARCH_CACHE_DIR"] = cache_dir.name
+    import requests
+    from agents.research_agent import main as research
+    from agents.research_agent.extraction import extract_text
+    from agents.research_agent.fetch_cache import FetchCache
+
+    # Both clients run the same extraction; only how the body is read differs
+    fetchers = {
+        "get+extract": lambda url: extract_text(requests.get(url, timeout=30).text),
+        "fetch_text": research.fetch_text,
+    }
+    extract_text(ARTICLE)  # import trafilatura before measuring, not inside the first fetch
+    print(f"byte budget {research.MAX_FETCH_BYTES / 1e6:.1f} MB, bodies over "
+          f"{research.SKIP_HTML_CHARS / 1e6:.0f} MB refused from headers\n")
+    print(f"{'path':>14} {'client':>13} {'outcome':>8} {'chars':>9} {'peak MB':>8} {'sent MB':>8}")
+    for path in ("/article", "/big-html", "/endless-html", "/paper.pdf", "/video"):
+        for name, fetch in fetchers.items():
+            research.fetch_cache = FetchCache(Path(cache_dir.name) / name.replace(".", "_"))
+            chars, outcome, peak, served = measure(fetch, base + path)
+            print(f"{path:>14} {name:>13} {outcome:>8} {chars:>9} {peak:>8.1f} {served:>8.1f}")
+
+    server.shutdown()
+    cache_dir.cleanup()
+
+if __name__ == "__main__":
+    main()
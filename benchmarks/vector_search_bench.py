@@ -0,0 +1,371 @@
+# benchmarks/vector_search_bench.py
+"""
+Benchmarks for the vector search client
+Run: python -m benchmarks.vector_search_bench ingest
+"""
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import tempfile
+import subprocess
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+WORDS = (
+    "agent model vector search embedding research draft source index "
+    "latency throughput python arrow lance batch query topic paper"
+).split()
+
+def synthetic_records(n, prefix="bench", seed=0):
+    """Generate n fake source records"""
+    rng = random.Random(seed)
+    for i in range(n):
+        yield {
+            "id": f"{prefix}-{i}",
+            "url": f"https://example.com/{prefix}/{i}",
+            "title": " ".join(rng.choices(WORDS, k=6)),
+            "content": " ".join(rng.choices(WORDS, k=200)),
+            "metadata": {"topic": "benchmark", "timestamp": "19700101-0000"}
+        }
+
+def bench_ingest(args):
+    """Compare per-record add_source with add_sources_batch"""
+    from agents.vector_search.lancedb_client import VectorSearchClient
+    
+    print(f"{'records':>8} {'mode':>10} {'seconds':>9} {'records/s':>10}")
+    for n in args.sizes:
+        modes = ["batch"]
+        if n <= args.max_single:
+            modes.insert(0, "single")
+        for mode in modes:
+            with tempfile.TemporaryDirectory() as tmp:
+                client = VectorSearchClient(db_path=tmp)
+                records = list(synthetic_records(n))
+                start = time.perf_counter()
+                if mode == "single":
+                    for r in records:
+                        client.add_source(r["id"], r["url"], r["title"], r["content"], r["metadata"])
+                else:
+                    client.add_sources_batch(records, batch_size=args.batch_size)
+                elapsed = time.perf_counter() - start
+                print(f"{n:>8} {mode:>10} {elapsed:>9.3f} {n / elapsed:>10.1f}")
+
+STARTUP_PROBE = """
+import sys, json, time
+t0 = time.perf_counter()
+from agents.vector_search import cli
+t1 = time.perf_counter()
+sys.argv = ["cli"] + json.loads(sys.argv[1])
+try:
+    cli.main()
+except SystemExit:
+    pass
+t2 = time.perf_counter()
+print("__BENCH__" + json.dumps({"import": t1 - t0, "command": t2 - t1, "torch": "torch" in sys.modules}))
+"""
+
+STARTUP_COMMANDS = {
+    "stats": ["stats"],
+    "add": ["add"],
+    "search": ["search", "--query", "vector databases"],
+    "index": ["index", "--auto"],  # index status (no rebuild below the threshold)
+    "migrate": ["migrate"],
+    "compact": ["compact"]
+}
+
+def bench_startup(args):
+    """Import and first-command latency of each CLI subcommand in a fresh interpreter"""
+    env = dict(os.environ, PYTHONPATH=str(REPO_ROOT))
+    print(f"{'command':>8} {'wall':>8} {'import':>8} {'command':>8} {'torch':>6}")
+    for name, argv in STARTUP_COMMANDS.items():
+        with tempfile.TemporaryDirectory() as tmp:
+            start = time.perf_counter()
+            proc = subprocess.run(
+                [sys.executable, "-c", STARTUP_PROBE, json.dumps(argv)],
+                cwd=tmp, env=env, capture_output=True, text=True
+            )
+            wall = time.perf_counter() - start
+        lines = [l for l in proc.stdout.splitlines() if l.startswith("__BENCH__")]
+        if not lines:
+            print(f"{name:>8} failed: {proc.stderr.strip()[-200:]}")
+            continue
+        result = json.loads(lines[-1][len("__BENCH__"):])
+        print(f"{name:>8} {wall:>8.3f} {result['import']:>8.3f} {result['command']:>8.3f} {str(result['torch']):>6}")
+
+def _clustered_vectors(rng, centroids, n, noise=0.35):
+    """Unit vectors scattered around random centroids, like real topic clusters"""
+    import numpy as np
+    labels = rng.integers(0, len(centroids), size=n)
+    vectors = centroids[labels] + noise * rng.standard_normal((n, centroids.shape[1])).astype(np.float32)
+    vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+    return vectors.astype(np.float32)
+
+def bench_ann(args):
+    """Recall@k and latency of the ANN index against exact search"""
+    import numpy as np
+    from agents.vector_search.lancedb_client import VectorSearchClient, EMBEDDING_DIM
+    
+    rng = np.random.default_rng(0)
+    centroids = rng.standard_normal((1000, EMBEDDING_DIM)).astype(np.float32)
+    
+    for n in args.sizes:
+        with tempfile.TemporaryDirectory() as tmp:
+            client = VectorSearchClient(db_path=tmp)
+            table = client.db.open_table("sources")
+            
+            start = time.perf_counter()
+            for offset in range(0, n, args.chunk):
+                size = min(args.chunk, n - offset)
+                records = [{"id": f"doc-{offset + i}", "url": f"https://example.com/doc-{offset + i}",
+                            "title": f"doc-{offset + i}", "content": ""} for i in range(size)]
+                columns, _ = client._prepare("sources", records)
+                table.add(client._to_arrow(table, columns, _clustered_vectors(rng, centroids, size)))
+            print(f"\n{n} rows loaded in {time.perf_counter() - start:.1f}s")
+            
+            queries = _clustered_vectors(rng, centroids, args.queries)
+            
+            def run(configure):
+                hits, latencies = [], []
+                for q in queries:
+                    builder = configure(table.search(q, vector_column_name="embedding").limit(args.k).select(["id", "_distance"]))
+                    t = time.perf_counter()
+                    hits.append(builder.to_arrow()["id"].to_pylist())
+                    latencies.append(time.perf_counter() - t)
+                return hits, latencies
+            
+            exact, exact_lat = run(lambda b: b.bypass_vector_index())
+            print(f"{'config':>24} {'recall@' + str(args.k):>10} {'p50 ms':>8} {'p95 ms':>8}")
+            
+            def report(label, hits, latencies):
+                recall = np.mean([len(set(h) & set(e)) / args.k for h, e in zip(hits, exact)])
+                p50, p95 = np.percentile(latencies, [50, 95]) * 1000
+                print(f"{label:>24} {recall:>10.3f} {p50:>8.2f} {p95:>8.2f}")
+            
+            report("exact", exact, exact_lat)
+            
+            summary = client.create_index("sources", index_type=args.index_type,
+                                          num_partitions=args.partitions,
+                                          num_sub_vectors=args.sub_vectors)
+            print(f"{summary['index_type']} index: {summary['num_partitions']} partitions, "
+                  f"{summary['num_sub_vectors']} sub-vectors, built in {summary['seconds']:.1f}s")
+            table = client.db.open_table("sources")  # pick up the new index version
+            
+            for nprobes in args.nprobes:
+                for refine in args.refine_factors:
+                    def configure(b, nprobes=nprobes, refine=refine):
+                        b = b.nprobes(nprobes)
+                        return b.refine_factor(refine) if refine else b
+                    hits, latencies = run(configure)
+                    report(f"nprobes={nprobes} refine={refine or '-'}", hits, latencies)
+
+def bench_hybrid(args):
+    """Latency and hit rate of vector, fts and hybrid search on exact-term queries"""
+    import numpy as np
+    from agents.vector_search.lancedb_client import VectorSearchClient
+    
+    rng = random.Random(1)
+    libraries = [f"{rng.choice(WORDS)}{rng.choice(WORDS)}-{i}" for i in range(args.docs)]
+    records = []
+    for i, record in enumerate(synthetic_records(args.docs, prefix="hybrid")):
+        # Every document mentions one paper ID and one library name nobody else does
+        record["content"] = f"{record['content']} arXiv:2401.{i:05d} uses {libraries[i]}"
+        records.append(record)
+    
+    queries = []
+    for i in rng.sample(range(args.docs), args.queries):
+        term = f"2401.{i:05d}" if len(queries) % 2 else libraries[i]
+        queries.append((f"{term} {' '.join(rng.choices(WORDS, k=3))}", records[i]["id"]))
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        client = VectorSearchClient(db_path=tmp)
+        client.add_sources_batch(records)
+        client.create_fts_index("sources")
+        
+        print(f"{'mode':>16} {'hit@' + str(args.k):>7} {'MRR':>6} {'p50 ms':>8} {'p95 ms':>8}")
+        for mode, fusion in (("vector", "rrf"), ("fts", "rrf"), ("hybrid", "rrf"), ("hybrid", "weighted")):
+            client.search_sources(queries[0][0], args.k, mode=mode, fusion=fusion)  # warm up
+            ranks, latencies = [], []
+            for query, expected in queries:
+                start = time.perf_counter()
+                hits = client.search_sources(query, args.k, mode=mode, fusion=fusion)
+                latencies.append(time.perf_counter() - start)
+                ids = [hit["id"] for hit in hits]
+                ranks.append(ids.index(expected) + 1 if expected in ids else None)
+            hit_rate = sum(r is not None for r in ranks) / len(ranks)
+            mrr = sum(1 / r for r in ranks if r) / len(ranks)
+            p50, p95 = np.percentile(latencies, [50, 95]) * 1000
+            label = mode if mode != "hybrid" else f"hybrid/{fusion}"
+            print(f"{label:>16} {hit_rate:>7.3f} {mrr:>6.3f} {p50:>8.2f} {p95:>8.2f}")
+
+def _result_table(n, dim=384):
+    """Arrow table shaped like a raw LanceDB search result (all columns + _distance)"""
+    import numpy as np
+    import pyarrow as pa
+    records = list(synthetic_records(n, prefix="result"))
+    vectors = np.random.default_rng(0).standard_normal((n, dim)).astype(np.float32)
+    return pa.table({
+        "id": [r["id"] for r in records],
+        "url": [r["url"] for r in records],
+        "title": [r["title"] for r in records],
+        "content": [r["content"] for r in records],
+        "embedding": pa.FixedSizeListArray.from_arrays(pa.array(vectors.reshape(-1)), dim),
+        "metadata": [json.dumps(r["metadata"]) for r in records],
+        "_distance": pa.array(np.random.default_rng(1).random(n), type=pa.float32())
+    })
+
+def bench_results(args):
+    """Cost of turning a search result into Python objects"""
+    from agents.vector_search.results import results_from_arrow
+    
+    def legacy(table):
+        rows = []
+        for _, row in table.to_pandas().iterrows():
+            rows.append({
+                "id": row["id"],
+                "title": row["title"],
+                "content": row["content"],
+                "url": row["url"],
+                "score": row["_distance"],
+                "metadata": json.loads(row["metadata"])
+            })
+        return rows
+    
+    def projected(table):
+        # What search_arrow hands back: no embedding column, uniform score column
+        columns = ["id", "title", "content", "url", "metadata", "_distance"]
+        return table.select(columns).rename_columns(columns[:-1] + ["score"])
+    
+    cases = {
+        "to_pandas+iterrows": legacy,
+        "arrow->SearchResult": lambda t: results_from_arrow(projected(t)),
+        "arrow->dict adapter": lambda t: [r.to_dict() for r in results_from_arrow(projected(t))],
+        "arrow (id,score)": lambda t: results_from_arrow(projected(t).select(["id", "score"]))
+    }
+    
+    print(f"{'limit':>7} {'path':>22} {'ms':>10} {'us/row':>8}")
+    for n in args.limits:
+        table = _result_table(n)
+        for name, convert in cases.items():
+            repeats = max(1, args.rows // n)
+            start = time.perf_counter()
+            for _ in range(repeats):
+                convert(table)
+            elapsed = (time.perf_counter() - start) / repeats
+            print(f"{n:>7} {name:>22} {elapsed * 1000:>10.3f} {elapsed / n * 1e6:>8.2f}")
+
+def bench_dedup(args):
+    """Table size and query latency before and after compacting a corpus seeded with duplicates"""
+    import numpy as np
+    from agents.vector_search.lancedb_client import VectorSearchClient
+    
+    unique = list(synthetic_records(args.docs, prefix="dup"))
+    queries = [" ".join(random.Random(i).choices(WORDS, k=4)) for i in range(args.queries)]
+    
+    def measure(client):
+        client.search_sources(queries[0], 10)  # warm up
+        latencies = []
+        for query in queries:
+            start = time.perf_counter()
+            client.search_sources(query, 10)
+            latencies.append(time.perf_counter() - start)
+        return np.percentile(latencies, 50) * 1000
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        client = VectorSearchClient(db_path=tmp)
+        # Old behaviour: every weekly run appends the same URLs under new ids
+        for run in range(args.copies):
+            client.add_sources_batch(dict(r, id=f"run{run}-{r['id']}") for r in unique)
+        
+        p50_before = measure(client)
+        result = client.compact("sources")
+        p50_after = measure(client)
+        
+        print(f"{'':>10} {'rows':>8} {'MB':>8} {'p50 ms':>8}")
+        print(f"{'before':>10} {result['rows_before']:>8} {result['bytes_before'] / 1e6:>8.2f} {p50_before:>8.2f}")
+        print(f"{'after':>10} {result['rows_after']:>8} {result['bytes_after'] / 1e6:>8.2f} {p50_after:>8.2f}")
+        
+        # New behaviour: re-running the same sources is a no-op
+        start = time.perf_counter()
+        stats = client.upsert_sources_batch(unique)
+        print(f"\nRe-upserting {len(unique)} unchanged sources: {stats} in {time.perf_counter() - start:.2f}s")
+
+def bench_embed(args):
+    """Encoding throughput of the process pool at different worker counts"""
+    from agents.vector_search.encoder_pool import EncoderPool
+    from agents.vector_search.lancedb_client import EMBEDDING_MODEL
+    
+    texts = [f"{r['title']} {r['content']}" for r in synthetic_records(args.texts, seed=1)]
+    print(f"{'workers':>8} {'threads':>8} {'startup s':>10} {'encode s':>9} {'texts/s':>9} {'speedup':>8}")
+    baseline = None
+    for workers in args.workers:
+        start = time.perf_counter()
+        with EncoderPool(EMBEDDING_MODEL, workers, args.threads_per_worker) as pool:
+            startup = time.perf_counter() - start
+            pool.encode(texts[:workers * args.batch_size], args.batch_size)  # warm up every worker
+            start = time.perf_counter()
+            pool.encode(texts, args.batch_size)
+            elapsed = time.perf_counter() - start
+            threads = pool.threads_per_worker
+        rate = len(texts) / elapsed
+        baseline = baseline or rate
+        print(f"{workers:>8} {threads:>8} {startup:>10.1f} {elapsed:>9.2f} {rate:>9.1f} {rate / baseline:>7.2f}x")
+
+def main():
+    parser = argparse.ArgumentParser(description="Vector search benchmarks")
+    sub = parser.add_subparsers(dest="bench", required=True)
+    
+    ingest = sub.add_parser("ingest", help="Bulk ingestion throughput")
+    ingest.add_argument("--sizes", type=int, nargs="+", default=[1, 100, 10000])
+    ingest.add_argument("--batch-size", type=int, default=64)
+    ingest.add_argument("--max-single", type=int, default=100,
+                        help="Largest size to also run through per-record add_source")
+    ingest.set_defaults(func=bench_ingest)
+    
+    startup = sub.add_parser("startup", help="CLI import and first-command latency")
+    startup.set_defaults(func=bench_startup)
+    
+    ann = sub.add_parser("ann", help="ANN index recall@k vs latency against exact search")
+    ann.add_argument("--sizes", type=int, nargs="+", default=[100000, 1000000])
+    ann.add_argument("--queries", type=int, default=100)
+    ann.add_argument("--k", type=int, default=10)
+    ann.add_argument("--chunk", type=int, default=100000, help="Rows per write while loading the corpus")
+    ann.add_argument("--index-type", default="IVF_PQ")
+    ann.add_argument("--partitions", type=int)
+    ann.add_argument("--sub-vectors", type=int)
+    ann.add_argument("--nprobes", type=int, nargs="+", default=[10, 20, 50])
+    ann.add_argument("--refine-factors", type=int, nargs="+", default=[0, 5])
+    ann.set_defaults(func=bench_ann)
+    
+    hybrid = sub.add_parser("hybrid", help="Vector vs keyword vs hybrid search quality and latency")
+    hybrid.add_argument("--docs", type=int, default=5000)
+    hybrid.add_argument("--queries", type=int, default=200)
+    hybrid.add_argument("--k", type=int, default=5)
+    hybrid.set_defaults(func=bench_hybrid)
+    
+    results = sub.add_parser("results", help="Result conversion cost at different limits")
+    results.add_argument("--limits", type=int, nargs="+", default=[5, 100, 10000])
+    results.add_argument("--rows", type=int, default=20000, help="Rows converted per measurement")
+    results.set_defaults(func=bench_results)
+    
+    dedup = sub.add_parser("dedup", help="Size and latency drop from compacting duplicated sources")
+    dedup.add_argument("--docs", type=int, default=2000)
+    dedup.add_argument("--copies", type=int, default=5)
+    dedup.add_argument("--queries", type=int, default=50)
+    dedup.set_defaults(func=bench_dedup)
+    
+    embed = sub.add_parser("embed", help="Embedding throughput scaling over encoder processes")
+    embed.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    embed.add_argument("--threads-per-worker", type=int)
+    embed.add_argument("--texts", type=int, default=4000)
+    embed.add_argument("--batch-size", type=int, default=64)
+    embed.set_defaults(func=bench_embed)
+    
+    args = parser.parse_args()
+    args.func(args)
+
+if __name__ == "__main__":
+    main()
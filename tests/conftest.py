@@ -0,0 +1,30 @@
+# tests/conftest.py
+import re
+import zlib
+
+import pytest
+
+class BagOfWordsModel:
+    """Deterministic stand-in for the SentenceTransformer: hashed word counts,
+    unit length like MiniLM's output"""
+
+    def encode(self, texts, batch_size=32, convert_to_numpy=True, show_progress_bar=False, **kwargs):
+        import numpy as np
+        from agents.vector_search.lancedb_client import EMBEDDING_DIM
+
+        vectors = np.zeros((len(texts), EMBEDDING_DIM), dtype=np.float32)
+        for i, text in enumerate(texts):
+            for word in re.findall(r"[a-z]+", text.lower()):
+                vectors[i, zlib.crc32(word.encode()) % EMBEDDING_DIM] += 1
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        return vectors / np.where(norms == 0, 1, norms)
+
+@pytest.fixture
+def vector_client(tmp_path):
+    """A VectorSearchClient on a fresh database with the bag-of-words model"""
+    pytest.importorskip("lancedb")
+    from agents.vector_search.lancedb_client import VectorSearchClient
+
+    client = VectorSearchClient(db_path=str(tmp_path / "vector_db"))
+    client._model = BagOfWordsModel()
+    return client
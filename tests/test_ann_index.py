@@ -0,0 +1,41 @@
+# tests/test_ann_index.py
+import pytest
+
+from agents.vector_search.lancedb_client import MIN_INDEX_ROWS
+
+WORDS = "vector search index agent blog post source chunk query filter recall latency".split()
+
+def sources(start, count):
+    return [
+        {"id": f"s{i}", "url": f"https://example.com/{i}", "title": f"{WORDS[i % len(WORDS)]} notes {i}",
+         "content": " ".join(WORDS[(i + j) % len(WORDS)] for j in range(8))}
+        for i in range(start, start + count)
+    ]
+
+def test_small_tables_are_not_indexed(vector_client):
+    vector_client.add_sources_batch(sources(0, 10))
+    assert vector_client.index_status("sources") == {
+        "table": "sources", "rows": 10, "indexed": False, "index_type": None, "unindexed_rows": None}
+    assert vector_client.maybe_reindex("sources", threshold=1) is None
+    with pytest.raises(ValueError, match=f"at least {MIN_INDEX_ROWS}"):
+        vector_client.create_index("sources")
+
+def test_create_index_validates_its_arguments(vector_client):
+    with pytest.raises(ValueError, match="Unknown index type"):
+        vector_client.create_index("sources", index_type="FLAT")
+
+def test_reindex_once_enough_rows_are_unindexed(vector_client):
+    vector_client.add_sources_batch(sources(0, MIN_INDEX_ROWS))
+    summary = vector_client.maybe_reindex("sources", threshold=MIN_INDEX_ROWS)
+    assert summary["index_type"] == "IVF_PQ" and summary["rows"] == MIN_INDEX_ROWS
+    status = vector_client.index_status("sources")
+    assert status["indexed"] and status["unindexed_rows"] == 0
+
+    vector_client.add_sources_batch(sources(MIN_INDEX_ROWS, 20))
+    assert vector_client.index_status("sources")["unindexed_rows"] == 20
+    assert vector_client.maybe_reindex("sources", threshold=50) is None
+    assert vector_client.maybe_reindex("sources", threshold=20)["rows"] == MIN_INDEX_ROWS + 20
+    assert vector_client.index_status("sources")["unindexed_rows"] == 0
+
+    hits = vector_client.search_sources("vector search index", limit=3, nprobes=4, refine_factor=2)
+    assert len(hits) == 3
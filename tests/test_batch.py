@@ -0,0 +1,42 @@
+# tests/test_batch.py
+import json
+import threading
+
+from agents.research_agent import main as research, langgraph_agent
+from agents.research_agent.batch import read_topics, run_batch, slugify
+
+def test_read_topics(tmp_path):
+    path = tmp_path / "topics.txt"
+    path.write_text("# weekly\nVector search\n\n  Hybrid search  \nVector search\n", encoding="utf-8")
+    assert read_topics(str(path)) == ["Vector search", "Hybrid search"]
+
+def test_slugify():
+    assert slugify("Vector Search: what's new?") == "vector-search-what-s-new"
+    assert slugify("!!!") == "topic"
+    assert slugify("a" * 59 + " b", limit=60) == "a" * 59
+
+def test_topics_share_one_graph_and_get_their_own_directories(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    calls = []
+    lock = threading.Lock()
+
+    def research_topic(topic, out_dir=None, graph=None, id_prefix=None):
+        with lock:
+            calls.append((topic, out_dir.name, graph, id_prefix))
+        if topic == "broken":
+            raise RuntimeError("search failed")
+        return {"topic": topic, "status": "completed", "method": "langgraph", "seconds": 0.5}
+
+    monkeypatch.setattr(research, "research_topic", research_topic)
+    summary = run_batch(["Vector search", "vector-search", "broken"], concurrency=2, out_dir=tmp_path / "out")
+
+    assert sorted(name for _, name, _, _ in calls) == ["broken", "vector-search", "vector-search-1"]
+    graphs = {id(graph) for _, _, graph, _ in calls}
+    assert len(graphs) == 1
+    if langgraph_agent.LANGGRAPH_AVAILABLE:
+        assert calls[0][2] is not None
+    assert all(prefix.endswith(name) for _, name, _, prefix in calls)
+    assert (summary["topics"], summary["completed"], summary["failed"]) == (3, 2, 1)
+    assert summary["results"][2] == {"topic": "broken", "status": "error", "error": "search failed"}
+    [written] = (tmp_path / "out").glob("batch-*.json")
+    assert json.loads(written.read_text(encoding="utf-8"))["topic_seconds"] == 1.0
@@ -0,0 +1,46 @@
+# tests/test_chunking.py
+import pytest
+
+from agents.vector_search.chunking import iter_chunks, estimate_tokens
+
+def one_token(words):
+    return [1] * len(words)
+
+TEXT = " ".join(f"w{i}" for i in range(10))
+
+def test_chunks_overlap_and_cover_the_text():
+    chunks = list(iter_chunks(TEXT, max_tokens=4, overlap=2, count_tokens=one_token))
+    assert chunks == ["w0 w1 w2 w3", "w2 w3 w4 w5", "w4 w5 w6 w7", "w6 w7 w8 w9"]
+
+def test_short_text_is_one_chunk():
+    assert list(iter_chunks(TEXT, max_tokens=10, overlap=2, count_tokens=one_token)) == [TEXT]
+    assert list(iter_chunks("", count_tokens=one_token)) == []
+
+def test_no_trailing_chunk_of_overlap_only():
+    chunks = list(iter_chunks(" ".join(f"w{i}" for i in range(6)), max_tokens=4, overlap=2, count_tokens=one_token))
+    assert chunks == ["w0 w1 w2 w3", "w2 w3 w4 w5"]
+
+def test_oversized_word_is_its_own_chunk():
+    chunks = list(iter_chunks("a " + "x" * 100 + " b", max_tokens=5, overlap=2))
+    assert chunks == ["a", "x" * 100, "b"]
+    assert estimate_tokens(["x" * 100]) == [25]
+
+def test_overlap_must_be_smaller_than_the_chunk():
+    with pytest.raises(ValueError):
+        list(iter_chunks(TEXT, max_tokens=4, overlap=4))
+
+def test_long_documents_are_stored_and_searched_as_chunks(vector_client):
+    filler = " ".join(f"filler{i}" for i in range(600))
+    vector_client.add_posts_batch([
+        {"id": "long", "title": "Long read", "content": filler + " lancedb compaction tips", "url": "https://blog.example/long"},
+        {"id": "short", "title": "Short read", "content": "Cooking pasta at home.", "url": "https://blog.example/short"},
+    ])
+    chunks = vector_client.db.open_table("chunks").to_arrow()
+    long_key = [k for k, c in zip(chunks["parent_key"].to_pylist(), chunks["content"].to_pylist()) if "filler0" in c][0]
+    long_chunks = [c for k, c in zip(chunks["parent_key"].to_pylist(), chunks["content"].to_pylist()) if k == long_key]
+    assert len(long_chunks) > 1 and long_chunks[-1].endswith("lancedb compaction tips")
+
+    [hit] = vector_client.search_posts("lancedb compaction tips", limit=1, chunks=True)
+    assert hit["id"] == "long" and 0 < hit["score"] <= 1.0
+    with pytest.raises(ValueError, match="chunk scoring"):
+        vector_client.search_arrow("posts", "tips", chunks=True, chunk_scoring="mean")
@@ -0,0 +1,59 @@
+# tests/test_content_stages.py
+import time
+
+from agents.content_agent.main import run_post_draft_stages
+
+def test_failing_and_hung_stages_do_not_hold_up_the_others():
+    def critique(draft):
+        raise RuntimeError("rate limited")
+
+    def seo(draft):
+        time.sleep(0.3)
+        return "seo for " + draft
+
+    def social(draft):
+        time.sleep(30)
+        return {"twitter": "never"}
+
+    stages = {
+        "critique": (critique, "critique fallback"),
+        "seo": (seo, "seo fallback"),
+        "social": (social, {"twitter": "social fallback"}),
+        "summary": (lambda draft: draft.upper(), "summary fallback"),
+    }
+    start = time.perf_counter()
+    results, latency = run_post_draft_stages("draft", stages, timeout=0.5)
+
+    assert time.perf_counter() - start < 1.5
+    assert results == {"critique": "critique fallback", "seo": "seo for draft",
+                       "social": {"twitter": "social fallback"}, "summary": "DRAFT"}
+    assert {name: s["status"] for name, s in latency["stages"].items()} == {
+        "critique": "error", "seo": "ok", "social": "timeout", "summary": "ok"}
+    assert 0.3 <= latency["stages"]["seo"]["seconds"] < 0.5
+    assert latency["stages"]["social"]["seconds"] >= 0.5
+
+def test_each_stage_gets_the_whole_timeout():
+    def slow(seconds):
+        return lambda draft: time.sleep(seconds) or seconds
+
+    stages = {"first": (slow(0.4), None), "second": (slow(0.4), None)}
+    results, latency = run_post_draft_stages("draft", stages, timeout=0.5)
+    assert results == {"first": 0.4, "second": 0.4}
+    assert all(s["status"] == "ok" for s in latency["stages"].values())
+
+def test_llm_errors_in_the_real_stages_are_reported(monkeypatch):
+    from agents.llm_client import llm_client
+
+    def complete(prompt, **kwargs):
+        raise TimeoutError("read timed out")
+
+    monkeypatch.setenv("OPENAI_API_KEY", "stub")
+    monkeypatch.setattr(llm_client, "complete", complete)
+    results, latency = run_post_draft_stages("# Vector search\n\nRetrieval keeps answers grounded.\n")
+
+    assert {name: s["status"] for name, s in latency["stages"].items()} == {
+        "critique": "error", "seo": "error", "social": "error"}
+    assert results["critique"] == "Self-critique would be generated here"
+    # SEO falls back to the locally measured checklist, without suggestions
+    assert results["seo"].startswith("#") and "## Suggestions" not in results["seo"]
+    assert results["social"]["twitter"] == "Social media snippet generation failed"
@@ -0,0 +1,59 @@
+# tests/test_context_packing.py
+import pytest
+
+from agents.research_agent import context_packing
+from agents.research_agent.context_packing import pack_context, split_passages
+
+def count_tokens(text):
+    return (len(text) + 3) // 4
+
+FILLER = "Unrelated background sentence number {}."
+
+SOURCES = [
+    {"title": "Long article", "url": "https://a.example",
+     "content": " ".join(FILLER.format(i) for i in range(40)) + " LanceDB compaction rewrites fragments."},
+    {"title": "Short note", "url": "https://b.example", "content": "Compaction keeps LanceDB reads fast."},
+]
+
+@pytest.fixture
+def keyword_scores(monkeypatch):
+    """Score passages by how often they mention compaction"""
+    def score(topic, passages):
+        return [p["text"].lower().count("compaction") for p in passages]
+    monkeypatch.setattr(context_packing, "score_passages", score)
+
+def test_passages_are_whole_sentences_under_the_cap():
+    passages = split_passages(SOURCES, max_tokens=20)
+    assert [p["position"] for p in passages if p["source"] == 1] == [0]
+    for passage in passages:
+        assert passage["text"].endswith(".")
+        assert sum(context_packing.estimate_tokens(passage["text"].split())) <= 20
+
+def test_relevant_passages_win_and_budget_holds(keyword_scores):
+    context, stats = pack_context("compaction", SOURCES, budget=60, count_tokens=count_tokens)
+    assert stats["tokens"] <= 60 and stats["sources_covered"] == 2
+    assert "LanceDB compaction rewrites fragments." in context
+    assert "number 0." not in context
+    assert context.index("Long article") < context.index("Short note")
+    assert stats["passages"] < stats["candidates"] and stats["full_tokens"] > stats["tokens"]
+
+def test_every_source_gets_a_passage_before_extras(keyword_scores):
+    sources = [{"title": f"Source {i}", "url": f"https://{i}.example",
+                "content": "Compaction matters a lot. " * 40 if i == 0 else "Plain text here."}
+               for i in range(3)]
+    # Source 0's passages all outscore the others and would fill the budget on their own
+    context, stats = pack_context("compaction", sources, budget=180, count_tokens=count_tokens)
+    assert stats["sources_covered"] == 3 and stats["tokens"] <= 180
+    assert context.count("Compaction matters") > 8
+
+def test_without_a_model_passages_are_packed_in_reading_order(monkeypatch):
+    from agents.vector_search.lancedb_client import vector_client
+
+    def embed(texts):
+        raise RuntimeError("no model")
+
+    monkeypatch.setattr(vector_client, "embed", embed)
+    context, stats = pack_context("compaction", SOURCES[:1], budget=80, count_tokens=count_tokens)
+    assert context.startswith("- Long article (https://a.example):\n  Unrelated background sentence number 0.")
+    assert "number 5." not in context
+    assert stats["tokens"] <= 80
@@ -0,0 +1,60 @@
+# tests/test_embedding_cache.py
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from agents.vector_search.embedding_cache import EmbeddingCache, INDEX_FILE
+
+def vectors(n, dim=8):
+    return np.arange(n * dim, dtype=np.float32).reshape(n, dim)
+
+def test_hits_do_not_rewrite_the_index(tmp_path):
+    cache = EmbeddingCache(tmp_path, "model", 8)
+    cache.put_many(["a", "b"], vectors(2))
+    cache.flush()
+    index = tmp_path / INDEX_FILE
+    written = index.stat().st_mtime_ns
+
+    assert all(v is not None for v in cache.get_many(["a", "b", "a"]))
+    assert not cache._dirty
+    cache.flush()
+    assert index.stat().st_mtime_ns == written
+    assert cache.stats()["hits"] == 3
+
+def test_entries_persist_across_instances(tmp_path):
+    cache = EmbeddingCache(tmp_path, "model", 8)
+    cache.put_many(["  Some   text "], vectors(1))
+    cache.flush()
+
+    reopened = EmbeddingCache(tmp_path, "model", 8)
+    hit, miss = reopened.get_many(["Some text", "other"])
+    assert np.array_equal(hit, vectors(1)[0]) and miss is None
+    assert EmbeddingCache(tmp_path, "other-model", 8).get_many(["Some text"]) == [None]
+
+def test_queries_do_not_flush_but_batches_do(vector_client):
+    vector_client.add_sources_batch([
+        {"id": "s1", "url": "https://example.com/1", "title": "Vector search", "content": "Embeddings and indexes."}
+    ])
+    index = vector_client.db_path / "embedding_cache" / INDEX_FILE
+    written = index.stat().st_mtime_ns
+
+    for _ in range(3):
+        vector_client.search_sources("vector search")
+    assert index.stat().st_mtime_ns == written
+    assert vector_client.cache._dirty  # the new query vector waits for the next flush
+
+    vector_client.flush_cache()
+    assert index.stat().st_mtime_ns != written
+    assert vector_client.get_stats()["embedding_cache"]["hits"] >= 2
+
+def test_cached_readd_does_not_load_the_model(vector_client, monkeypatch):
+    source = {"id": "s1", "url": "https://example.com/1", "title": "Vector search",
+              "content": "Embeddings and indexes. " * 200}
+    vector_client.add_sources_batch([source])
+
+    loads = []
+    model = vector_client._model
+    vector_client._model = None
+    monkeypatch.setattr(type(vector_client), "model", property(lambda self: loads.append(1) or model))
+    vector_client.add_sources_batch([source])
+    assert loads == []
@@ -0,0 +1,44 @@
+# tests/test_encoder_pool.py
+import os
+
+import numpy as np
+import pytest
+
+from agents.vector_search.encoder_pool import EncoderPool
+
+class EchoModel:
+    """Encodes each text as (length, worker pid, OMP_NUM_THREADS seen by the worker)"""
+
+    def encode(self, texts, batch_size=32, **kwargs):
+        threads = float(os.environ.get("OMP_NUM_THREADS", "0"))
+        return np.array([[len(text), os.getpid(), threads] for text in texts])
+
+def echo_loader(model_name):
+    return EchoModel()
+
+def failing_loader(model_name):
+    raise OSError(f"no weights for {model_name}")
+
+def test_pool_keeps_input_order_across_workers():
+    texts = ["x" * n for n in range(1, 60)]
+    parent_threads = os.environ.get("OMP_NUM_THREADS")
+    with EncoderPool("stub", workers=2, threads_per_worker=1, queue_size=2, loader=echo_loader) as pool:
+        processes = list(pool._processes)
+        vectors = pool.encode(texts, batch_size=4)
+        again = pool.encode(texts[:5], batch_size=2)
+
+    assert vectors.dtype == np.float32 and vectors.shape == (len(texts), 3)
+    assert vectors[:, 0].tolist() == [len(text) for text in texts]
+    assert again[:, 0].tolist() == [1, 2, 3, 4, 5]
+    assert set(vectors[:, 1].astype(int)) <= {process.pid for process in processes}
+    assert set(vectors[:, 2]) == {1.0}  # set before the worker imported numpy
+    assert os.environ.get("OMP_NUM_THREADS") == parent_threads
+
+    assert pool._processes == []
+    assert not any(process.is_alive() for process in processes)
+
+def test_loader_failure_is_raised_from_start():
+    pool = EncoderPool("stub", workers=2, loader=failing_loader)
+    with pytest.raises(RuntimeError, match="no weights for stub"):
+        pool.start()
+    assert pool._processes == []
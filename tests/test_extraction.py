@@ -0,0 +1,52 @@
+# tests/test_extraction.py
+import time
+import signal
+
+import pytest
+
+trafilatura = pytest.importorskip("trafilatura")
+
+from agents.research_agent import extraction
+from agents.research_agent.extraction import MAX_TEXT_CHARS, ExtractionPool, extract_text, guard_html
+
+@pytest.fixture
+def parsed(monkeypatch):
+    """Record the documents trafilatura is asked to parse"""
+    calls = []
+    def extract(html):
+        calls.append(html)
+        return "article text"
+    monkeypatch.setattr(trafilatura, "extract", extract)
+    return calls
+
+@pytest.mark.skipif(not hasattr(signal, "setitimer"), reason="needs SIGALRM")
+def test_hanging_extraction_gives_up_at_the_timeout(monkeypatch):
+    monkeypatch.setattr(extraction, "extract_text", lambda html: time.sleep(5) or "never")
+    previous = signal.signal(signal.SIGALRM, extraction._on_alarm)
+    try:
+        start = time.perf_counter()
+        assert extraction._extract_with_timeout("<p>slow</p>", 0.2) is None
+        assert time.perf_counter() - start < 1.0
+    finally:
+        signal.signal(signal.SIGALRM, previous)
+
+    pool = ExtractionPool(workers=1)
+    assert pool._result(None) == "" and pool.timeouts == 1
+
+def test_oversized_html_is_skipped_before_parsing(monkeypatch, parsed):
+    monkeypatch.setattr(extraction, "SKIP_HTML_CHARS", 1000)
+    assert extract_text("<p>" + "x" * 1000 + "</p>") == ""
+    with ExtractionPool(workers=1) as pool:
+        assert pool.extract("<p>" + "x" * 1000 + "</p>") == ""
+    assert parsed == []
+
+def test_big_html_is_cut_at_a_tag_boundary(monkeypatch, parsed):
+    monkeypatch.setattr(extraction, "MAX_HTML_CHARS", 100)
+    html = "<article>" + "<p>paragraph text here</p>" * 10 + "</article>"
+    assert guard_html(html).endswith("</p>") and len(guard_html(html)) <= 100
+    assert extract_text(html) == "article text"
+    assert parsed == [guard_html(html)]
+
+def test_extracted_text_is_capped(monkeypatch):
+    monkeypatch.setattr(trafilatura, "extract", lambda html: "word " * MAX_TEXT_CHARS)
+    assert len(extract_text("<p>long</p>")) == MAX_TEXT_CHARS
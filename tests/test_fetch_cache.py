@@ -0,0 +1,41 @@
+# tests/test_fetch_cache.py
+import json
+
+from agents.research_agent.fetch_cache import FetchCache, INDEX_FILE, content_hash
+
+def test_reads_do_not_rewrite_the_index(tmp_path):
+    cache = FetchCache(tmp_path)
+    cache.put("https://example.com/a", "<p>a</p>", "a", etag='"v1"')
+    index = tmp_path / INDEX_FILE
+    written = index.stat().st_mtime_ns
+
+    for _ in range(5):
+        entry = cache.get("https://example.com/a")
+    assert entry["text"] == "a" and entry["fresh"] and entry["html_hash"] == content_hash("<p>a</p>")
+    assert index.stat().st_mtime_ns == written
+
+    accessed = entry["accessed"]
+    cache.flush()
+    stored = json.loads(index.read_text(encoding="utf-8"))
+    assert stored[cache.key("https://example.com/a")]["accessed"] == accessed
+
+def test_conditional_headers_and_expiry(tmp_path):
+    cache = FetchCache(tmp_path, ttl=0)
+    cache.put("https://example.com/a", "<p>a</p>", "a", etag='"v1"', last_modified="Mon, 01 Jan 2024 00:00:00 GMT")
+    entry = cache.get("https://example.com/a")
+    assert not entry["fresh"]
+    assert cache.conditional_headers(entry) == {
+        "If-None-Match": '"v1"', "If-Modified-Since": "Mon, 01 Jan 2024 00:00:00 GMT"
+    }
+    assert cache.get("https://example.com/missing") is None
+
+def test_least_recently_used_pages_are_evicted(tmp_path):
+    cache = FetchCache(tmp_path, max_bytes=10 ** 9)
+    for name in "abc":
+        cache.put(f"https://example.com/{name}", "<p>" + name * 1000 + "</p>", name * 1000)
+    cache.get("https://example.com/a")  # a is now more recent than b
+    cache.max_bytes = 2 * cache._index[cache.key("https://example.com/c")]["size"] + 1
+    cache.put("https://example.com/c", "<p>" + "c" * 1000 + "</p>", "c" * 1000)
+    assert cache.get("https://example.com/b") is None
+    assert cache.get("https://example.com/a") is not None
+    assert cache.stats["evicted"] == 1
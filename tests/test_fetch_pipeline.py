@@ -0,0 +1,69 @@
+# tests/test_fetch_pipeline.py
+import time
+import threading
+from collections import Counter
+
+from agents.research_agent.fetch_pipeline import gather_sources, PER_HOST_LIMIT
+
+HOSTS = ["a.example", "b.example"]
+
+def search(query):
+    return [{"url": f"https://{HOSTS[i % 2]}/{query.replace(' ', '-')}/{i}", "title": query} for i in range(6)]
+
+def test_fetches_respect_the_per_host_limit():
+    lock = threading.Lock()
+    running, peak = Counter(), Counter()
+
+    def fetch(url, timeout=15, extract=None):
+        host = url.split("/")[2]
+        with lock:
+            running[host] += 1
+            peak[host] = max(peak[host], running[host])
+        time.sleep(0.05)
+        with lock:
+            running[host] -= 1
+        return f"text of {url}"
+
+    sources, stats = gather_sources(["vector search", "hybrid search"], per_query=6, search=search,
+                                    fetch=fetch, max_workers=12, extract_workers=1)
+
+    assert len(sources) == stats["fetched"] == 12
+    assert set(peak) == set(HOSTS)
+    assert max(peak.values()) <= PER_HOST_LIMIT
+    assert [s["url"] for s in sources[:2]] == ["https://a.example/vector-search/0", "https://b.example/vector-search/1"]
+
+def test_partial_results_report_failures_and_timeouts():
+    def fetch(url, timeout=15, extract=None):
+        index = int(url.rsplit("/", 1)[1])
+        if index == 0:
+            raise ConnectionError("reset by peer")
+        if index == 1:
+            return ""
+        if index >= 4:
+            time.sleep(2)  # still running at the deadline
+        return f"text of {url}"
+
+    start = time.perf_counter()
+    sources, stats = gather_sources(["vector search"], per_query=6, search=search, fetch=fetch,
+                                    per_host=6, deadline=0.5, extract_workers=1)
+
+    assert time.perf_counter() - start < 1.5
+    assert [s["url"].rsplit("/", 1)[1] for s in sources] == ["2", "3"]
+    assert {k: stats[k] for k in ("fetched", "fetch_errors", "empty", "timed_out")} == {
+        "fetched": 2, "fetch_errors": 1, "empty": 1, "timed_out": 2}
+
+def test_slot_waits_past_the_deadline_count_as_timed_out():
+    timeouts = []
+
+    def fetch(url, timeout=15, extract=None):
+        timeouts.append(timeout)
+        time.sleep(0.4)
+        return f"text of {url}"
+
+    # One slot for a.example: the second a.example URL waits for it past the deadline
+    sources, stats = gather_sources(["vector search"], per_query=3, search=search, fetch=fetch,
+                                    per_host=1, deadline=0.6, extract_workers=1)
+
+    assert [s["url"].rsplit("/", 1)[1] for s in sources] == ["0", "1"]
+    assert {k: stats[k] for k in ("fetched", "empty", "timed_out")} == {"fetched": 2, "empty": 0, "timed_out": 1}
+    assert all(t <= 0.6 for t in timeouts)
@@ -0,0 +1,54 @@
+# tests/test_http_client.py
+import threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+import pytest
+
+from agents import http_client as http
+
+class FlakyHandler(BaseHTTPRequestHandler):
+    """Answers each request with the next status in `statuses`, then 200"""
+    statuses = []
+    requests = 0
+
+    def reply(self):
+        FlakyHandler.requests += 1
+        status = FlakyHandler.statuses.pop(0) if FlakyHandler.statuses else 200
+        self.send_response(status)
+        if status == 429:
+            self.send_header("Retry-After", "0")
+        self.send_header("Content-Length", "2")
+        self.end_headers()
+        self.wfile.write(b"ok")
+
+    do_GET = do_POST = reply
+
+    def log_message(self, *args):
+        pass
+
+@pytest.fixture
+def server(monkeypatch):
+    monkeypatch.setattr(http, "backoff_delay", lambda attempt, retry_after=None: 0.0)
+    FlakyHandler.requests = 0
+    server = ThreadingHTTPServer(("127.0.0.1", 0), FlakyHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_address[1]}/"
+    server.shutdown()
+
+def test_get_retries_5xx(server):
+    FlakyHandler.statuses = [502, 503]
+    response = http.HttpClient().get(server)
+    assert response.status_code == 200
+    assert FlakyHandler.requests == 3
+
+def test_post_does_not_retry_5xx(server):
+    FlakyHandler.statuses = [502]
+    response = http.HttpClient().post(server, json={"text": "hello"})
+    assert response.status_code == 502
+    assert FlakyHandler.requests == 1
+
+def test_post_retries_429(server):
+    FlakyHandler.statuses = [429]
+    response = http.HttpClient().post(server, json={"text": "hello"})
+    assert response.status_code == 200
+    assert FlakyHandler.requests == 2
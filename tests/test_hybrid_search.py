@@ -0,0 +1,67 @@
+# tests/test_hybrid_search.py
+import re
+
+import pytest
+
+from agents.vector_search.lancedb_client import fuse_rankings
+
+VECTOR_HITS = [("a", 1.0), ("b", 1.2), ("c", 1.4)]  # distances, lower is better
+
+def test_weighted_keeps_a_lone_keyword_hit():
+    fused = dict(fuse_rankings(VECTOR_HITS, [("z", 5.0)], 3, fusion="weighted"))
+    assert fused["z"] == 0.5
+    assert list(fused) == ["a", "z", "b"]
+
+def test_weighted_tied_scores_all_count_as_best():
+    fused = dict(fuse_rankings([], [("x", 2.0), ("y", 2.0)], 2, fusion="weighted", alpha=0.5))
+    assert fused == {"x": 0.5, "y": 0.5}
+
+    fused = dict(fuse_rankings([("p", 0.7), ("q", 0.7)], [], 2, fusion="weighted", alpha=1.0))
+    assert fused == {"p": 1.0, "q": 1.0}
+
+def test_rrf_sums_reciprocal_ranks():
+    fused = dict(fuse_rankings([("a", 1.0), ("b", 2.0)], [("b", 9.0)], 2))
+    assert fused["b"] > fused["a"]
+
+SYNONYMS = {"car": "automobile", "repair": "service"}
+
+FILLER_TOPICS = ["search ranking with embeddings", "ranking search results by recall",
+                 "search latency and ranking quality", "vector search ranking tricks", "hybrid search ranking fusion"]
+
+@pytest.fixture
+def hybrid_client(vector_client):
+    """Posts where one is only findable by an exact ID and one only by meaning"""
+    from conftest import BagOfWordsModel
+
+    class SynonymModel(BagOfWordsModel):
+        """Bag of words that maps a few synonyms together, standing in for a paraphrase-aware encoder"""
+        def encode(self, texts, **kwargs):
+            texts = [" ".join(SYNONYMS.get(w, w) for w in re.findall(r"[a-z]+", t.lower())) for t in texts]
+            return super().encode(texts, **kwargs)
+
+    vector_client._model = SynonymModel()
+    posts = [
+        {"id": f"f{i}", "title": topic.title(), "content": f"Notes on {topic}. Search ranking matters.",
+         "url": f"https://blog.example/{i}"}
+        for i, topic in enumerate(FILLER_TOPICS)
+    ]
+    posts.append({"id": "paper", "title": "Reading list", "content": "This week: 2401.12345, a short paper.",
+                  "url": "https://blog.example/paper"})
+    posts.append({"id": "auto", "title": "Automobile maintenance",
+                  "content": "How to service an automobile engine at home.", "url": "https://blog.example/auto"})
+    vector_client.add_posts_batch(posts)
+    return vector_client
+
+def ids(client, query, mode):
+    return [hit["id"] for hit in client.search_posts(query, limit=3, mode=mode)]
+
+def test_hybrid_finds_exact_terms_and_paraphrases(hybrid_client):
+    # Paper IDs carry no meaning for the encoder: only BM25 ranks the paper first
+    assert ids(hybrid_client, "2401.12345 embeddings", "fts")[0] == "paper"
+    assert "paper" not in ids(hybrid_client, "2401.12345 embeddings", "vector")
+    assert "paper" in ids(hybrid_client, "2401.12345 embeddings", "hybrid")
+
+    # No shared words: only the vector side matches "car repair" to the automobile post
+    assert ids(hybrid_client, "car repair tips", "fts") == []
+    assert ids(hybrid_client, "car repair tips", "vector")[0] == "auto"
+    assert ids(hybrid_client, "car repair tips", "hybrid")[0] == "auto"
@@ -0,0 +1,120 @@
+# tests/test_incremental.py
+import re
+import json
+
+import pytest
+
+from agents.llm_client import llm_client
+from agents.content_agent import prompts
+from agents.content_agent.incremental import run_incremental
+
+OUTLINE = """# Vector search for agents
+
+Why retrieval decides answer quality.
+
+## Indexing
+- Chunking
+
+## Querying
+- Hybrid search
+
+## Conclusion
+- Next steps
+"""
+
+@pytest.fixture
+def llm(monkeypatch):
+    """Stub LLM recording every prompt"""
+    prompts = []
+
+    def complete(prompt, model=None, temperature=0.3, timeout=None, cache=True):
+        prompts.append(prompt)
+        if prompt.startswith("Expand one section"):
+            section = prompt.split("## Section to Write:\n", 1)[1].split("\n\n## Requirements:")[0]
+            heading = section.splitlines()[0]
+            return f"{heading}\n\nBody of {heading} with {len(section.splitlines()) - 1} points."
+        if prompt.startswith("The blog post"):
+            return json.dumps([f"Transition {i}." for i in re.findall(r"### Boundary (\d+)", prompt)])
+        if "social media" in prompt:
+            return json.dumps({"telegram": "t", "facebook": "f", "twitter": "x"})
+        return "ok"
+
+    monkeypatch.setenv("OPENAI_API_KEY", "stub")
+    monkeypatch.setattr(llm_client, "cache", None)
+    monkeypatch.setattr(llm_client, "complete", complete)
+    return prompts
+
+def test_sections_share_context_and_only_changed_boundaries_are_restitched(tmp_path, llm):
+    outline = tmp_path / "post.md"
+    outline.write_text(OUTLINE, encoding="utf-8")
+    build_dir = tmp_path / "build"
+
+    run_incremental(str(outline), build_dir)
+    sections = [p for p in llm if p.startswith("Expand one section")]
+    assert len(sections) == 4
+    assert all("Why retrieval decides answer quality." in p for p in sections)
+    stitch = [p for p in llm if p.startswith("The blog post")]
+    assert len(stitch) == 1 and "exactly 3 strings" in stitch[0]
+    draft = (build_dir / "draft.md").read_text(encoding="utf-8")
+    assert "## Querying\n\nTransition 2.\n\nBody of ## Querying with 1 points." in draft
+
+    llm.clear()
+    outline.write_text(OUTLINE.replace("- Hybrid search", "- Hybrid search\n- Reranking"), encoding="utf-8")
+    report = run_incremental(str(outline), build_dir)
+    sections = [p for p in llm if p.startswith("Expand one section")]
+    stitch = [p for p in llm if p.startswith("The blog post")]
+    assert len(sections) == 1 and "## Querying" in sections[0]
+    # Only the two boundaries around the rebuilt section are rewritten
+    assert len(stitch) == 1 and re.findall(r"### Boundary (\d+)", stitch[0]) == ["2", "3"]
+    assert "1 transitions" in report["skipped"]
+    draft = (build_dir / "draft.md").read_text(encoding="utf-8")
+    assert "## Querying\n\nTransition 2.\n\n" in draft and "## Indexing\n\nTransition 1.\n\n" in draft
+
+def test_unchanged_rerun_skips_every_stage(tmp_path, llm):
+    outline = tmp_path / "post.md"
+    outline.write_text(OUTLINE, encoding="utf-8")
+    build_dir = tmp_path / "build"
+
+    first = run_incremental(str(outline), build_dir)
+    assert first["skipped"] == []
+    assert {"critique", "seo", "social", "3 transitions"} <= set(first["ran"])
+    draft = (build_dir / "draft.md").read_text(encoding="utf-8")
+
+    llm.clear()
+    report = run_incremental(str(outline), build_dir)
+    assert report["ran"] == [] and llm == []
+    assert report["skipped"] == ["section 1", "section 2", "section 3", "section 4",
+                                 "3 transitions", "critique", "seo", "social"]
+    assert (build_dir / "draft.md").read_text(encoding="utf-8") == draft
+    manifest = json.loads((build_dir / "manifest.json").read_text(encoding="utf-8"))
+    assert len(manifest["sections"]) == 4 and len(manifest["transitions"]) == 3
+
+def test_prompt_change_reruns_only_its_stage(tmp_path, llm, monkeypatch):
+    outline = tmp_path / "post.md"
+    outline.write_text(OUTLINE, encoding="utf-8")
+    run_incremental(str(outline), tmp_path / "build")
+
+    monkeypatch.setattr(prompts, "SELF_CRITIQUE_PROMPT", prompts.SELF_CRITIQUE_PROMPT + "\nBe brief.")
+    report = run_incremental(str(outline), tmp_path / "build")
+    assert report["ran"] == ["critique"]
+    assert "seo" in report["skipped"] and "section 1" in report["skipped"]
+
+def test_failed_stage_output_is_not_reused(tmp_path, llm, monkeypatch):
+    outline = tmp_path / "post.md"
+    outline.write_text(OUTLINE, encoding="utf-8")
+    stub = llm_client.complete
+
+    def flaky(prompt, **kwargs):
+        if prompt.startswith(prompts.SELF_CRITIQUE_PROMPT.split("\n", 1)[0]):
+            raise TimeoutError("read timed out")
+        return stub(prompt, **kwargs)
+
+    monkeypatch.setattr(llm_client, "complete", flaky)
+    first = run_incremental(str(outline), tmp_path / "build")
+    assert first["failed"] == ["critique"] and "critique" not in first["ran"]
+    assert (tmp_path / "build" / "critique.md").read_text(encoding="utf-8") == "Self-critique would be generated here"
+
+    monkeypatch.setattr(llm_client, "complete", stub)
+    second = run_incremental(str(outline), tmp_path / "build")
+    assert second["ran"] == ["critique"] and second["failed"] == []
+    assert (tmp_path / "build" / "critique.md").read_text(encoding="utf-8") == "ok"
@@ -0,0 +1,52 @@
+# tests/test_lazy_imports.py
+import os
+import sys
+import json
+import subprocess
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("lancedb")
+
+ROOT = Path(__file__).resolve().parents[1]
+
+# Runs the CLI with a finder that records (and refuses) any import of the
+# embedding stack, so the check holds whether or not torch is installed
+PROBE = """
+import sys, json, runpy
+from importlib.machinery import ModuleSpec
+HEAVY = ("torch", "sentence_transformers", "transformers")
+imported = []
+class Refuse:
+    # Availability checks (find_spec, as lancedb does for torch) are fine; executing the module is not
+    def create_module(self, spec):
+        imported.append(spec.name)
+        raise ImportError(spec.name)
+    def exec_module(self, module):
+        pass
+class Probe:
+    def find_spec(self, name, path=None, target=None):
+        if name.split(".")[0] in HEAVY:
+            return ModuleSpec(name, Refuse())
+sys.meta_path.insert(0, Probe())
+sys.argv = ["cli"] + sys.argv[1:]
+try:
+    runpy.run_module("agents.vector_search.cli", run_name="__main__")
+except SystemExit:
+    pass
+loaded = sorted(m for m in sys.modules if m.split(".")[0] in HEAVY)
+print("PROBE " + json.dumps({"imported": imported, "loaded": loaded}))
+"""
+
+# "index --auto" reports the index status without rebuilding an empty table
+@pytest.mark.parametrize("command", ["stats", "add", "index --auto", "migrate", "compact"])
+def test_cli_command_does_not_import_torch(tmp_path, command):
+    result = subprocess.run(
+        [sys.executable, "-c", PROBE, *command.split()], cwd=tmp_path, capture_output=True, text=True,
+        env={"PYTHONPATH": str(ROOT), "PATH": os.environ.get("PATH", "")}, timeout=120
+    )
+    line = [l for l in result.stdout.splitlines() if l.startswith("PROBE ")]
+    assert line, result.stdout + result.stderr
+    probe = json.loads(line[-1][len("PROBE "):])
+    assert probe == {"imported": [], "loaded": []}
@@ -0,0 +1,103 @@
+# tests/test_llm_client.py
+import json
+import threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+import pytest
+
+pytest.importorskip("langchain_openai")
+
+from agents.llm_client import LLMCache, LLMClient, cache_key
+
+class ChatHandler(BaseHTTPRequestHandler):
+    """Minimal OpenAI-compatible /v1/chat/completions that counts requests"""
+    protocol_version = "HTTP/1.1"
+    requests = 0
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+        ChatHandler.requests += 1
+        if body.get("stream"):
+            return self.stream(body, f"answer {ChatHandler.requests}")
+        payload = json.dumps({
+            "id": "chatcmpl-stub", "object": "chat.completion", "created": 0, "model": body.get("model"),
+            "choices": [{"index": 0, "finish_reason": "stop", "message": {
+                "role": "assistant", "content": f"answer {ChatHandler.requests}"}}],
+            "usage": {"prompt_tokens": 1, "completion_tokens": 1, "total_tokens": 2},
+        }).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def stream(self, body, text):
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Connection", "close")
+        self.end_headers()
+        for delta, finish in (({"role": "assistant", "content": text[:3]}, None),
+                              ({"content": text[3:]}, None), ({}, "stop")):
+            chunk = {"id": "chatcmpl-stub", "object": "chat.completion.chunk", "created": 0,
+                     "model": body.get("model"), "choices": [{"index": 0, "delta": delta, "finish_reason": finish}]}
+            self.wfile.write(f"data: {json.dumps(chunk)}\n\n".encode("utf-8"))
+        self.wfile.write(b"data: [DONE]\n\n")
+        self.close_connection = True
+
+    def log_message(self, *args):
+        pass
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    server = ThreadingHTTPServer(("127.0.0.1", 0), ChatHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    monkeypatch.setenv("OPENAI_BASE_URL", f"http://127.0.0.1:{server.server_address[1]}/v1")
+    monkeypatch.setenv("OPENAI_API_KEY", "stub")
+    ChatHandler.requests = 0
+    client = LLMClient(cache=LLMCache(tmp_path / "llm"))
+    yield client
+    client.close()
+    server.shutdown()
+
+def test_warm_rerun_sends_no_requests(client, tmp_path):
+    prompts = ["outline please", "expand the outline", "critique the draft"]
+    first = [client.complete(p) for p in prompts]
+    assert ChatHandler.requests == 3
+
+    # A new client (a new process, in practice) on the same cache directory
+    rerun = LLMClient(cache=LLMCache(tmp_path / "llm"))
+    ChatHandler.requests = 0
+    assert [rerun.complete(p) for p in prompts] == first
+    assert ChatHandler.requests == 0
+    assert rerun.requests == 0 and rerun.cache.stats["hits"] == 3
+
+def test_prompt_model_or_temperature_change_misses(client):
+    client.complete("outline please", model="gpt-4o-mini", temperature=0.3)
+    client.complete("outline please!", model="gpt-4o-mini", temperature=0.3)
+    client.complete("outline please", model="gpt-4o", temperature=0.3)
+    client.complete("outline please", model="gpt-4o-mini", temperature=0.2)
+    assert ChatHandler.requests == 4
+
+def test_streams_are_cached_once_complete(client):
+    text = "".join(client.stream("stream this"))
+    assert text == "answer 1"
+    assert "".join(client.stream("stream this")) == text
+    assert ChatHandler.requests == 1
+
+def test_cache_key_covers_every_setting():
+    messages = [{"role": "user", "content": "hi"}]
+    key = cache_key("gpt-4o-mini", 0.3, messages)
+    assert key == cache_key("gpt-4o-mini", 0.3, [{"role": "user", "content": "hi"}])
+    assert key != cache_key("gpt-4o", 0.3, messages)
+    assert key != cache_key("gpt-4o-mini", 0.2, messages)
+    assert key != cache_key("gpt-4o-mini", 0.3, [{"role": "system", "content": "hi"}])
+
+def test_cache_hits_do_not_rewrite_the_index(tmp_path):
+    cache = LLMCache(tmp_path)
+    cache.put("key", "text", "gpt-4o-mini")
+    index = tmp_path / "index.json"
+    written = index.stat().st_mtime_ns
+    assert [cache.get("key") for _ in range(3)] == ["text"] * 3
+    assert index.stat().st_mtime_ns == written
+    cache.flush()
+    assert index.stat().st_mtime_ns != written
@@ -0,0 +1,44 @@
+# tests/test_llm_stream.py
+import time
+
+import pytest
+
+from agents.research_agent.llm_stream import StreamFailed, stream_to_file, stream_with_retry
+
+def stalling():
+    yield "# Vector search\n\n"
+    yield "Hybrid retrieval combines"
+    time.sleep(2)
+    yield " never written"
+
+def broken():
+    raise ConnectionError("connection reset")
+    yield  # pragma: no cover - makes this a generator
+
+def test_stalled_stream_keeps_a_partial_draft(tmp_path):
+    path = tmp_path / "draft.md"
+    start = time.perf_counter()
+    result = stream_to_file(stalling(), path, timeout=0.3)
+
+    assert time.perf_counter() - start < 1.5
+    assert not result["complete"] and result["error"].startswith("timed out")
+    text = path.read_text(encoding="utf-8")
+    assert text == result["text"]
+    assert text.startswith("# Vector search\n\nHybrid retrieval combines\n\n<!-- draft incomplete: timed out")
+    assert "never written" not in text
+
+def test_empty_failures_are_retried_with_a_fresh_stream(tmp_path):
+    opened = []
+    def open_stream():
+        opened.append(1)
+        return broken() if len(opened) == 1 else iter(["# Draft", " body"])
+
+    result = stream_with_retry(open_stream, tmp_path / "draft.md", attempts=2)
+    assert len(opened) == 2
+    assert result["complete"] and result["text"] == "# Draft body"
+
+def test_retries_give_up_after_the_last_attempt(tmp_path):
+    path = tmp_path / "draft.md"
+    with pytest.raises(StreamFailed, match="connection reset"):
+        stream_with_retry(broken, path, attempts=3)
+    assert not path.exists()
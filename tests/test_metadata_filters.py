@@ -0,0 +1,64 @@
+# tests/test_metadata_filters.py
+import json
+from datetime import datetime, timezone
+
+import pytest
+
+from agents.vector_search.lancedb_client import build_filter, parse_timestamp
+
+POSTS = [
+    {"id": "p1", "title": "Vector search basics", "content": "Vector search with embeddings.",
+     "url": "https://blog.example/1", "metadata": {"topic": "AI", "timestamp": "20251201-0900"}},
+    {"id": "p2", "title": "Vector search at scale", "content": "Vector search with ANN indexes.",
+     "url": "https://blog.example/2", "metadata": {"topic": "AI", "timestamp": "2026-02-01"}},
+    {"id": "p3", "title": "Vector search for cooks", "content": "Vector search over recipes.",
+     "url": "https://blog.example/3", "metadata": {"topic": "Food's corner", "timestamp": "2026-03-01T10:00:00Z"}},
+]
+
+def test_parse_timestamp_formats():
+    expected = datetime(2026, 1, 1, 8, 0, tzinfo=timezone.utc)
+    assert parse_timestamp("20260101-0800") == expected
+    assert parse_timestamp("2026-01-01T08:00:00Z") == expected
+    assert parse_timestamp("2026-01-01T10:00:00+02:00") == expected
+    assert parse_timestamp("2026-01-01") == datetime(2026, 1, 1, tzinfo=timezone.utc)
+    assert parse_timestamp("") is None and parse_timestamp("soon") is None
+
+def test_build_filter():
+    assert build_filter() is None
+    assert build_filter(topic="AI", kind="post") == "topic = 'AI' AND kind = 'post'"
+    assert build_filter(topic="Food's corner") == "topic = 'Food''s corner'"
+    assert build_filter(since="2026-01-01") == "timestamp >= TIMESTAMP '2026-01-01 00:00:00'"
+    with pytest.raises(ValueError, match="Unrecognized timestamp"):
+        build_filter(since="last week")
+
+def test_filters_are_pushed_down(vector_client):
+    vector_client.add_posts_batch(POSTS)
+    row = vector_client.db.open_table("posts").to_arrow().to_pylist()[0]
+    assert (row["topic"], row["kind"]) == ("AI", "post")
+    assert row["timestamp"] == datetime(2025, 12, 1, 9, 0, tzinfo=timezone.utc)
+
+    def ids(limit=10, **kwargs):
+        return sorted(hit["id"] for hit in vector_client.search_posts("vector search", limit, where=build_filter(**kwargs)))
+
+    assert ids(topic="AI") == ["p1", "p2"]
+    assert ids(since="2026-01-01") == ["p2", "p3"]
+    assert ids(topic="AI", since="2026-01-01") == ["p2"]
+    assert ids(limit=1, topic="Food's corner") == ["p3"]  # prefilter: limit rows always match
+    assert ids(kind="source") == []
+
+def test_migrate_backfills_typed_columns(vector_client):
+    import pyarrow as pa
+    from agents.vector_search.lancedb_client import EMBEDDING_DIM
+
+    old = pa.table({
+        "id": ["p1"], "title": ["Old post"], "content": ["Written before typed columns."],
+        "url": ["https://blog.example/old"],
+        "embedding": pa.array([[0.0] * EMBEDDING_DIM], pa.list_(pa.float32(), EMBEDDING_DIM)),
+        "metadata": [json.dumps({"topic": "AI", "timestamp": "20260105-1200"})],
+    })
+    vector_client.db.create_table("posts", data=old, mode="overwrite")
+    assert vector_client.migrate() == {"posts": 1}
+    row = vector_client.db.open_table("posts").to_arrow().to_pylist()[0]
+    assert (row["topic"], row["kind"], row["timestamp"].day) == ("AI", "post", 5)
+    assert row["key"] and row["content_hash"]
+    assert vector_client.migrate() == {}
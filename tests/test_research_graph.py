@@ -0,0 +1,142 @@
+# tests/test_research_graph.py
+import json
+import time
+
+import pytest
+
+pytest.importorskip("langgraph")
+
+from agents.research_agent import fetch_pipeline, langgraph_agent
+from agents.research_agent import main as research
+import agents.vector_search.lancedb_client  # noqa: F401 - slow first import must not eat the deadline
+
+def test_graph_fetches_stop_at_the_deadline(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.delenv("OPENAI_API_KEY", raising=False)
+    monkeypatch.setattr(fetch_pipeline, "PER_HOST_LIMIT", 1)
+    monkeypatch.setattr(fetch_pipeline, "DEADLINE_SECONDS", 1.0)
+
+    def search(query):
+        return [{"url": f"https://slow.example/{query.replace(' ', '-')}/{i}", "title": query} for i in range(2)]
+
+    def fetch(url, timeout=15, extract=None):
+        assert timeout <= 1.0
+        time.sleep(0.4)
+        return f"text of {url}"
+
+    monkeypatch.setattr(research, "search_tavily", search)
+    monkeypatch.setattr(research, "fetch_text", fetch)
+
+    from langgraph.checkpoint.memory import MemorySaver
+    graph = langgraph_agent.build_graph(MemorySaver())
+    start = time.perf_counter()
+    result = langgraph_agent.run_research_workflow("vector search", graph=graph)
+    elapsed = time.perf_counter() - start
+
+    assert result["status"] == "completed"
+    metadata = result["state"]["metadata"]
+    # Six fetches queue on one host slot; only those started before the deadline run
+    assert 1 <= metadata["sources"] < 6
+    assert metadata["timed_out"] == 6 - metadata["sources"]
+    assert elapsed < 3.0
+
+def stub_research(monkeypatch, fetch):
+    monkeypatch.delenv("OPENAI_API_KEY", raising=False)
+    monkeypatch.setattr(research, "search_tavily", lambda query: [{"url": f"https://example.com/{len(query)}", "title": query}])
+    monkeypatch.setattr(research, "fetch_text", fetch)
+
+    from langgraph.checkpoint.memory import MemorySaver
+    return langgraph_agent.build_graph(MemorySaver())
+
+def test_failed_fetch_only_loses_its_url(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    def fetch(url, timeout=15, extract=None):
+        if url.endswith("/27"):
+            raise RuntimeError("extractor crashed")
+        return f"text of {url}"
+    graph = stub_research(monkeypatch, fetch)
+
+    result = langgraph_agent.run_research_workflow("vector search", graph=graph)
+
+    assert result["status"] == "completed"
+    assert (result["state"]["metadata"]["sources"], result["state"]["metadata"]["failed"]) == (2, 1)
+
+def test_failed_run_resumes_from_its_checkpoint(tmp_path, monkeypatch, capsys):
+    from agents.research_agent import context_packing
+
+    monkeypatch.chdir(tmp_path)
+    fetched = []
+    graph = stub_research(monkeypatch, lambda url, timeout=15, extract=None: fetched.append(url) or f"text of {url}")
+    pack = context_packing.pack_context
+    def broken_pack(topic, sources):
+        raise RuntimeError("tokenizer blew up")
+    monkeypatch.setattr(context_packing, "pack_context", broken_pack)
+
+    assert langgraph_agent.run_research_workflow("vector search", graph=graph)["status"] == "error"
+    config = {"configurable": {"thread_id": langgraph_agent.thread_id("vector search")}}
+    assert graph.get_state(config).next == ("pack_context",)
+    assert len(fetched) == 3
+
+    monkeypatch.setattr(context_packing, "pack_context", pack)
+    result = langgraph_agent.run_research_workflow("vector search", graph=graph)
+    assert result["status"] == "completed" and result["state"]["metadata"]["sources"] == 3
+    assert "Resuming unfinished run at: pack_context" in capsys.readouterr().out
+    assert len(fetched) == 3  # nothing fetched again
+    assert graph.get_state(config).values == {}
+
+def test_only_recent_unfinished_runs_are_resumed(tmp_path, monkeypatch, capsys):
+    monkeypatch.chdir(tmp_path)
+    graph = stub_research(monkeypatch, lambda url, timeout=15, extract=None: f"text of {url}")
+    config = {"configurable": {"thread_id": langgraph_agent.thread_id("vector search")}}
+
+    def interrupted_run():
+        graph.invoke({"topic": "vector search"}, config, interrupt_before=["draft"])
+        assert graph.get_state(config).next == ("draft",)
+
+    interrupted_run()
+    assert langgraph_agent.run_research_workflow("vector search", graph=graph)["status"] == "completed"
+    assert "Resuming unfinished run at: draft" in capsys.readouterr().out
+    assert graph.get_state(config).values == {}
+
+    interrupted_run()
+    monkeypatch.setattr(langgraph_agent, "CHECKPOINT_MAX_AGE", 0)
+    result = langgraph_agent.run_research_workflow("vector search", graph=graph)
+    out = capsys.readouterr().out
+    assert "Discarding stale checkpoint" in out and "Resuming" not in out
+    assert result["status"] == "completed" and result["state"]["metadata"]["sources"] == 3
+
+def test_vector_store_gets_the_full_text_and_notes_an_excerpt(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    long_text = "Vector search keeps the whole article searchable. " * 200
+    graph = stub_research(monkeypatch, lambda url, timeout=15, extract=None: long_text)
+    stored = []
+    monkeypatch.setattr(research, "store_sources", lambda topic, prefix, ts, sources: stored.extend(sources))
+
+    summary = research.research_topic("vector search", out_dir=tmp_path / "out", graph=graph)
+
+    assert summary["method"] == "langgraph"
+    assert [len(s["content"]) for s in stored] == [len(long_text)] * 3
+    [notes] = (tmp_path / "out").glob("sources-*.json")
+    assert all(len(n["excerpt"]) == langgraph_agent.SOURCE_CHARS for n in json.loads(notes.read_text(encoding="utf-8")))
+
+def test_fallback_workflow_writes_llm_stats_to_metadata(tmp_path, monkeypatch):
+    def broken_workflow(topic, draft_path=None, graph=None):
+        raise RuntimeError("graph unavailable")
+    sources = [{"url": "https://example.com/a", "title": "Vector search", "content": "Hybrid retrieval. " * 50}]
+    stats = {"fetched": 1, "duplicate_urls": 0, "seconds": 0.1}
+
+    monkeypatch.setenv("OPENAI_API_KEY", "stub")
+    monkeypatch.setattr(langgraph_agent, "run_research_workflow", broken_workflow)
+    monkeypatch.setattr(fetch_pipeline, "gather_sources", lambda queries, per_query=5: (sources, stats))
+    monkeypatch.setattr(research.llm_client, "stream", lambda prompt, **kwargs: iter(["# Draft", " body"]))
+    monkeypatch.setattr(research, "store_sources", lambda topic, prefix, ts, sources: None)
+
+    summary = research.research_topic("vector search", out_dir=tmp_path / "out")
+
+    assert summary["method"] == "fallback"
+    assert (tmp_path / "out" / summary["draft"].rsplit("/", 1)[1]).read_text(encoding="utf-8") == "# Draft body"
+    [metadata] = (tmp_path / "out").glob("metadata-*.json")
+    metadata = json.loads(metadata.read_text(encoding="utf-8"))
+    assert (metadata["method"], metadata["sources"], metadata["fetch"]) == ("fallback", 1, stats)
+    assert metadata["llm"]["complete"] and metadata["llm"]["chars"] == len("# Draft body")
+    assert metadata["llm"]["ttft_seconds"] is not None and "text" not in metadata["llm"]
@@ -0,0 +1,46 @@
+# tests/test_results.py
+import json
+
+import pytest
+
+pa = pytest.importorskip("pyarrow")
+
+from agents.vector_search.results import SearchResult, results_from_arrow
+
+def test_columns_map_to_fields_in_any_order():
+    table = pa.table({
+        "score": [0.25, 0.5],
+        "url": ["https://a.example", "https://b.example"],
+        "metadata": [json.dumps({"topic": "AI"}), None],
+        "id": ["a", "b"],
+        "title": ["A", "B"],
+        "content": ["alpha", "beta"],
+        "embedding": [[0.0], [1.0]],
+    })
+    first, second = results_from_arrow(table)
+    assert first.to_dict() == {"id": "a", "title": "A", "content": "alpha", "url": "https://a.example",
+                               "score": 0.25, "metadata": {"topic": "AI"}}
+    assert second.metadata == {}
+    assert not hasattr(first, "embedding")
+
+def test_unselected_columns_are_none():
+    [result] = results_from_arrow(pa.table({"id": ["a"], "score": [1.5]}))
+    assert (result.id, result.score, result.title, result.content, result.url) == ("a", 1.5, None, None, None)
+    assert result.metadata == {}
+    assert results_from_arrow(pa.table({"id": pa.array([], pa.string())})) == []
+
+def test_metadata_is_parsed_lazily():
+    result = SearchResult("a", metadata_json="not json")
+    assert result.id == "a"  # constructing never touches the JSON
+    with pytest.raises(json.JSONDecodeError):
+        result.metadata
+
+def test_search_dicts_keep_their_shape(vector_client):
+    vector_client.add_posts_batch([
+        {"id": "p1", "title": "Vector search", "content": "Indexes and embeddings.",
+         "url": "https://blog.example/vector", "metadata": {"topic": "AI"}}
+    ])
+    [hit] = vector_client.search_posts("vector search", limit=1)
+    assert set(hit) == {"id", "title", "content", "url", "score", "metadata"}
+    assert (hit["id"], hit["url"], hit["metadata"]["topic"]) == ("p1", "https://blog.example/vector", "AI")
+    assert isinstance(hit["score"], float)
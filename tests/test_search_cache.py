@@ -0,0 +1,67 @@
+# tests/test_search_cache.py
+import time
+import threading
+
+from agents.research_agent import main as research
+from agents.research_agent.fetch_cache import SearchCache, normalize_query
+from agents.research_agent.fetch_pipeline import gather_sources
+
+RESULTS = [{"title": "LanceDB", "url": "https://lancedb.com", "snippet": "Vector database"}]
+
+def test_normalize_query():
+    assert normalize_query("  Vector   Search, explained! ") == "vector search explained"
+    assert normalize_query("ＬａｎｃｅＤＢ") == "lancedb"  # NFKC folds full-width letters
+    assert normalize_query(None) == ""
+
+def test_cache_persists_and_expires(tmp_path, monkeypatch):
+    cache = SearchCache(tmp_path / "search.json", ttl=60)
+    assert cache.get("vector search") is None
+    cache.put("Vector search?", RESULTS)
+    assert SearchCache(tmp_path / "search.json", ttl=60).get("vector  SEARCH") == RESULTS
+
+    later = time.time() + 61
+    monkeypatch.setattr("agents.research_agent.fetch_cache.time.time", lambda: later)
+    assert cache.get("vector search") is None
+
+def test_search_tavily_calls_the_api_once_per_query(tmp_path, monkeypatch):
+    calls = []
+
+    class Response:
+        def raise_for_status(self):
+            pass
+
+        def json(self):
+            return {"results": RESULTS}
+
+    def get(endpoint, params=None, timeout=None):
+        calls.append(params["q"])
+        return Response()
+
+    monkeypatch.setenv("TAVILY_API_KEY", "stub")
+    monkeypatch.setattr(research, "search_cache", SearchCache(tmp_path / "search.json"))
+    monkeypatch.setattr(research.http_client, "get", get)
+    assert research.search_tavily("Vector search") == RESULTS
+    assert research.search_tavily("vector search.") == RESULTS
+    assert calls == ["Vector search"]
+    assert research.search_cache.stats == {"api_calls": 1, "cache_hits": 1, "duplicate_urls": 0}
+
+def test_gather_sources_dedupes_queries_and_urls():
+    searched, fetched = [], []
+    lock = threading.Lock()
+
+    def search(query):
+        with lock:
+            searched.append(query)
+        return [{"url": "https://www.example.com/shared?utm_source=x", "title": "Shared"},
+                {"url": f"https://example.com/{normalize_query(query).replace(' ', '-')}", "title": query}]
+
+    def fetch(url, timeout=15, extract=None):
+        with lock:
+            fetched.append(url)
+        return f"text of {url}"
+
+    sources, stats = gather_sources(["Vector search", "vector search!", "hybrid search"],
+                                    search=search, fetch=fetch, extract_workers=1)
+    assert sorted(searched) == ["Vector search", "hybrid search"]
+    assert (stats["searches"], stats["duplicate_queries"], stats["duplicate_urls"]) == (2, 1, 1)
+    assert len(fetched) == 3 and len(sources) == 3
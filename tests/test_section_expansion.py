@@ -0,0 +1,104 @@
+# tests/test_section_expansion.py
+import json
+import time
+import threading
+
+from agents.content_agent.main import create_outline, split_sections, shared_context, expand_draft_sections
+
+OUTLINE = """# Vector search
+
+## Introduction
+- Hook
+
+## Indexing
+- IVF-PQ
+
+## Broken
+- Fails to expand
+
+## Filters
+- Prefiltering
+
+## Ranking
+- Hybrid
+
+## Conclusion
+- Summary
+"""
+
+def stub_llm(monkeypatch, transitions_reply=None):
+    """Stubbed llm_client.complete: sections expand slowly, "## Broken" fails;
+    records the peak number of concurrent section calls and the stitch prompts"""
+    from agents.llm_client import llm_client
+
+    calls = {"active": 0, "peak": 0, "stitch": []}
+    lock = threading.Lock()
+
+    def complete(prompt, **kwargs):
+        if "Write a transition for each boundary" in prompt:
+            calls["stitch"].append(prompt)
+            return transitions_reply(prompt.count("### Boundary"))
+        section = prompt.split("## Section to Write:\n", 1)[1].split("\n\n", 1)[0]
+        with lock:
+            calls["active"] += 1
+            calls["peak"] = max(calls["peak"], calls["active"])
+        try:
+            time.sleep(0.05)
+            if section.startswith("## Broken"):
+                raise TimeoutError("read timed out")
+            heading = section.splitlines()[0]
+            return f"{heading}\n\nExpanded {heading[3:].lower()}."
+        finally:
+            with lock:
+                calls["active"] -= 1
+
+    monkeypatch.setenv("OPENAI_API_KEY", "stub")
+    monkeypatch.setattr(llm_client, "complete", complete)
+    return calls
+
+def test_default_outline_thesis_comes_from_the_introduction(monkeypatch):
+    monkeypatch.delenv("OPENAI_API_KEY", raising=False)
+    title, sections = split_sections(create_outline("Vector search"))
+
+    assert title == "Outline: Vector search"
+    assert sections[0].startswith("## Introduction")
+    context = shared_context(title, sections)
+    assert "Thesis and introduction notes:\n## Introduction\n- Hook and context\n- Main thesis" in context
+    assert "## Conclusion" not in context
+
+def test_preamble_is_the_thesis_when_present():
+    outline = "# Post\n\nRetrieval decides answer quality.\n\n## Background\n- History\n\n## Introduction\n- Hook"
+    title, sections = split_sections(outline)
+    context = shared_context(title, sections, sources="- example.com")
+    assert "Thesis and introduction notes:\nRetrieval decides answer quality." in context
+    assert "## Introduction" not in context and context.endswith("## Sources:\n- example.com")
+
+def test_first_section_is_the_fallback_thesis():
+    title, sections = split_sections("# Post\n\n## Why now\n- Costs fell\n\n## How\n- Steps")
+    assert "Thesis and introduction notes:\n## Why now\n- Costs fell" in shared_context(title, sections)
+
+def test_expansion_respects_the_concurrency_cap(monkeypatch):
+    calls = stub_llm(monkeypatch)
+    expand_draft_sections(OUTLINE, concurrency=2, stitch=False)
+    assert calls["peak"] == 2 and calls["stitch"] == []
+
+def test_failed_section_keeps_its_outline_text(monkeypatch):
+    stub_llm(monkeypatch)
+    draft = expand_draft_sections(OUTLINE, stitch=False)
+    assert draft.startswith("# Vector search\n\n## Introduction\n\nExpanded introduction.")
+    assert "## Broken\n- Fails to expand\n\n## Filters\n\nExpanded filters." in draft
+
+def test_stitching_inserts_fenced_transitions(monkeypatch):
+    fenced = lambda n: "```json\n" + json.dumps([f"Transition {i}." for i in range(1, n + 1)]) + "\n```"
+    calls = stub_llm(monkeypatch, fenced)
+    draft = expand_draft_sections(OUTLINE)
+
+    assert len(calls["stitch"]) == 1 and calls["stitch"][0].count("### Boundary") == 5
+    assert "## Indexing\n\nTransition 1.\n\nExpanded indexing." in draft
+    assert "## Broken\n\nTransition 2.\n\n- Fails to expand" in draft
+    assert "## Conclusion\n\nTransition 5.\n\nExpanded conclusion." in draft
+    assert draft.count("Transition") == 5
+
+def test_unparseable_transitions_leave_the_sections_unchanged(monkeypatch):
+    stub_llm(monkeypatch, lambda n: "Here are the transitions you asked for.")
+    assert "Transition" not in expand_draft_sections(OUTLINE)
@@ -0,0 +1,125 @@
+# tests/test_seo.py
+import sys
+import json
+
+from agents.content_agent import seo
+
+POST = '''---
+title: "Vector Search for Blog Agents: A Practical LanceDB Guide"
+description: "How our blog agents use vector search in LanceDB to find related posts and sources, with chunking, hybrid ranking and filters that keep results fresh."
+keywords: [vector search, lancedb]
+---
+
+# Vector Search for Blog Agents: A Practical LanceDB Guide
+
+Vector search lets the agents find related posts. See [chunking](/posts/chunking) first.
+
+## Indexing
+
+![Index diagram](/img/index.png) and ![](/img/empty.png)
+
+<img src="/img/raw.png" alt="">
+
+Read the [LanceDB docs](https://lancedb.github.io/lancedb/) or <https://arxiv.org/abs/1603.09320>.
+Questions? [Mail us](mailto:blog@example.com). More in [the archive][archive].
+
+[archive]: /archive
+
+```python
+# not a heading
+print("[not a link](https://example.com)")
+```
+
+    [indented code](https://example.org)
+
+#### Tuning
+
+Vector search needs tuning.
+'''
+
+def statuses(report):
+    return {c["check"]: c["status"] for c in report["checks"]}
+
+def test_fixture_post_metrics():
+    report = seo.analyze(POST)
+    assert (report["title_chars"], report["meta_description_chars"]) == (56, 150)
+    assert report["headings"] == {"h1": 1, "h2": 1, "h3": 0, "h4": 1, "h5": 0, "h6": 0}
+    assert report["heading_skips"] == ["H2 -> H4 (Tuning)"]
+    # mailto and anything inside code blocks are not links
+    assert report["links"] == {"internal": 2, "external": 2}
+    assert report["images"] == {"total": 3, "missing_alt": 2}
+    assert (report["keyword"], report["keyword_source"], report["keyword_count"]) == ("vector search", "front matter", 3)
+    assert report["words"] == 42 and report["keyword_density"] == 14.29
+
+def test_fixture_post_checks():
+    report = seo.analyze(POST)
+    assert statuses(report) == {
+        "title": "pass", "meta_description": "pass", "headings": "warn", "word_count": "warn",
+        "internal_links": "pass", "external_links": "pass", "image_alt": "fail", "keyword_density": "warn",
+    }
+    assert report["score"] == 6.9 and seo.status(report) == "fail"
+    checklist = seo.render_checklist(report)
+    assert "**Score:** 6.9/10" in checklist
+    assert "- [ ] ❌ **Image alt** - 2 of 3 images without alt text" in checklist
+    assert "- [x] **Title** - 56 chars (50-60)" in checklist
+
+def test_clean_post_passes(monkeypatch):
+    monkeypatch.setattr(seo, "SEO_MIN_WORDS", 40)
+    clean = (POST.replace("![](/img/empty.png)", "![Empty index](/img/empty.png)")
+             .replace('alt=""', 'alt="Raw vectors"').replace("#### Tuning", "### Tuning")
+             + "\nMore words about indexes, recall, latency, filters and freshness for readers. " * 30)
+    report = seo.analyze(clean)
+    assert set(statuses(report).values()) == {"pass"} and report["score"] == 10.0
+
+def test_keyword_argument_and_inference():
+    assert seo.analyze(POST, keyword="LanceDB")["keyword_source"] == "argument"
+    body = POST.split("---\n", 2)[2]  # no front matter: title from the H1, keyword inferred from it
+    report = seo.analyze(body)
+    assert report["title"] == "Vector Search for Blog Agents: A Practical LanceDB Guide"
+    assert (report["keyword"], report["keyword_source"]) == ("vector", "inferred")
+    assert statuses(report)["meta_description"] == "warn"
+
+def test_nested_list_items_are_not_code():
+    post = """# Reading list
+
+- Vector search
+    - [LanceDB docs](https://lancedb.github.io/lancedb/)
+    - ![HNSW graph](/img/hnsw.png)
+
+    More in [our guide](/posts/vector-search).
+1. Tuning
+    1. ![](/img/recall.png)
+
+Text before an indented block:
+
+    [still code](https://example.org)
+"""
+    report = seo.analyze(post)
+    assert report["links"] == {"internal": 1, "external": 1}
+    assert report["images"] == {"total": 2, "missing_alt": 1}
+
+def test_missing_or_duplicate_h1_fails():
+    assert statuses(seo.analyze("Just text.\n"))["title"] == "fail"
+    assert statuses(seo.analyze("# One\n\n# Two\n"))["headings"] == "fail"
+
+def test_cli_audits_a_directory(tmp_path, monkeypatch, capsys):
+    (tmp_path / "posts" / "2026").mkdir(parents=True)
+    (tmp_path / "posts" / "2026" / "vector.md").write_text(POST, encoding="utf-8")
+    (tmp_path / "posts" / "ok.md").write_text(POST.replace("![](/img/empty.png)", "")
+                                              .replace('alt=""', 'alt="Raw"'), encoding="utf-8")
+    out = tmp_path / "audit.json"
+
+    def run(*args):
+        monkeypatch.setattr(sys, "argv", ["seo", "--dir", str(tmp_path / "posts"), *args])
+        try:
+            seo.main()
+        except SystemExit as e:
+            return e.code
+        return 0
+
+    assert run("--json", str(out)) == 1
+    assert "2 posts" in capsys.readouterr().out
+    reports = json.loads(out.read_text(encoding="utf-8"))
+    assert [seo.status(r) for r in reports] == ["fail", "warn"]
+    assert run("--fail-on", "never") == 0
+    assert run("--fail-on", "warn") == 1
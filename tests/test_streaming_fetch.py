@@ -0,0 +1,96 @@
+# tests/test_streaming_fetch.py
+import threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+import pytest
+
+from agents.http_client import HttpClient, ResponseRejected
+
+PAGE = b"<html><body>" + b"<p>streamed text</p>\n" * 50000 + b"</body></html>"  # ~1 MB
+
+class BodyHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        content_type, length = {
+            "/page": ("text/html; charset=utf-8", None),
+            "/declared-big": ("text/html", 50 * 1024 * 1024),
+            "/paper.pdf": ("application/pdf", len(PAGE)),
+        }[self.path]
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        if length is not None:
+            self.send_header("Content-Length", str(length))
+        self.end_headers()
+        try:
+            self.wfile.write(PAGE)
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+
+    def log_message(self, *args):
+        pass
+
+@pytest.fixture(scope="module")
+def base():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), BodyHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+
+def test_body_is_cut_off_at_the_byte_cap(base):
+    response, text, truncated = HttpClient().stream_text(base + "/page", 64 * 1024)
+    assert truncated
+    assert len(text.encode("utf-8")) == 64 * 1024
+
+def test_small_cap_not_hit(base):
+    response, text, truncated = HttpClient().stream_text(base + "/page", 2 * len(PAGE))
+    assert not truncated
+    assert text.encode("utf-8") == PAGE
+
+def test_non_html_content_type_is_rejected(base):
+    with pytest.raises(ResponseRejected, match="application/pdf"):
+        HttpClient().stream_text(base + "/paper.pdf", 64 * 1024)
+
+def test_declared_length_over_limit_is_rejected(base):
+    with pytest.raises(ResponseRejected, match="bytes"):
+        HttpClient().stream_text(base + "/declared-big", 64 * 1024, reject_over=1024 * 1024)
+
+def test_fetch_text_skips_rejected_pages(base, tmp_path, monkeypatch):
+    from agents.research_agent import main as research
+    from agents.research_agent.fetch_cache import FetchCache
+
+    cache = FetchCache(tmp_path / "fetch")
+    monkeypatch.setattr(research, "fetch_cache", cache)
+    assert research.fetch_text(base + "/paper.pdf") == ""
+    assert cache.stats["rejected"] == 1
+
+def test_deadline_bounds_a_slow_body(monkeypatch):
+    import time
+    from agents import http_client as http
+
+    class SlowHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            self.send_response(200)
+            self.send_header("Content-Type", "text/html")
+            self.end_headers()
+            try:
+                for _ in range(50):
+                    self.wfile.write(b"<p>drip</p>" * 10000)
+                    self.wfile.flush()
+                    time.sleep(0.1)
+            except (BrokenPipeError, ConnectionResetError):
+                pass
+
+        def log_message(self, *args):
+            pass
+
+    monkeypatch.setattr(http, "STREAM_CHUNK", 1024)
+    server = ThreadingHTTPServer(("127.0.0.1", 0), SlowHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        start = time.monotonic()
+        response, text, truncated = HttpClient().stream_text(
+            f"http://127.0.0.1:{server.server_address[1]}/", 10 * len(PAGE), timeout=5,
+            deadline=start + 0.5)
+        assert time.monotonic() - start < 1.5
+        assert truncated and text.startswith("<p>drip</p>")
+    finally:
+        server.shutdown()
@@ -0,0 +1,95 @@
+# tests/test_upsert.py
+from agents.vector_search.lancedb_client import canonical_url
+
+SOURCES = [
+    {"id": f"s{i}", "url": f"https://example.com/post/{i}", "title": f"Source {i}",
+     "content": f"Notes on vector search, part {i}.", "metadata": {"timestamp": f"2026010{i}-0800"}}
+    for i in range(1, 4)
+]
+
+def test_canonical_url_drops_only_tracking_params():
+    assert canonical_url("https://WWW.Example.com:443/post/?utm_source=feed&b=2&ref=rss&a=1#top") == \
+        "https://example.com/post?a=1&b=2"
+    assert canonical_url("https://example.com/item?refId=7&reference=x&fbclid=1") == \
+        "https://example.com/item?refId=7&reference=x"
+
+def count(client, table_name):
+    return client.db.open_table(table_name).count_rows()
+
+def test_reupserting_unchanged_sources_is_a_no_op(vector_client):
+    assert vector_client.upsert_sources_batch(SOURCES) == {
+        "inserted": 3, "updated": 0, "unchanged": 0, "duplicates": 0}
+    embedded = vector_client.cache.stats()["misses"]
+
+    assert vector_client.upsert_sources_batch(SOURCES) == {
+        "inserted": 0, "updated": 0, "unchanged": 3, "duplicates": 0}
+    assert vector_client.cache.stats()["misses"] == embedded  # nothing re-embedded
+    assert count(vector_client, "sources") == 3
+
+def test_upsert_matches_canonical_urls_and_replaces_changed_content(vector_client):
+    vector_client.upsert_sources_batch(SOURCES)
+    edited = dict(SOURCES[0], url="https://www.example.com/post/1/?utm_source=feed", content="Rewritten.")
+    stats = vector_client.upsert_sources_batch([edited, SOURCES[1], SOURCES[1]])
+    assert stats == {"inserted": 0, "updated": 1, "unchanged": 1, "duplicates": 1}
+    assert count(vector_client, "sources") == 3
+
+def test_compact_keeps_the_newest_row_per_key(vector_client):
+    vector_client.add_sources_batch(SOURCES)
+    newer = dict(SOURCES[0], content="Newer copy.", metadata={"timestamp": "20260201-0800"})
+    vector_client.add_sources_batch([newer, SOURCES[1]])
+    assert count(vector_client, "sources") == 5
+
+    report = vector_client.compact("sources")
+    assert (report["rows_before"], report["rows_after"]) == (5, 3)
+    rows = vector_client.db.open_table("sources").to_arrow()
+    contents = dict(zip(rows["url"].to_pylist(), rows["content"].to_pylist()))
+    assert contents["https://example.com/post/1"] == "Newer copy."
+
+    # Chunk rows written by the repeated adds are deduped too
+    chunk_ids = vector_client.db.open_table("chunks").to_arrow()["id"].to_pylist()
+    assert len(chunk_ids) == len(set(chunk_ids))
+
+    assert vector_client.compact("sources")["rows_after"] == 3
+
+def test_batch_add_is_one_write_and_re_adds_replace_chunks(vector_client):
+    posts = [dict(source, id=f"p{i}", url=f"https://blog.example/{i}") for i, source in enumerate(SOURCES * 2)]
+    table = vector_client.db.open_table("posts")
+    version = table.version
+
+    assert vector_client.add_posts_batch(posts, batch_size=4) == 6
+    assert vector_client.db.open_table("posts").version == version + 1
+    assert count(vector_client, "posts") == 6
+    assert vector_client.add_posts_batch([]) == 0
+    assert vector_client.db.open_table("posts").version == version + 1
+
+    chunks = vector_client.db.open_table("chunks").to_arrow()["id"].to_pylist()
+    assert len(chunks) == len(set(chunks)) == 6
+
+    assert vector_client.add_posts_batch(posts[:3]) == 3
+    assert vector_client.add_posts_batch(posts[:3] + posts[:3]) == 6
+    chunk_ids = vector_client.db.open_table("chunks").to_arrow()["id"].to_pylist()
+    assert sorted(chunk_ids) == sorted(chunks)
+
+def test_upsert_migrates_a_pre_key_table_first(vector_client):
+    import pyarrow as pa
+    from agents.vector_search.lancedb_client import EMBEDDING_DIM
+
+    old = pa.table({
+        "id": ["s0"], "url": [SOURCES[0]["url"]], "title": [SOURCES[0]["title"]], "content": [SOURCES[0]["content"]],
+        "embedding": pa.array([[0.0] * EMBEDDING_DIM], pa.list_(pa.float32(), EMBEDDING_DIM)),
+        "metadata": ["{}"],
+    })
+    vector_client.db.create_table("sources", data=old, mode="overwrite")
+
+    assert vector_client.upsert_sources_batch(SOURCES) == {
+        "inserted": 2, "updated": 0, "unchanged": 1, "duplicates": 0}
+    assert count(vector_client, "sources") == 3
+
+def test_store_sources_reports_a_failed_upsert(monkeypatch, capsys):
+    from agents.research_agent.main import store_sources
+    from agents.vector_search import lancedb_client
+
+    monkeypatch.setattr(lancedb_client.vector_client, "upsert_sources_batch", lambda sources: {})
+    store_sources("AI", "run", "20260101-0800", SOURCES)
+    out = capsys.readouterr().out
+    assert "Could not store 3 sources" in out and "0 new" not in out